@@ -1,18 +1,52 @@
 # agent_runtime/agent.py
 """Agent implementation for Agent Foundry with a lockfile-based plugin approach."""
 
-import json
+import asyncio
+import contextlib
 import logging
+import time
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
 from semantic_kernel import Kernel
-from semantic_kernel.contents import ChatHistory, StreamingChatMessageContent
-
-from agent_runtime.plugins.manager import PluginManager
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    ChatMessageContent,
+    StreamingChatMessageContent,
+)
+
+from agent_runtime.events import AgentEvent, TextChunk, ToolCallFinished
+from agent_runtime.history import HistoryConfig, HistoryManager, format_transcript
+from agent_runtime.limits import (
+    STOP_CANCELLED,
+    TurnControl,
+    TurnLimits,
+    TurnStopped,
+    truncation_marker,
+)
+from agent_runtime.metrics import (
+    MetricsListener,
+    MetricsRecord,
+    StartupMetrics,
+    TurnMetrics,
+    TurnRecorder,
+)
+from agent_runtime.planner import PlannerConfig
+from agent_runtime.plugins.manager import PluginManager, get_tool_schema_cache
+from agent_runtime.prompt import plugin_instructions, prefix_hash
+from agent_runtime.streaming import StreamAccumulator
+from agent_runtime.tools import ToolCallResult, ToolDispatcher
+
+if TYPE_CHECKING:
+    from agent_runtime.planner import Planner
+    from agent_runtime.sessions import SessionLog
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on model -> tools -> model round trips within a single turn
+MAX_TOOL_ROUNDS = 10
+
 
 class Agent:
     """Agent class for interacting with AI models."""
@@ -25,6 +59,10 @@ class Agent:
         provider,  # Polymorphic provider (OpenAIProvider, OllamaProvider, etc.)
         base_dir: Optional[Path] = None,
         skip_init: bool = False,
+        history_config: Optional[HistoryConfig] = None,
+        plugin_concurrency: Optional[Dict[str, int]] = None,
+        planner_config: Optional[PlannerConfig] = None,
+        turn_limits: Optional[TurnLimits] = None,
     ):
         """Initialize the agent."""
         self.name = name
@@ -35,6 +73,35 @@ class Agent:
         self.kernel: Optional[Kernel] = None
         self.history = ChatHistory()
         self.history.add_system_message(system_prompt)
+        self.history_manager = HistoryManager(
+            history_config or HistoryConfig(), summarizer=self._summarize_history
+        )
+        # Per-plugin limits on concurrent tool calls, keyed by kernel plugin name
+        self.plugin_concurrency: Dict[str, int] = dict(plugin_concurrency or {})
+        self._tool_dispatcher: Optional[ToolDispatcher] = None
+        # Planning is opt-in; the planner is only built on first use
+        self.planner_config = planner_config
+        self._planner: Optional["Planner"] = None
+        # Deadline and output budget applied to every turn
+        self.turn_limits = turn_limits or TurnLimits()
+        self._turn_control: Optional[TurnControl] = None
+        # Error that ended the most recent turn, if any
+        self.last_error: Optional[str] = None
+        # Why the most recent turn was cut short (timeout, max_output_tokens
+        # or cancelled), if it was
+        self.last_stop_reason: Optional[str] = None
+        # Clones share the provider and dispatcher but leave closing them to us
+        self._owns_resources = True
+        # False when the provider is shared by several agents and closed by
+        # whoever created it (see AgentRuntime)
+        self._owns_provider = True
+        # Latency metrics: filled in by whoever builds the agent and per turn
+        self.startup_metrics = StartupMetrics(agent=name)
+        self.last_turn_metrics: Optional[TurnMetrics] = None
+        self._metrics_listeners: List[MetricsListener] = []
+        self._turn_count = 0
+        # Where the conversation is saved after every turn, if anywhere
+        self.session_log: Optional["SessionLog"] = None
 
         # If skip_init=False and we have a base directory, load plugins
         if not skip_init and base_dir:
@@ -49,88 +116,203 @@ class Agent:
         pm = PluginManager(self.base_dir, self.kernel)
         pm.load_all_plugins()
 
-        # Fetch instructions from each plugin and incorporate them
-        plugin_instructions = []
-        for plugin in self.kernel.plugins.values():
-            try:
-                # Try to get instructions using the get_instructions function
-                if hasattr(plugin, "get_instructions"):
-                    instructions = plugin.get_instructions()
-                    if instructions:
-                        plugin_instructions.append(
-                            f"\nInstructions for {plugin.name} plugin:\n{instructions}"
-                        )
-            except Exception as e:
-                logger.warning(
-                    f"Failed to get instructions from plugin {plugin.name}: {e}"
-                )
+        # Fetch instructions from each plugin and incorporate them, in plugin
+        # name order so the system prompt is the same on every start
+        combined_instructions = plugin_instructions(self.kernel)
 
         # Append plugin instructions to system prompt if any were found
-        if plugin_instructions:
-            combined_instructions = "\n".join(plugin_instructions)
+        if combined_instructions:
             self.system_prompt = f"{self.system_prompt}\n\nPlugin-specific Instructions:{combined_instructions}"
             # Update the chat history with new system prompt
             self.history = ChatHistory()
             self.history.add_system_message(self.system_prompt)
             logger.debug("Added plugin instructions to system prompt")
 
+    def prefix_hash(self) -> str:
+        """Hash of the prompt prefix every request starts with.
+
+        It only changes when the system prompt or the tools change, which is
+        when a provider's prompt cache stops matching.
+        """
+        tools = None
+        if self.kernel is not None and self.kernel.plugins:
+            tools = get_tool_schema_cache().get(self.kernel)
+        return prefix_hash(self.system_prompt, tools)
+
     def start_new_session(self) -> None:
         """Start a new chat session with a fresh history while preserving plugin instructions."""
         self.history = ChatHistory()
         self.history.add_system_message(
             self.system_prompt
         )  # system_prompt already includes plugin instructions
+        self._save_session()
         logger.debug("Started new chat session for agent '%s'", self.name)
         logger.debug("System prompt: %s", self.system_prompt)
 
-    def _log_chat_history(self, prefix: str = "") -> None:
-        """Log the current state of the chat history (for debugging)."""
-        logger.debug("%sChat history:", prefix)
-        for i, msg in enumerate(self.history.messages):
-            logger.debug("%s  [%d] %s: %s", prefix, i, msg.role, msg.content)
+    def resume_session(self, log: "SessionLog") -> int:
+        """Continue the conversation saved in ``log`` and keep saving to it.
 
-    async def _execute_function(self, function_call: Dict[str, Any]) -> str:
-        """Execute a function call and return the result."""
-        if not self.kernel:
-            return "Error: No kernel available for function execution"
+        Returns the number of messages restored; 0 starts a new session in
+        that log. The current system prompt replaces the saved one.
+        """
+        history = log.load()
+        if history is not None:
+            messages = history.messages
+            if messages and messages[0].role == AuthorRole.SYSTEM:
+                messages[0] = ChatMessageContent(
+                    role=AuthorRole.SYSTEM, content=self.system_prompt
+                )
+            self.history = history
+        self.session_log = log
+        return len(history.messages) if history is not None else 0
 
+    def _save_session(self) -> None:
+        """Append what the session log is missing of the history."""
+        if self.session_log is None:
+            return
         try:
-            # Example function_call dict:
-            # {"name": "pluginName_functionName", "arguments": "{\"argKey\":\"argValue\"}"}
-            func_name = function_call["name"]
-            arguments_json = function_call.get("arguments", "{}")
-            arguments = json.loads(arguments_json)
-
-            # The function name is "pluginName_functionName"
-            plugin_name, func_name = func_name.split("_", 1)
-
-            plugin = self.kernel.plugins.get(plugin_name)
-            if not plugin:
-                return f"Error: Plugin '{plugin_name}' not found"
-
-            func = plugin.functions.get(func_name)
-            if not func:
-                return (
-                    f"Error: Function '{func_name}' not found in plugin '{plugin_name}'"
-                )
+            self.session_log.sync(self.history)
+        except OSError:
+            logger.exception("Failed to save session to %s", self.session_log.path)
+
+    def clone(self) -> "Agent":
+        """Create an agent with a fresh history that shares this agent's
+        provider, kernel and tool dispatcher.
 
-            # Build KernelArguments
-            from semantic_kernel.functions import KernelArguments
+        Used to run independent conversations side by side. Only the original
+        agent closes the shared resources.
+        """
+        agent = Agent(
+            name=self.name,
+            description=self.description,
+            system_prompt=self.system_prompt,
+            provider=self.provider,
+            base_dir=self.base_dir,
+            skip_init=True,
+            history_config=self.history_manager.config,
+            plugin_concurrency=self.plugin_concurrency,
+            planner_config=self.planner_config,
+            turn_limits=self.turn_limits,
+        )
+        agent.kernel = self.kernel
+        if self.kernel is not None:
+            agent._tool_dispatcher = self.tool_dispatcher
+        agent._owns_resources = False
+        agent.startup_metrics = self.startup_metrics
+        agent._metrics_listeners = list(self._metrics_listeners)
+        return agent
+
+    def add_metrics_listener(self, listener: MetricsListener) -> None:
+        """Call ``listener`` with the metrics of every turn this agent runs."""
+        self._metrics_listeners.append(listener)
+
+    def remove_metrics_listener(self, listener: MetricsListener) -> None:
+        """Stop calling a previously added metrics listener."""
+        self._metrics_listeners.remove(listener)
+
+    def emit_metrics(self, record: MetricsRecord) -> None:
+        """Pass a metrics record to every listener."""
+        for listener in self._metrics_listeners:
+            try:
+                listener(record)
+            except Exception:
+                logger.exception("Metrics listener failed")
+
+    async def aclose(self) -> None:
+        """Release resources held by the agent's provider."""
+        if not self._owns_resources:
+            self._tool_dispatcher = None
+            return
+        if self._tool_dispatcher is not None:
+            self._tool_dispatcher.close()
+            self._tool_dispatcher = None
+        if self._owns_provider and self.provider and hasattr(self.provider, "aclose"):
+            await self.provider.aclose()
 
-            kernel_args = KernelArguments()
-            for k, v in arguments.items():
-                kernel_args[k] = v
+    def _log_chat_history(self, prefix: str = "") -> None:
+        """Log the current state of the chat history (for debugging)."""
+        logger.debug("%sChat history:", prefix)
+        for i, msg in enumerate(self.history.messages):
+            logger.debug("%s  [%d] %s: %s", prefix, i, msg.role, msg.content)
 
-            # Execute the function
-            result = await func.invoke(kernel=self.kernel, arguments=kernel_args)
-            return str(result)
+    async def _summarize_history(
+        self, previous: Optional[str], messages: List[ChatMessageContent]
+    ) -> str:
+        """Ask the provider to fold older messages into the rolling summary."""
+        prompt = ChatHistory()
+        prompt.add_system_message(
+            "Summarize the conversation below for your own future reference. "
+            "Keep decisions, facts, file names and open tasks; drop small talk. "
+            "Reply with the summary only."
+        )
+        transcript = format_transcript(messages)
+        if previous:
+            transcript = f"Summary so far:\n{previous}\n\nNew messages:\n{transcript}"
+        prompt.add_user_message(transcript)
+
+        parts = []
+        async for chunk in self.provider.chat(prompt):
+            if chunk.content:
+                parts.append(chunk.content)
+        return f"Summary of the earlier conversation:\n{''.join(parts).strip()}"
+
+    @property
+    def planner(self) -> Optional["Planner"]:
+        """Planner for this agent, or None unless planning is configured."""
+        if self.planner_config is None:
+            return None
+        if self._planner is None:
+            from agent_runtime.planner import Planner
+
+            self._planner = Planner(self.provider, self.planner_config)
+        return self._planner
+
+    @property
+    def tool_dispatcher(self) -> ToolDispatcher:
+        """Dispatcher for the tool calls the model makes against our kernel."""
+        if (
+            self._tool_dispatcher is None
+            or self._tool_dispatcher.kernel is not self.kernel
+        ):
+            if self._tool_dispatcher is not None:
+                self._tool_dispatcher.close()
+            self._tool_dispatcher = ToolDispatcher(self.kernel, self.plugin_concurrency)
+        return self._tool_dispatcher
+
+    def cancel(self) -> bool:
+        """Stop the turn that is currently streaming, if there is one.
+
+        The provider stream and any running tool calls are cancelled and the
+        partial reply is kept in history with a truncation marker. Returns
+        False if no turn was running.
+        """
+        if self._turn_control is None:
+            return False
+        return self._turn_control.stop(STOP_CANCELLED)
 
-        except Exception as e:
-            logger.exception("Error executing function")
-            return f"Error executing function: {str(e)}"
+    async def chat(
+        self, message: str, limits: Optional[TurnLimits] = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        """Send a message to the agent and get a streaming response.
 
-    async def chat(self, message: str) -> AsyncIterator[StreamingChatMessageContent]:
-        """Send a message to the agent and get a streaming response."""
+        ``limits`` overrides the agent's configured turn limits for this turn.
+        Only the reply text is streamed; see ``chat_events`` for tool progress.
+        """
+        events = self.chat_events(message, limits)
+        async with contextlib.aclosing(events):
+            async for event in events:
+                if isinstance(event, TextChunk):
+                    yield event.chunk
+
+    async def chat_events(
+        self, message: str, limits: Optional[TurnLimits] = None
+    ) -> AsyncIterator[AgentEvent]:
+        """Send a message to the agent and stream typed events for the turn.
+
+        Besides ``TextChunk`` events for the reply, every tool call produces
+        ``ToolCallStarted``, ``ToolOutputChunk`` (for streaming tools) and
+        ``ToolCallFinished`` events as it runs.
+        """
         if not self.provider:
             raise RuntimeError("No provider configured for agent.")
 
@@ -139,65 +321,277 @@ class Agent:
 
         # Add the user's message to history
         self.history.add_user_message(message)
+        self.last_error = None
+        self.last_stop_reason = None
+
+        # Keep the history within the agent's token budget
+        await self.history_manager.compact(self.history)
 
+        self._turn_count += 1
+        recorder = TurnRecorder(self.name, self._turn_count)
+        recorder.metrics.prefix_hash = self.prefix_hash()
+        control = TurnControl(limits or self.turn_limits)
+        self._turn_control = control
+
+        # Buffer the streamed reply so it lands in history as one message
+        accumulator = StreamAccumulator()
         try:
-            # Use regular chat for all responses
-            async for chunk in self.provider.chat(self.history, self.kernel):
-                # Add non-empty responses to history
-                if chunk.content.strip():
-                    self.history.add_assistant_message(chunk.content)
-                yield chunk
+            if self.planner is not None:
+                respond = self._plan_and_execute(
+                    message, recorder, accumulator, control
+                )
+            else:
+                respond = self._respond(recorder, accumulator, control)
+            async with contextlib.aclosing(respond):
+                async for event in respond:
+                    yield event
+
+        except TurnStopped as stop:
+            # Keep what was streamed so far, minus any half-formed tool calls
+            self.last_stop_reason = stop.reason
+            marker = truncation_marker(stop.reason)
+            partial = accumulator.text.rstrip()
+            accumulator.reset()
+            self.history.add_assistant_message(
+                f"{partial}\n\n{marker}" if partial else marker
+            )
+            yield TextChunk(
+                StreamingChatMessageContent(
+                    content=f"\n\n{marker}",
+                    role="assistant",
+                    choice_index=0,
+                    metadata={"truncated": stop.reason},
+                )
+            )
 
         except Exception as e:
             error_msg = f"Error in chat: {str(e)}"
             logger.exception("Error in chat session")
+            self.last_error = str(e)
+            accumulator.reset()
             self.history.add_assistant_message(error_msg)
-            yield StreamingChatMessageContent(
-                content=error_msg, role="assistant", choice_index=0
+            yield TextChunk(
+                StreamingChatMessageContent(
+                    content=error_msg, role="assistant", choice_index=0
+                )
+            )
+
+        finally:
+            control.close()
+            self._turn_control = None
+            if self.session_log is not None:
+                # A long log is not written on the event loop
+                await asyncio.to_thread(self._save_session)
+
+        self.last_turn_metrics = recorder.finish(self.last_error, self.last_stop_reason)
+        self.emit_metrics(self.last_turn_metrics)
+
+    async def _respond(
+        self,
+        recorder: TurnRecorder,
+        accumulator: StreamAccumulator,
+        control: TurnControl,
+    ) -> AsyncIterator[AgentEvent]:
+        """Answer the last message in history, running tools until done."""
+        for _ in range(MAX_TOOL_ROUNDS):
+            recorder.start_request()
+            stream = control.stream(self.provider.chat(self.history, self.kernel))
+            async with contextlib.aclosing(stream):
+                async for chunk in stream:
+                    recorder.chunk(chunk)
+                    accumulator.add(chunk)
+                    yield TextChunk(chunk)
+                    control.count_output(chunk)
+            recorder.end_request()
+
+            function_calls = accumulator.function_calls
+            accumulator.commit(self.history)
+            if not function_calls:
+                break
+
+            # Run the requested tools, reporting progress as it happens, and
+            # answer them in call order
+            tools_start = time.perf_counter()
+            finished: Dict[int, ToolCallResult] = {}
+            events = control.stream(self.tool_dispatcher.stream(function_calls))
+            try:
+                async with contextlib.aclosing(events):
+                    async for event in events:
+                        if isinstance(event, ToolCallFinished):
+                            finished[event.index] = ToolCallResult(
+                                call=function_calls[event.index],
+                                result=event.result,
+                                duration=event.duration,
+                                error=event.error,
+                            )
+                        yield event
+            except TurnStopped as stop:
+                # Every tool call in history needs an answer
+                for index, call in enumerate(function_calls):
+                    result = finished.get(index) or ToolCallResult(
+                        call=call,
+                        result=f"Tool call stopped: {stop.reason}",
+                        duration=time.perf_counter() - tools_start,
+                        error=True,
+                    )
+                    self.history.add_message(result.to_message())
+                raise
+            results = [finished[index] for index in range(len(function_calls))]
+            recorder.add_tool_time(time.perf_counter() - tools_start)
+            recorder.tool_results(results)
+            for result in results:
+                self.history.add_message(result.to_message())
+        else:
+            logger.warning(
+                "Stopped after %d tool rounds without a final answer",
+                MAX_TOOL_ROUNDS,
             )
 
+    async def _plan_and_execute(
+        self,
+        message: str,
+        recorder: TurnRecorder,
+        accumulator: StreamAccumulator,
+        control: TurnControl,
+    ) -> AsyncIterator[AgentEvent]:
+        """Plan the request, run each step with tools, then answer.
+
+        The plan, a header per step and every step's output are streamed as
+        they happen. Steps run in the agent's history so later steps and the
+        final answer can build on earlier results.
+        """
+        from agent_runtime.planner import plan_chunk
+
+        planner = self.planner
+        tool_names = [
+            f"{plugin.name}_{function.name}"
+            for plugin in self.kernel.plugins.values()
+            for function in plugin.functions.values()
+        ]
+
+        yield TextChunk(plan_chunk("Plan:\n", "plan"))
+        plan_text = []
+        recorder.start_request()
+        stream = control.stream(planner.plan(self.system_prompt, message, tool_names))
+        async with contextlib.aclosing(stream):
+            async for chunk in stream:
+                recorder.chunk(chunk)
+                if chunk.content:
+                    plan_text.append(chunk.content)
+                yield TextChunk(chunk)
+                control.count_output(chunk)
+        recorder.end_request()
+        self.history.add_assistant_message("Plan:\n" + "".join(plan_text).strip())
+
+        steps = planner.steps
+        for index, step in enumerate(steps, start=1):
+            yield TextChunk(
+                plan_chunk(f"\n\n[Step {index}/{len(steps)}] {step}\n", "step", index)
+            )
+            self.history.add_user_message(planner.step_message(index, len(steps), step))
+            respond = self._respond(recorder, accumulator, control)
+            async with contextlib.aclosing(respond):
+                async for event in respond:
+                    yield event
+
+        yield TextChunk(plan_chunk("\n\n[Answer]\n", "final"))
+        self.history.add_user_message(planner.final_message())
+        respond = self._respond(recorder, accumulator, control)
+        async with contextlib.aclosing(respond):
+            async for event in respond:
+                yield event
+
     @classmethod
     def from_config(
         cls,
         config: Dict[str, Any],
         base_dir: Optional[Path] = None,
         skip_init: bool = False,
+        provider: Any = None,
     ) -> "Agent":
         """
         Create an agent from a config dictionary.
 
+        If ``provider`` is given it is used instead of building one from the
+        model block; the caller owns it and the agent will not close it.
+
         Expects a structure like:
         {
             "name": "AgentName",
             "description": "...",
             "system_prompt": "...",
             "model": {
-                "provider": "openai" or "ollama",
+                "provider": "openai", "ollama" or "replay",
                 "name": "gpt-3.5-turbo" or "llama2",
-                "settings": [ ... ]  # optional
-            }
+                "settings": [ ... ],  # optional
+                "cache": [{"ttl": 3600}]  # optional response cache
+            },
+            "history": [  # optional
+                {"max_tokens": 8000, "keep_turns": 10, "strategy": "summarize"}
+            ],
+            "planner": [{"max_steps": 5}],  # optional, turns on planning mode
+            "limits": [{"timeout": 120, "max_output_tokens": 4000}]  # optional
         }
         """
+        owns_provider = provider is None
+        if provider is None:
+            provider = cls.build_provider(
+                config.get("model", {}), config.get("name"), base_dir
+            )
+
+        # "history" is a single nested block, which HCL gives us as a list
+        history_settings = (config.get("history", [{}]) or [{}])[0]
+        planner_settings = (config.get("planner") or [None])[0]
+        limits_settings = (config.get("limits", [{}]) or [{}])[0]
+
+        agent = cls(
+            name=config["name"],
+            description=config.get("description", ""),
+            system_prompt=config["system_prompt"],
+            provider=provider,
+            base_dir=base_dir,
+            skip_init=skip_init,
+            history_config=HistoryConfig.from_dict(history_settings),
+            planner_config=(
+                PlannerConfig.from_dict(planner_settings)
+                if planner_settings is not None
+                else None
+            ),
+            turn_limits=TurnLimits.from_dict(limits_settings),
+        )
+        agent._owns_provider = owns_provider
+        return agent
+
+    @staticmethod
+    def build_provider(
+        model_config: Any,
+        agent_id: Optional[str] = None,
+        base_dir: Optional[Path] = None,
+    ) -> Any:
+        """Create the provider for an agent's resolved ``model`` block."""
         from agent_runtime.providers.base import ProviderConfig, ProviderType
 
         # Extract model info
-        model_config = config.get("model", {})
         if isinstance(model_config, dict):
             provider_type = model_config.get("provider", "openai")
             model_name = model_config.get("name", "gpt-3.5-turbo")
             # "settings" might be a list of dicts; take the first if present
-            model_settings = (model_config.get("settings", [{}]) or [{}])[0]
+            # (copied, as providers fill in defaults such as Ollama's base_url)
+            model_settings = dict((model_config.get("settings", [{}]) or [{}])[0])
+            # An optional "cache" block turns on the response cache
+            cache_settings = (model_config.get("cache") or [None])[0]
         else:
             provider_type = "openai"
             model_name = "gpt-3.5-turbo"
             model_settings = {}
+            cache_settings = None
 
         # Build provider config
         provider_config = ProviderConfig(
             name=ProviderType(provider_type),
             model=model_name,
             settings=model_settings,
-            agent_id=config.get("name"),
+            agent_id=agent_id,
         )
 
         # Instantiate the correct provider
@@ -205,17 +599,30 @@ class Agent:
             from agent_runtime.providers.ollama import OllamaProvider
 
             provider = OllamaProvider(provider_config)
+        elif provider_type == "replay":
+            from agent_runtime.providers.replay import ReplayProvider
+
+            # Fixture paths are relative to the config directory
+            provider = ReplayProvider(provider_config, base_dir=base_dir)
         else:
             from agent_runtime.providers.openai import OpenAIProvider
 
             # IMPORTANT: Pass base_dir, so the provider can use it for PluginManager
             provider = OpenAIProvider(provider_config, base_dir=base_dir)
 
-        return cls(
-            name=config["name"],
-            description=config.get("description", ""),
-            system_prompt=config["system_prompt"],
-            provider=provider,
-            base_dir=base_dir,
-            skip_init=skip_init,
-        )
+        if cache_settings is not None:
+            from agent_runtime.providers.cache import (
+                CACHE_DIR_NAME,
+                CacheConfig,
+                CachingProvider,
+                ResponseCache,
+            )
+
+            # Without a project directory the cache is memory-only
+            cache_dir = (
+                Path(base_dir) / CACHE_DIR_NAME / "responses" if base_dir else None
+            )
+            cache = ResponseCache(CacheConfig.from_dict(cache_settings), cache_dir)
+            provider = CachingProvider(provider, cache)
+
+        return provider
@@ -0,0 +1,202 @@
+"""Headless batch runs of an agent over a JSONL file of prompts."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from agent_runtime.agent import Agent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchSummary:
+    """Counts for a finished batch run."""
+
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def record_key(record: Dict[str, Any], index: int) -> str:
+    """Key identifying an input record across runs: its ``id`` or line index."""
+    return str(record.get("id", index))
+
+
+def record_turns(record: Dict[str, Any]) -> List[str]:
+    """User messages to send for an input record.
+
+    A record is either a single prompt, ``{"id": "a", "prompt": "..."}``, or a
+    conversation, ``{"id": "b", "messages": ["...", "..."]}``. Conversation
+    messages may also be ``{"role": "user", "content": "..."}`` objects; any
+    non-user messages are ignored because the agent produces its own replies.
+    """
+    if "prompt" in record:
+        return [str(record["prompt"])]
+
+    messages = record.get("messages")
+    if not isinstance(messages, list) or not messages:
+        raise ValueError("Record must have a 'prompt' or a non-empty 'messages' list")
+
+    turns = []
+    for message in messages:
+        if isinstance(message, str):
+            turns.append(message)
+        elif isinstance(message, dict) and message.get("role", "user") == "user":
+            turns.append(str(message.get("content", "")))
+    if not turns:
+        raise ValueError("Record 'messages' has no user messages")
+    return turns
+
+
+def read_records(input_path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(index, record)`` for each non-blank line of a JSONL file."""
+    with open(input_path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{input_path}:{index + 1}: invalid JSON: {e}") from e
+            if not isinstance(record, dict):
+                raise ValueError(f"{input_path}:{index + 1}: record must be an object")
+            yield index, record
+
+
+def load_completed(output_path: Path) -> Set[str]:
+    """Collect the keys of records that already finished successfully.
+
+    The output file is rewritten to hold only those results, dropping failed
+    records (so they are retried) and any line cut short by a crash.
+    """
+    if not output_path.exists():
+        return set()
+
+    completed: Set[str] = set()
+    kept: List[str] = []
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug("Dropping incomplete output line: %r", line[:80])
+                continue
+            if not isinstance(result, dict) or result.get("error"):
+                continue
+            completed.add(str(result.get("id")))
+            kept.append(json.dumps(result, ensure_ascii=False))
+
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in kept)
+    os.replace(tmp_path, output_path)
+    return completed
+
+
+class BatchRunner:
+    """Run records from a JSONL file through an agent with bounded concurrency.
+
+    Each worker has its own clone of the agent, so conversations never share
+    history, while the provider, kernel and tool dispatcher are shared. Results
+    are appended to the output file as soon as each record finishes.
+    """
+
+    def __init__(self, agent: Agent, concurrency: int = 4) -> None:
+        if concurrency < 1:
+            raise ValueError("Batch concurrency must be at least 1")
+        self.agent = agent
+        self.concurrency = concurrency
+
+    async def run(
+        self, input_path: Path, output_path: Path, resume: bool = False
+    ) -> BatchSummary:
+        """Process ``input_path`` and write one result line per record."""
+        completed = load_completed(output_path) if resume else set()
+        summary = BatchSummary()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, record in read_records(input_path):
+            summary.total += 1
+            if record_key(record, index) in completed:
+                summary.skipped += 1
+                continue
+            queue.put_nowait((index, record))
+
+        if summary.skipped:
+            logger.info(
+                "Resuming batch: skipping %d completed records", summary.skipped
+            )
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "a" if resume else "w"
+        with open(output_path, mode, encoding="utf-8") as out:
+            workers = [
+                self.agent if i == 0 else self.agent.clone()
+                for i in range(min(self.concurrency, queue.qsize()))
+            ]
+            await asyncio.gather(
+                *(self._worker(agent, queue, out, summary) for agent in workers)
+            )
+        return summary
+
+    async def _worker(
+        self, agent: Agent, queue: asyncio.Queue, out: Any, summary: BatchSummary
+    ) -> None:
+        while not queue.empty():
+            index, record = queue.get_nowait()
+            result = await self.run_record(agent, index, record)
+            if result["error"]:
+                summary.failed += 1
+            else:
+                summary.completed += 1
+            # Flush every result so a crash loses at most the records in flight
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+
+    async def run_record(
+        self, agent: Agent, index: int, record: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run one record as a fresh conversation and build its result."""
+        start = time.perf_counter()
+        responses: List[str] = []
+        error = None
+        stop_reason = None
+        try:
+            agent.start_new_session()
+            for turn in record_turns(record):
+                parts = []
+                async for chunk in agent.chat(turn):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                responses.append("".join(parts))
+                if agent.last_error:
+                    # The agent reports provider failures as a reply; surface
+                    # them as errors so a resumed run retries the record.
+                    error = agent.last_error
+                    break
+                if agent.last_stop_reason:
+                    # A reply cut short by the turn limits is not a result
+                    # either; a resumed run retries it
+                    stop_reason = agent.last_stop_reason
+                    error = f"Turn stopped: {stop_reason}"
+                    break
+        except Exception as e:
+            logger.exception("Error running batch record %s", record_key(record, index))
+            error = str(e)
+
+        return {
+            "id": record.get("id", index),
+            "index": index,
+            "response": responses[-1] if responses else None,
+            "responses": responses,
+            "error": error,
+            "stop_reason": stop_reason,
+            "duration": round(time.perf_counter() - start, 3),
+        }
@@ -10,9 +10,12 @@ import click
 from dotenv import load_dotenv
 
 from agent_runtime.core import (
+    gc_plugin_store,
     load_and_validate_config,
     init_plugins,
+    run_agent_batch,
     run_agent_interactive,
+    run_server,
 )
 from agent_runtime.utils import Style
 
@@ -149,7 +152,12 @@ def validate(dir: Path) -> None:
     type=str,
     help="Name of the agent to initialize (if not specified, all agents will be initialized)",
 )
-def init(dir: Path, agent: Optional[str] = None) -> None:
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of plugins to install at once (default: 8)",
+)
+def init(dir: Path, agent: Optional[str] = None, jobs: Optional[int] = None) -> None:
     """Initialize agents by installing plugins and updating the lockfile."""
     logger.debug("Initializing agents from directory: %s (agent=%s)", dir, agent)
     try:
@@ -157,13 +165,48 @@ def init(dir: Path, agent: Optional[str] = None) -> None:
         # First validate the configuration
         load_and_validate_config(dir)
         # Then initialize plugins if validation passes
-        init_plugins(dir, agent)
+        init_plugins(dir, agent, jobs)
         click.echo()  # Add newline after
     except Exception as e:
         _handle_validation_error(e, "initialize plugins")
         raise SystemExit(1)
 
 
+@cli.command()
+@click.option(
+    "--max-size",
+    type=str,
+    help="Only remove unused plugins until the store is this small (e.g. 500MB)",
+)
+@click.option(
+    "--max-age",
+    type=click.FloatRange(min=0),
+    help="Only remove plugins unused for this many days",
+)
+@click.option("--dry-run", is_flag=True, help="List what would be removed")
+def gc(max_size: Optional[str], max_age: Optional[float], dry_run: bool) -> None:
+    """Remove cached plugins that no project uses any more.
+
+    Plugins are removed least recently used first.
+    """
+    from agent_runtime.plugins.store import parse_size
+
+    try:
+        size = parse_size(max_size) if max_size is not None else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--max-size")
+
+    try:
+        click.echo()  # Add newline before
+        click.echo(Style.header("Cleaning up the plugin store..."))
+        gc_plugin_store(max_size=size, max_age_days=max_age, dry_run=dry_run)
+        click.echo()  # Add newline after
+    except Exception as e:
+        logger.exception("Error cleaning up the plugin store.")
+        click.echo(Style.error(str(e)))
+        raise SystemExit(1)
+
+
 @cli.command()
 @click.option(
     "--dir",
@@ -187,8 +230,29 @@ def init(dir: Path, agent: Optional[str] = None) -> None:
     type=str,
     help="Name of the agent to run (required if multiple agents are configured)",
 )
+@click.option(
+    "--trace",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Append per-turn latency metrics to this JSONL file",
+)
+@click.option(
+    "--session",
+    type=str,
+    help="Save the conversation under this id and resume it on the next run",
+)
+@click.option(
+    "--compress-session",
+    is_flag=True,
+    help="Store a new session log gzip-compressed",
+)
 def run(
-    dir: Path, var_file: tuple[Path, ...], var: tuple[str, ...], agent: Optional[str]
+    dir: Path,
+    var_file: tuple[Path, ...],
+    var: tuple[str, ...],
+    agent: Optional[str],
+    trace: Optional[Path],
+    session: Optional[str],
+    compress_session: bool,
 ) -> None:
     """Run an interactive session with an agent."""
     logger.debug("Running agent from directory: %s (agent=%s)", dir, agent)
@@ -198,7 +262,15 @@ def run(
     try:
         click.echo()  # Add newline before
         click.echo(Style.header("Starting agent..."))
-        run_agent_interactive(dir, agent, var_files=var_file, cli_vars=var)
+        run_agent_interactive(
+            dir,
+            agent,
+            var_files=var_file,
+            cli_vars=var,
+            trace_path=trace,
+            session_id=session,
+            compress_session=compress_session,
+        )
         click.echo()  # Add newline after
     except Exception as e:
         logger.exception("Error running agent.")
@@ -206,5 +278,185 @@ def run(
         raise SystemExit(1)
 
 
+@cli.command()
+@click.argument(
+    "input_file",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="JSONL file to write results to",
+)
+@click.option(
+    "--dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=".",
+    help="Directory containing HCL config files",
+)
+@click.option(
+    "--var-file",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    multiple=True,
+    help="HCL variable file(s) to load",
+)
+@click.option(
+    "--var",
+    multiple=True,
+    help="Individual variable values (format: 'name=value')",
+)
+@click.option(
+    "--agent",
+    type=str,
+    help="Name of the agent to run (required if multiple agents are configured)",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of records to run at the same time",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip records already completed in the output file",
+)
+@click.option(
+    "--trace",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Append per-turn latency metrics to this JSONL file",
+)
+def batch(
+    input_file: Path,
+    output: Path,
+    dir: Path,
+    var_file: tuple[Path, ...],
+    var: tuple[str, ...],
+    agent: Optional[str],
+    concurrency: int,
+    resume: bool,
+    trace: Optional[Path],
+) -> None:
+    """Run an agent over a JSONL file of prompts or conversations."""
+    logger.debug(
+        "Running batch from %s to %s (agent=%s, concurrency=%d, resume=%s)",
+        input_file,
+        output,
+        agent,
+        concurrency,
+        resume,
+    )
+
+    try:
+        click.echo()  # Add newline before
+        click.echo(Style.header("Running batch..."))
+        summary = run_agent_batch(
+            dir,
+            input_file,
+            output,
+            agent_name=agent,
+            var_files=var_file,
+            cli_vars=var,
+            concurrency=concurrency,
+            resume=resume,
+            trace_path=trace,
+        )
+        click.echo(
+            Style.success(
+                f"Completed {summary.completed} of {summary.total} records "
+                f"({summary.failed} failed, {summary.skipped} skipped)."
+            )
+        )
+        click.echo(Style.info(f"Results written to {output}"))
+        click.echo()  # Add newline after
+    except Exception as e:
+        logger.exception("Error running batch.")
+        click.echo(Style.error(str(e)))
+        raise SystemExit(1)
+
+    if summary.failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option(
+    "--dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=".",
+    help="Directory containing HCL config files",
+)
+@click.option(
+    "--var-file",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    multiple=True,
+    help="HCL variable file(s) to load",
+)
+@click.option(
+    "--var",
+    multiple=True,
+    help="Individual variable values (format: 'name=value')",
+)
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host to bind")
+@click.option("--port", default=8080, show_default=True, help="Port to bind")
+@click.option(
+    "--max-sessions",
+    type=click.IntRange(min=1),
+    default=256,
+    show_default=True,
+    help="Chat sessions kept in memory before the least recently used is dropped",
+)
+@click.option(
+    "--trace",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Append per-turn latency metrics to this JSONL file",
+)
+@click.option(
+    "--persist-sessions",
+    is_flag=True,
+    help="Save chat sessions under .sessions/ so they survive eviction and restarts",
+)
+@click.option(
+    "--compress-sessions",
+    is_flag=True,
+    help="Store new session logs gzip-compressed",
+)
+def serve(
+    dir: Path,
+    var_file: tuple[Path, ...],
+    var: tuple[str, ...],
+    host: str,
+    port: int,
+    max_sessions: int,
+    trace: Optional[Path],
+    persist_sessions: bool,
+    compress_sessions: bool,
+) -> None:
+    """Serve all configured agents over HTTP with streaming responses."""
+    logger.debug("Serving agents from directory: %s on %s:%d", dir, host, port)
+
+    try:
+        click.echo()  # Add newline before
+        click.echo(Style.header("Starting agent server..."))
+        run_server(
+            dir,
+            host=host,
+            port=port,
+            var_files=var_file,
+            cli_vars=var,
+            max_sessions=max_sessions,
+            trace_path=trace,
+            persist_sessions=persist_sessions,
+            compress_sessions=compress_sessions,
+        )
+    except Exception as e:
+        logger.exception("Error running agent server.")
+        click.echo(Style.error(str(e)))
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     cli()
@@ -1,21 +1,32 @@
 # agent_runtime/core.py
 
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, AsyncIterator, Tuple
 
 import click
-from semantic_kernel import Kernel
 
+from .manifest import compile_manifest, config_hash, load_manifest, write_manifest
 from .schema.loader import ConfigLoader, VarLoader
 from .plugins.manager import PluginConfig, PluginManager
-from .agent import Agent
+from .plugins.store import get_plugin_store
 from .utils import Style
 
+# semantic_kernel and aiohttp are slow to import, so modules that need them
+# are imported inside the commands that run agents. 'validate' never loads
+# them; 'init' loads semantic_kernel only to compile the startup manifest.
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .batch import BatchSummary
+    from .events import AgentEvent
+    from .metrics import TraceWriter
+    from .runtime import AgentRuntime
+
 logger = logging.getLogger(__name__)
 
 
-async def _chat_loop(agent: Agent) -> AsyncIterator[str]:
+async def _chat_loop(agent: "Agent") -> AsyncIterator[str]:
     """
     Yields the agent's responses chunk by chunk in an ongoing chat session.
     This is an internal helper for interactive modes or headless piping.
@@ -64,6 +75,22 @@ def load_and_validate_config(
     return loader.load_config(var_loader=var_loader)
 
 
+def apply_runtime_settings(config: Dict[str, Any]) -> None:
+    """Apply process-wide settings from the ``runtime`` block."""
+    from .providers.scheduler import SchedulerConfig, configure_scheduler
+
+    runtime = config.get("runtime") or {}
+    defaults = SchedulerConfig()
+    configure_scheduler(
+        SchedulerConfig(
+            max_concurrent_requests=int(
+                runtime.get("max_concurrent_requests", defaults.max_concurrent_requests)
+            ),
+            max_retries=int(runtime.get("max_retries", defaults.max_retries)),
+        )
+    )
+
+
 def collect_plugins_for_agents(
     agent_configs: Dict[str, Dict[str, Any]], agent_name: Optional[str] = None
 ) -> List[PluginConfig]:
@@ -119,6 +146,7 @@ def collect_plugins_for_agents(
             source=plugin_def["source"],
             version=plugin_def.get("version"),
             variables=plugin_def.get("variables", {}),
+            max_concurrency=plugin_def.get("max_concurrency"),
         )
         all_plugins[plugin_key] = pc
 
@@ -128,14 +156,17 @@ def collect_plugins_for_agents(
     return list(all_plugins.values())
 
 
-def init_plugins(config_dir: Path, agent_name: Optional[str] = None) -> None:
+def init_plugins(
+    config_dir: Path, agent_name: Optional[str] = None, jobs: Optional[int] = None
+) -> None:
     """
     The 'init' step: load config, collect plugins, install them,
     and update the global lockfile. If agent_name is specified,
     only that agent's plugins are installed. Otherwise, all are installed.
+    Up to ``jobs`` plugins are installed at once.
+    Finally the startup manifest is compiled for those agents.
     """
-    from .plugins.manager import PluginManager
-
+    inputs_hash = config_hash(config_dir)
     config = load_and_validate_config(config_dir)
 
     # First collect all plugins that should exist
@@ -146,8 +177,9 @@ def init_plugins(config_dir: Path, agent_name: Optional[str] = None) -> None:
         # Otherwise get all plugins defined in the config
         plugin_list = collect_plugins_for_agents(config)
 
-    kernel = Kernel()
-    pm = PluginManager(config_dir, kernel)
+    # Plugins are installed and hashed but not imported into a kernel here;
+    # that happens when an agent runs.
+    pm = PluginManager(config_dir)
 
     # Clear existing configs and store new ones using scoped names
     pm.plugin_configs.clear()
@@ -158,27 +190,122 @@ def init_plugins(config_dir: Path, agent_name: Optional[str] = None) -> None:
     logger.debug(
         "Creating new lockfile with plugins: %s", [p.scoped_name for p in plugin_list]
     )
-    new_data = {"plugins": []}
-    if plugin_list:
-        new_data = pm.create_lock_data()
-
     if not plugin_list:
         click.echo(Style.info("No plugins found. Lockfile cleaned"))
-        pm.write_lockfile(config_dir / "plugins.lock.json", new_data)
+        pm.write_lockfile(config_dir / "plugins.lock.json", {"plugins": []})
+    else:
+        # Install plugins and update the lockfile
+        pm.install_and_load_plugins(
+            plugin_list, force_reinstall=False, load=False, max_workers=jobs
+        )
+
+    # Record what 'run' would otherwise rediscover on every start
+    agent_names = [agent_name] if agent_name else list(config.get("agent", {}))
+    manifest = compile_manifest(config_dir, config, agent_names, inputs_hash)
+    write_manifest(config_dir, manifest)
+
+
+def gc_plugin_store(
+    max_size: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    dry_run: bool = False,
+) -> None:
+    """Remove plugin store entries that no project uses any more."""
+    store = get_plugin_store()
+    if store is None:
+        click.echo(Style.info("The plugin store is turned off"))
         return
 
-    # Install and load plugins
-    pm.install_and_load_plugins(plugin_list, force_reinstall=False)
+    max_age = max_age_days * 86400 if max_age_days is not None else None
+    result = store.gc(max_size=max_size, max_age=max_age, dry_run=dry_run)
+    verb = "Would remove" if dry_run else "Removed"
+    for entry in result.removed:
+        click.echo(Style.plugin_status(entry.sha[:12], verb.lower(), "red"))
+    kept_size = sum(e.size for e in result.kept)
+    click.echo(
+        Style.success(
+            f"{verb} {len(result.removed)} plugin(s), "
+            f"{result.freed / (1 << 20):.1f} MB; "
+            f"{len(result.kept)} kept ({kept_size / (1 << 20):.1f} MB) in {store.root}"
+        )
+    )
 
 
-def run_agent_interactive(
+def _load_config(
+    config_dir: Path,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """The resolved configuration, from a fresh startup manifest if there is one."""
+    manifest = load_manifest(config_dir, var_files, cli_vars)
+    if manifest is not None:
+        logger.debug("Using the startup manifest")
+        return manifest["config"], manifest
+    return load_and_validate_config(config_dir, var_files, cli_vars), None
+
+
+async def build_agent(
     config_dir: Path,
     agent_name: Optional[str] = None,
     var_files: Optional[Tuple[Path, ...]] = None,
     cli_vars: Optional[Tuple[str, ...]] = None,
-) -> None:
-    """Run an interactive session with an agent."""
-    config = load_and_validate_config(config_dir, var_files, cli_vars)
+) -> "Agent":
+    """Load the configuration and create an agent with its plugins loaded.
+
+    Run it on the loop the agent will serve, since plugin ``setup`` hooks
+    run on it.
+    """
+    start = time.perf_counter()
+    config, manifest = _load_config(config_dir, var_files, cli_vars)
+    config_load = time.perf_counter() - start
+    apply_runtime_settings(config)
+
+    agent = await create_agent(config_dir, config, agent_name, manifest=manifest)
+    agent.startup_metrics.config_load = config_load
+    return agent
+
+
+async def build_runtime(
+    config_dir: Path,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+) -> "AgentRuntime":
+    """Load the configuration once and host every configured agent.
+
+    Like ``build_agent``, run it on the loop that serves the agents.
+    """
+    from .runtime import AgentRuntime
+
+    start = time.perf_counter()
+    config, manifest = _load_config(config_dir, var_files, cli_vars)
+    config_load = time.perf_counter() - start
+    apply_runtime_settings(config)
+
+    runtime = AgentRuntime(config_dir, config, manifest)
+    for agent in (await runtime.load_all()).values():
+        agent.startup_metrics.config_load = config_load
+    return runtime
+
+
+async def create_agent(
+    config_dir: Path,
+    config: Dict[str, Any],
+    agent_name: Optional[str] = None,
+    provider: Any = None,
+    shared_plugins: Optional[Dict[str, Any]] = None,
+    manifest: Optional[Dict[str, Any]] = None,
+) -> "Agent":
+    """Create an agent from an already loaded configuration.
+
+    ``provider`` and ``shared_plugins`` let several agents share a provider
+    and stateless plugin instances; see AgentRuntime. A fresh ``manifest``
+    (see agent_runtime.manifest) that covers the agent lets plugin loading
+    skip the lockfile check and plugin class discovery.
+    """
+    from semantic_kernel import Kernel
+
+    from .agent import Agent
+    from .plugins.manager import get_tool_schema_cache
 
     agent_configs = config["agent"]
 
@@ -195,9 +322,12 @@ def run_agent_interactive(
 
     agent_cfg = agent_configs[agent_name]
     plugin_list = collect_plugins_for_agents(config, agent_name)
+    warm = (manifest or {}).get("agents", {}).get(agent_name)
+    if warm is not None and warm["plugins"] != [p.scoped_name for p in plugin_list]:
+        warm = None
 
     kernel = Kernel()
-    pm = PluginManager(config_dir, kernel)
+    pm = PluginManager(config_dir, kernel, shared_plugins)
 
     # Compare with existing lock
     pm.plugin_configs.clear()
@@ -206,7 +336,7 @@ def run_agent_interactive(
 
     # Check lockfile for remote plugins
     github_plugins = [p for p in plugin_list if p.is_github_source]
-    if github_plugins:
+    if github_plugins and warm is None:
         lockfile = config_dir / "plugins.lock.json"
         if not lockfile.exists():
             raise RuntimeError("No lockfile found. Please run 'init' first.")
@@ -220,43 +350,241 @@ def run_agent_interactive(
                 "Please run 'init' again to update."
             )
 
-    # Load all the plugins
-    for cfg_item in plugin_list:
-        git_ref = cfg_item.git_ref if cfg_item.is_github_source else None
-        pm.load_plugin(cfg_item.scoped_name, git_ref)
+    # Load all the plugins, side by side
+    class_names = {}
+    if warm is not None:
+        class_names = {
+            name: manifest["plugins"][name]["class"] for name in warm["plugins"]
+        }
+    start = time.perf_counter()
+    plugin_load = await pm.load_plugins(plugin_list, class_names)
+    plugin_load_total = time.perf_counter() - start
+    if warm is not None:
+        get_tool_schema_cache().seed(kernel, warm["tools"])
 
     # Create the Agent with our kernel that has the plugins loaded
-    agent = Agent.from_config(agent_cfg, base_dir=config_dir, skip_init=True)
+    agent = Agent.from_config(
+        agent_cfg, base_dir=config_dir, skip_init=True, provider=provider
+    )
     agent.kernel = kernel
+    agent.plugin_concurrency = pm.get_concurrency_limits()
+    agent.startup_metrics.plugin_load = plugin_load
+    agent.startup_metrics.plugin_load_total = plugin_load_total
+    agent.startup_metrics.warm_start = warm is not None
+    return agent
+
+
+def attach_trace(agent: "Agent", trace_path: Path) -> "TraceWriter":
+    """Write the agent's startup and per-turn metrics to a JSONL trace file."""
+    from .metrics import TraceWriter
+
+    writer = TraceWriter(trace_path)
+    writer(agent.startup_metrics)
+    agent.add_metrics_listener(writer)
+    return writer
+
+
+def _print_event(event: "AgentEvent") -> None:
+    """Render one chat event in the interactive session."""
+    from .events import TextChunk, ToolCallFinished, ToolCallStarted
+
+    if isinstance(event, TextChunk):
+        print(event.content, end="", flush=True)
+    elif isinstance(event, ToolCallStarted):
+        arguments = ", ".join(f"{k}={v!r}" for k, v in event.arguments.items())
+        click.echo(Style.info(f"\n[tool] {event.name}({arguments})"))
+    elif isinstance(event, ToolCallFinished):
+        status = "failed" if event.error else "done"
+        click.echo(Style.info(f"[tool] {event.name} {status} in {event.duration:.2f}s"))
+    else:
+        # Output streamed by a long-running tool
+        print(Style.info(event.content), end="", flush=True)
 
-    click.echo(Style.success(f"Agent '{agent_cfg['name']}' is ready."))
-    click.echo(Style.info("Type 'exit' or 'quit' to end the session."))
-    click.echo(Style.info("Type 'reset' to start a new conversation."))
-    click.echo("----------")
 
+def run_agent_interactive(
+    config_dir: Path,
+    agent_name: Optional[str] = None,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+    trace_path: Optional[Path] = None,
+    session_id: Optional[str] = None,
+    compress_session: bool = False,
+) -> None:
+    """Run an interactive session with an agent.
+
+    With ``session_id`` the conversation is saved after every turn and
+    resumed from where it left off the next time the same id is used.
+    """
     import asyncio
+    import signal
 
     async def _interactive():
-        while True:
-            try:
-                msg = input("\nYou > ")
-            except EOFError:
-                break
-
-            if msg.lower() in ["exit", "quit"]:
-                break
-            elif msg.lower() == "reset":
-                agent.start_new_session()
-                click.echo(Style.info("Started new conversation"))
-                continue
-
-            print("\nAgent > ", end="")
-            try:
-                async for chunk in agent.chat(msg):
-                    print(chunk.content, end="", flush=True)
-            except Exception as e:
-                logger.exception("Error in chat session.")
-                print(Style.error(f"[Error: {e}]"))
-            print("\n")
+        # Plugins are loaded on this loop, so their async setup hooks can
+        # keep loop-bound state
+        agent = await build_agent(config_dir, agent_name, var_files, cli_vars)
+        trace = attach_trace(agent, trace_path) if trace_path else None
+        try:
+            click.echo(Style.success(f"Agent '{agent.name}' is ready."))
+            click.echo(Style.info(agent.startup_metrics.report()))
+            if session_id and not _resume_session(
+                agent, config_dir, session_id, compress_session
+            ):
+                return
+            click.echo(Style.info("Type 'exit' or 'quit' to end the session."))
+            click.echo(Style.info("Type 'reset' to start a new conversation."))
+            click.echo(Style.info("Press Ctrl+C to stop a reply while it streams."))
+            click.echo("----------")
+
+            while True:
+                try:
+                    msg = input("\nYou > ")
+                except EOFError:
+                    break
+
+                if msg.lower() in ["exit", "quit"]:
+                    break
+                elif msg.lower() == "reset":
+                    agent.start_new_session()
+                    click.echo(Style.info("Started new conversation"))
+                    continue
+
+                print("\nAgent > ", end="")
+                # Ctrl+C cancels the streaming turn instead of the session
+                loop = asyncio.get_running_loop()
+                try:
+                    loop.add_signal_handler(signal.SIGINT, agent.cancel)
+                    interruptible = True
+                except (NotImplementedError, RuntimeError):
+                    interruptible = False  # No loop signal handlers on Windows
+                try:
+                    async for event in agent.chat_events(msg):
+                        _print_event(event)
+                except Exception as e:
+                    logger.exception("Error in chat session.")
+                    print(Style.error(f"[Error: {e}]"))
+                finally:
+                    if interruptible:
+                        loop.remove_signal_handler(signal.SIGINT)
+                print("\n")
+        finally:
+            await agent.aclose()
+            if trace:
+                trace.close()
 
     asyncio.run(_interactive())
+
+
+def _resume_session(
+    agent: "Agent", config_dir: Path, session_id: str, compress: bool
+) -> bool:
+    """Attach the agent to its saved session; False if the log is damaged."""
+    from .sessions import SessionLog, SessionLogError, session_path
+
+    log = SessionLog(session_path(config_dir, agent.name, session_id, compress))
+    try:
+        restored = agent.resume_session(log)
+    except SessionLogError as e:
+        click.echo(Style.error(f"Cannot resume session '{session_id}': {e}"))
+        click.echo(
+            Style.info("Use another --session id, or delete the log to start over.")
+        )
+        return False
+    if restored:
+        click.echo(Style.info(f"Resumed session '{session_id}' ({restored} messages)"))
+    else:
+        click.echo(Style.info(f"Started session '{session_id}'"))
+    return True
+
+
+def run_agent_batch(
+    config_dir: Path,
+    input_path: Path,
+    output_path: Path,
+    agent_name: Optional[str] = None,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+    concurrency: int = 4,
+    resume: bool = False,
+    trace_path: Optional[Path] = None,
+) -> "BatchSummary":
+    """Run every record of a JSONL prompt file through an agent, headlessly."""
+    from .batch import BatchRunner
+
+    import asyncio
+
+    async def _batch() -> "BatchSummary":
+        agent = await build_agent(config_dir, agent_name, var_files, cli_vars)
+        trace = attach_trace(agent, trace_path) if trace_path else None
+        runner = BatchRunner(agent, concurrency=concurrency)
+        try:
+            return await runner.run(input_path, output_path, resume=resume)
+        finally:
+            await agent.aclose()
+            if trace:
+                trace.close()
+
+    return asyncio.run(_batch())
+
+
+def run_server(
+    config_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+    max_sessions: Optional[int] = None,
+    trace_path: Optional[Path] = None,
+    persist_sessions: bool = False,
+    compress_sessions: bool = False,
+) -> None:
+    """Serve every configured agent over HTTP until interrupted."""
+    from aiohttp import web
+
+    from .metrics import TraceWriter
+    from .server import DEFAULT_MAX_SESSIONS, AgentServer
+
+    # The agents are filled in once the server's loop has started
+    agents: Dict[str, "Agent"] = {}
+    server = AgentServer(
+        agents,
+        max_sessions=max_sessions or DEFAULT_MAX_SESSIONS,
+        session_dir=config_dir if persist_sessions else None,
+        compress_sessions=compress_sessions,
+    )
+    app = server.make_app()
+    runtimes: List["AgentRuntime"] = []
+
+    async def _load_runtime(app: web.Application) -> None:
+        # Plugins are loaded on the serving loop, so their async setup hooks
+        # can keep loop-bound state
+        runtime = await build_runtime(config_dir, var_files, cli_vars)
+        runtimes.append(runtime)
+        agents.update(runtime.agents)
+        for key, agent in agents.items():
+            click.echo(
+                Style.success(f"Agent '{agent.name}' is ready at /agents/{key}.")
+            )
+        click.echo(Style.info(f"Listening on http://{host}:{port} (Ctrl+C to stop)"))
+
+    async def _close_runtime(app: web.Application) -> None:
+        for runtime in runtimes:
+            await runtime.aclose()
+
+    app.on_startup.append(_load_runtime)
+    app.on_cleanup.append(_close_runtime)
+
+    if trace_path:
+        trace = TraceWriter(trace_path)
+
+        async def _attach_trace(app: web.Application) -> None:
+            for agent in agents.values():
+                trace(agent.startup_metrics)
+                agent.add_metrics_listener(trace)
+
+        async def _close_trace(app: web.Application) -> None:
+            trace.close()
+
+        app.on_startup.append(_attach_trace)
+        app.on_cleanup.append(_close_trace)
+
+    web.run_app(app, host=host, port=port, print=None)
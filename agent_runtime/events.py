@@ -0,0 +1,96 @@
+"""Typed events streamed by ``Agent.chat_events`` while a turn runs."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Union
+
+from semantic_kernel.contents import StreamingChatMessageContent
+
+
+@dataclass
+class TextChunk:
+    """A piece of the model's reply, as streamed by the provider."""
+
+    chunk: StreamingChatMessageContent
+    type: str = field(default="text", init=False)
+
+    @property
+    def content(self) -> str:
+        return self.chunk.content or ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"type": self.type, "content": self.content}
+        truncated = (self.chunk.metadata or {}).get("truncated")
+        if truncated:
+            data["truncated"] = truncated
+        return data
+
+
+@dataclass
+class ToolCallStarted:
+    """The model asked for a tool call and it is about to run.
+
+    ``index`` is the call's position among the calls of its model response.
+    """
+
+    index: int
+    call_id: str
+    name: str
+    arguments: Dict[str, Any]
+    type: str = field(default="tool_call_started", init=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "index": self.index,
+            "call_id": self.call_id,
+            "name": self.name,
+            "arguments": self.arguments,
+        }
+
+
+@dataclass
+class ToolOutputChunk:
+    """A piece of output from a streaming tool (one that yields its result)."""
+
+    index: int
+    call_id: str
+    name: str
+    content: str
+    type: str = field(default="tool_output", init=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "index": self.index,
+            "call_id": self.call_id,
+            "name": self.name,
+            "content": self.content,
+        }
+
+
+@dataclass
+class ToolCallFinished:
+    """A tool call completed; ``result`` is what the model will see."""
+
+    index: int
+    call_id: str
+    name: str
+    result: str
+    duration: float
+    error: bool = False
+    type: str = field(default="tool_call_finished", init=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "index": self.index,
+            "call_id": self.call_id,
+            "name": self.name,
+            "result": self.result,
+            "duration": self.duration,
+            "error": self.error,
+        }
+
+
+ToolEvent = Union[ToolCallStarted, ToolOutputChunk, ToolCallFinished]
+AgentEvent = Union[TextChunk, ToolCallStarted, ToolOutputChunk, ToolCallFinished]
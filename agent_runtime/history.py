@@ -0,0 +1,189 @@
+"""Token-budgeted chat history management for agents."""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from semantic_kernel.contents import AuthorRole, ChatHistory, ChatMessageContent
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used to estimate token counts without
+# pulling in a model-specific tokenizer.
+CHARS_PER_TOKEN = 4
+
+SUMMARY_METADATA_KEY = "history_summary"
+
+# Receives the previous rolling summary (or None) and the messages being
+# compacted, and returns the new summary text.
+Summarizer = Callable[[Optional[str], List[ChatMessageContent]], Awaitable[str]]
+
+
+@dataclass
+class HistoryConfig:
+    """History settings from an agent's ``history`` block."""
+
+    max_tokens: Optional[int] = None
+    keep_turns: int = 10
+    strategy: str = "window"
+
+    STRATEGIES = ("window", "summarize")
+
+    def __post_init__(self) -> None:
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Invalid history strategy '{self.strategy}'. "
+                f"Must be one of: {', '.join(self.STRATEGIES)}"
+            )
+        if self.keep_turns < 1:
+            raise ValueError("keep_turns must be at least 1")
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "HistoryConfig":
+        """Create a history config from an HCL block dictionary."""
+        data = data or {}
+        max_tokens = data.get("max_tokens")
+        return cls(
+            max_tokens=int(max_tokens) if max_tokens is not None else None,
+            keep_turns=int(data.get("keep_turns", 10)),
+            strategy=data.get("strategy", "window"),
+        )
+
+
+def estimate_tokens(message: ChatMessageContent) -> int:
+    """Estimate the number of prompt tokens a message costs."""
+    serialized = json.dumps(message.to_dict(), ensure_ascii=False)
+    return max(1, len(serialized) // CHARS_PER_TOKEN)
+
+
+class HistoryManager:
+    """Keep a chat history within a token budget.
+
+    The leading system prompt is always pinned and the most recent
+    ``keep_turns`` turns are kept verbatim. Older turns are either dropped
+    (``window``) or folded into a rolling summary that sits right after the
+    system prompt (``summarize``). A turn is a user message plus every
+    assistant and tool message that follows it, so tool calls are never
+    separated from their results.
+    """
+
+    def __init__(
+        self, config: HistoryConfig, summarizer: Optional[Summarizer] = None
+    ) -> None:
+        self.config = config
+        self.summarizer = summarizer
+
+    def count_tokens(self, history: ChatHistory) -> int:
+        """Estimate the token size of the whole history."""
+        return sum(estimate_tokens(m) for m in history.messages)
+
+    def needs_compaction(self, history: ChatHistory) -> bool:
+        """Whether the history is over its token budget."""
+        if not self.config.max_tokens:
+            return False
+        return self.count_tokens(history) > self.config.max_tokens
+
+    async def compact(self, history: ChatHistory) -> bool:
+        """Trim ``history`` in place. Returns True if anything changed."""
+        if not self.needs_compaction(history):
+            return False
+
+        pinned, summary, turns = self._split(history.messages)
+        if len(turns) <= 1:
+            # Never drop the turn in progress
+            return False
+
+        keep = turns[-self.config.keep_turns :]
+        older = turns[: len(turns) - len(keep)]
+
+        # Shrink further if the verbatim tail alone is over budget
+        budget = self.config.max_tokens or 0
+        fixed = sum(estimate_tokens(m) for m in pinned)
+        if summary is not None:
+            fixed += estimate_tokens(summary)
+        while len(keep) > 1 and fixed + self._turn_tokens(keep) > budget:
+            older.append(keep.pop(0))
+
+        if not older:
+            return False
+
+        dropped = [m for turn in older for m in turn]
+        if self.config.strategy == "summarize":
+            summary = await self._summarize(summary, dropped)
+
+        messages = list(pinned)
+        if summary is not None:
+            messages.append(summary)
+        messages.extend(m for turn in keep for m in turn)
+        history.messages = messages
+
+        logger.debug(
+            "Compacted history: %d older turns %s, %d turns kept (~%d tokens)",
+            len(older),
+            "summarized" if self.config.strategy == "summarize" else "dropped",
+            len(keep),
+            self.count_tokens(history),
+        )
+        return True
+
+    async def _summarize(
+        self, summary: Optional[ChatMessageContent], dropped: List[ChatMessageContent]
+    ) -> Optional[ChatMessageContent]:
+        """Fold dropped messages into the rolling summary."""
+        if not self.summarizer:
+            logger.warning("No summarizer configured; dropping older turns instead")
+            return summary
+
+        previous = summary.content if summary is not None else None
+        try:
+            text = await self.summarizer(previous, dropped)
+        except Exception as e:
+            logger.warning("Failed to summarize history, dropping older turns: %s", e)
+            return summary
+
+        return ChatMessageContent(
+            role=AuthorRole.SYSTEM,
+            content=text,
+            metadata={SUMMARY_METADATA_KEY: True},
+        )
+
+    @staticmethod
+    def _split(
+        messages: List[ChatMessageContent],
+    ) -> Tuple[
+        List[ChatMessageContent],
+        Optional[ChatMessageContent],
+        List[List[ChatMessageContent]],
+    ]:
+        """Split messages into pinned system prompt, rolling summary, and turns."""
+        pinned: List[ChatMessageContent] = []
+        summary: Optional[ChatMessageContent] = None
+        index = 0
+        if messages and messages[0].role == AuthorRole.SYSTEM:
+            pinned.append(messages[0])
+            index = 1
+        if index < len(messages) and messages[index].metadata.get(SUMMARY_METADATA_KEY):
+            summary = messages[index]
+            index += 1
+
+        turns: List[List[ChatMessageContent]] = []
+        for message in messages[index:]:
+            if message.role == AuthorRole.USER or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+        return pinned, summary, turns
+
+    @staticmethod
+    def _turn_tokens(turns: List[List[ChatMessageContent]]) -> int:
+        return sum(estimate_tokens(m) for turn in turns for m in turn)
+
+
+def format_transcript(messages: List[ChatMessageContent]) -> str:
+    """Render messages as plain text for a summarization prompt."""
+    lines = []
+    for message in messages:
+        if message.content:
+            lines.append(f"{message.role.value}: {message.content}")
+    return "\n".join(lines)
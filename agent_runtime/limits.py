@@ -0,0 +1,152 @@
+"""Per-turn deadlines, output token limits and cooperative cancellation."""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, TypeVar
+
+from semantic_kernel.contents import StreamingChatMessageContent
+
+from agent_runtime.history import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Why a turn stopped early
+STOP_TIMEOUT = "timeout"
+STOP_MAX_OUTPUT_TOKENS = "max_output_tokens"
+STOP_CANCELLED = "cancelled"
+
+
+def truncation_marker(reason: str) -> str:
+    """Text appended to a reply that was cut short."""
+    return f"[truncated: {reason}]"
+
+
+class TurnStopped(Exception):
+    """Raised inside a turn that has to stop before it finished."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Turn stopped: {reason}")
+        self.reason = reason
+
+
+@dataclass
+class TurnLimits:
+    """Turn limits from an agent's ``limits`` block."""
+
+    timeout: Optional[float] = None
+    max_output_tokens: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError("Turn timeout must be positive")
+        if self.max_output_tokens is not None and self.max_output_tokens < 1:
+            raise ValueError("max_output_tokens must be at least 1")
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TurnLimits":
+        """Create turn limits from an HCL block dictionary."""
+        data = data or {}
+        timeout = data.get("timeout")
+        max_output_tokens = data.get("max_output_tokens")
+        return cls(
+            timeout=float(timeout) if timeout is not None else None,
+            max_output_tokens=(
+                int(max_output_tokens) if max_output_tokens is not None else None
+            ),
+        )
+
+
+class TurnControl:
+    """Deadline, output budget and cancel switch for one running turn.
+
+    Every await inside the turn that may take long (the next chunk of a
+    provider stream, a round of tool calls) goes through ``run``, which
+    races it against the stop signal. When the turn is stopped the pending
+    await is cancelled, which closes the provider's stream and cancels
+    running async tools, and ``TurnStopped`` is raised. Sync tools running
+    in worker threads cannot be interrupted; the turn stops waiting for them.
+    """
+
+    def __init__(self, limits: Optional[TurnLimits] = None) -> None:
+        self.limits = limits or TurnLimits()
+        self.output_tokens = 0
+        loop = asyncio.get_running_loop()
+        self._stop: asyncio.Future = loop.create_future()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        if self.limits.timeout is not None:
+            self._timer = loop.call_later(self.limits.timeout, self.stop, STOP_TIMEOUT)
+
+    @property
+    def stopped(self) -> Optional[str]:
+        """The reason the turn was stopped, or None while it may continue."""
+        return self._stop.result() if self._stop.done() else None
+
+    def stop(self, reason: str = STOP_CANCELLED) -> bool:
+        """Ask the turn to stop; False if it was already stopping."""
+        if self._stop.done():
+            return False
+        logger.debug("Stopping turn: %s", reason)
+        self._stop.set_result(reason)
+        return True
+
+    def close(self) -> None:
+        """Release the deadline timer once the turn is over."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def check(self) -> None:
+        """Raise ``TurnStopped`` if the turn has been stopped."""
+        if self._stop.done():
+            raise TurnStopped(self._stop.result())
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable`` unless the turn is stopped first."""
+        self.check()
+        task = asyncio.ensure_future(awaitable)
+        await asyncio.wait({task, self._stop}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+
+        task.cancel()
+        await asyncio.wait({task})
+        if not task.cancelled():
+            task.exception()  # Finished anyway; mark any error as retrieved
+        raise TurnStopped(self._stop.result())
+
+    async def stream(self, source: AsyncIterator[T]) -> AsyncIterator[T]:
+        """Yield from ``source`` until it ends or the turn is stopped.
+
+        Use with ``contextlib.aclosing`` so the source is closed as soon as
+        the consumer stops reading.
+        """
+        iterator = source.__aiter__()
+        try:
+            while True:
+                try:
+                    item = await self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                with contextlib.suppress(Exception):
+                    await aclose()
+
+    def count_output(self, chunk: StreamingChatMessageContent) -> None:
+        """Charge a streamed chunk against the output budget.
+
+        Raises ``TurnStopped`` once the turn has produced more than
+        ``max_output_tokens``, estimated from the streamed text.
+        """
+        if chunk.content:
+            self.output_tokens += max(1, len(chunk.content) // CHARS_PER_TOKEN)
+        limit = self.limits.max_output_tokens
+        if limit is not None and self.output_tokens >= limit:
+            self.stop(STOP_MAX_OUTPUT_TOKENS)
+            self.check()
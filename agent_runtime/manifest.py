@@ -0,0 +1,186 @@
+# agent_runtime/manifest.py
+"""Startup manifest: what 'init' learned about the agents, reused by 'run'.
+
+'init' resolves the configuration, imports every plugin, finds its class and
+builds the tool schemas of each agent's kernel. The result is written to
+``.cache/startup_manifest.json``, keyed by a hash of the configuration inputs
+and a fingerprint of every plugin's installed tree. While both still match,
+'run' takes the resolved configuration from the manifest instead of parsing
+and validating the HCL files, skips the lockfile comparison (which asks
+GitHub for commit SHAs), instantiates each plugin's class directly and seeds
+the tool schema cache. Any change to the configuration, variables or
+installed plugins makes the manifest stale, and 'run' falls back to the
+full startup path until 'init' is run again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from agent_runtime import __version__
+from agent_runtime.plugins.manager import PluginManager
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the manifest changes
+MANIFEST_VERSION = 2
+
+# Lives next to the response cache, under the project directory
+MANIFEST_PATH = Path(".cache") / "startup_manifest.json"
+
+ENV_VAR_PREFIX = "AGENT_VAR_"
+
+
+def manifest_path(config_dir: Path) -> Path:
+    """Where the startup manifest of a project is stored."""
+    return config_dir / MANIFEST_PATH
+
+
+def config_hash(
+    config_dir: Path,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+) -> str:
+    """Hash of everything the resolved configuration is derived from.
+
+    That is the HCL files, the variable files, the CLI variables and the
+    ``AGENT_VAR_*`` environment variables. Installed plugin code is covered
+    by the per-plugin fingerprints instead.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{MANIFEST_VERSION}:{__version__}".encode())
+    for path in sorted(config_dir.glob("*.hcl")):
+        digest.update(b"\0hcl:" + path.name.encode() + b"\0" + path.read_bytes())
+    for var_file in var_files or ():
+        digest.update(b"\0var_file\0" + Path(var_file).read_bytes())
+    for var in cli_vars or ():
+        digest.update(b"\0var\0" + var.encode())
+    for key in sorted(os.environ):
+        if key.startswith(ENV_VAR_PREFIX):
+            digest.update(f"\0env\0{key}={os.environ[key]}".encode())
+    return digest.hexdigest()
+
+
+def tree_fingerprint(directory: Path) -> str:
+    """Cheap fingerprint of a source tree from file names, sizes and mtimes.
+
+    Unlike the lockfile's content SHA this never reads file contents, so it
+    can be checked on every start.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            path = Path(root) / name
+            stat = path.stat()
+            relpath = path.relative_to(directory).as_posix()
+            digest.update(f"{relpath}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+def compile_manifest(
+    config_dir: Path,
+    config: Dict[str, Any],
+    agent_names: Iterable[str],
+    inputs_hash: str,
+) -> Dict[str, Any]:
+    """Load every plugin of the given agents and record what 'run' needs.
+
+    The plugins must already be installed. ``inputs_hash`` is the
+    ``config_hash`` taken when the configuration was loaded: installing and
+    loading plugins exports their variables as ``AGENT_VAR_*``, which would
+    change the hash.
+    """
+    from semantic_kernel import Kernel
+
+    from agent_runtime.core import collect_plugins_for_agents
+    from agent_runtime.plugins.manager import build_openai_functions
+    from agent_runtime.utils import run_sync
+
+    plugins: Dict[str, Dict[str, Any]] = {}
+    agents: Dict[str, Dict[str, Any]] = {}
+    for agent_name in agent_names:
+        plugin_list = collect_plugins_for_agents(config, agent_name)
+        kernel = Kernel()
+        pm = PluginManager(config_dir, kernel)
+        for cfg in plugin_list:
+            pm.plugin_configs[cfg.scoped_name] = cfg
+        run_sync(pm.load_plugins(plugin_list))
+
+        for cfg in plugin_list:
+            if cfg.scoped_name not in plugins:
+                plugin_dir = cfg.get_install_dir(pm.plugins_dir, config_dir)
+                plugins[cfg.scoped_name] = {
+                    "class": pm.plugin_classes[cfg.scoped_name],
+                    "path": str(plugin_dir),
+                    "fingerprint": tree_fingerprint(plugin_dir),
+                }
+
+        agents[agent_name] = {
+            "plugins": [cfg.scoped_name for cfg in plugin_list],
+            "tools": build_openai_functions(kernel),
+        }
+
+    return {
+        "version": MANIFEST_VERSION,
+        "config_hash": inputs_hash,
+        "config": config,
+        "plugins": plugins,
+        "agents": agents,
+    }
+
+
+def write_manifest(config_dir: Path, manifest: Dict[str, Any]) -> Path:
+    """Write the manifest atomically, readable by the owner only.
+
+    The resolved configuration can hold secrets passed in as variables.
+    """
+    path = manifest_path(config_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+    logger.debug("Wrote startup manifest to %s", path)
+    return path
+
+
+def load_manifest(
+    config_dir: Path,
+    var_files: Optional[Tuple[Path, ...]] = None,
+    cli_vars: Optional[Tuple[str, ...]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return the project's manifest if it is still fresh, otherwise None."""
+    path = manifest_path(config_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug("Ignoring unreadable startup manifest %s: %s", path, e)
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.debug("Startup manifest has an old layout; ignoring it")
+        return None
+    try:
+        current_hash = config_hash(config_dir, var_files, cli_vars)
+    except OSError as e:
+        logger.debug("Cannot hash configuration inputs: %s", e)
+        return None
+    if manifest.get("config_hash") != current_hash:
+        logger.debug("Configuration changed since the startup manifest was written")
+        return None
+    for name, entry in manifest.get("plugins", {}).items():
+        plugin_dir = Path(entry["path"])
+        if not plugin_dir.is_dir() or tree_fingerprint(plugin_dir) != entry.get(
+            "fingerprint"
+        ):
+            logger.debug("Plugin '%s' changed since the startup manifest", name)
+            return None
+    return manifest
@@ -0,0 +1,210 @@
+"""Per-turn latency and throughput metrics for agents."""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from semantic_kernel.contents import StreamingChatMessageContent
+
+from agent_runtime.history import CHARS_PER_TOKEN
+from agent_runtime.providers.base import REQUEST_TIMINGS_KEY
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StartupMetrics:
+    """Time spent getting an agent ready to serve its first turn."""
+
+    agent: str
+    config_load: float = 0.0
+    plugin_load: Dict[str, float] = field(default_factory=dict)
+    # Wall-clock time for all plugins; they load side by side, so this is
+    # close to the slowest one rather than the sum
+    plugin_load_total: float = 0.0
+    # Whether the agent was built from a fresh startup manifest
+    warm_start: bool = False
+    event: str = "startup"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def report(self) -> str:
+        """One-line summary of startup time, slowest plugin first."""
+        parts = [f"config {self.config_load:.2f}s"]
+        if self.plugin_load:
+            slowest = sorted(self.plugin_load.items(), key=lambda i: -i[1])
+            plugins = ", ".join(f"{name} {t:.2f}s" for name, t in slowest)
+            parts.append(f"plugins {self.plugin_load_total:.2f}s ({plugins})")
+        start = "warm" if self.warm_start else "cold"
+        return f"Started ({start}): " + "; ".join(parts)
+
+
+@dataclass
+class ToolTiming:
+    """Execution time of one tool call."""
+
+    name: str
+    duration: float
+    error: bool = False
+
+
+@dataclass
+class TurnMetrics:
+    """Where the time went during one user turn.
+
+    Durations are in seconds. A turn spans every model call made while
+    answering one user message, including the rounds that follow tool calls.
+    Token counts come from the provider's usage data when it reports any and
+    are estimated from the streamed text otherwise.
+    """
+
+    agent: str
+    turn: int
+    started_at: float
+    duration: float = 0.0
+    model_calls: int = 0
+    request_build: float = 0.0
+    time_to_first_chunk: Optional[float] = None
+    chunks: int = 0
+    max_chunk_gap: float = 0.0
+    mean_chunk_gap: float = 0.0
+    tools: List[ToolTiming] = field(default_factory=list)
+    tool_time: float = 0.0
+    prompt_tokens: Optional[int] = None
+    # Prompt tokens the provider served from its prompt cache, when it says
+    cached_tokens: Optional[int] = None
+    cached_token_ratio: Optional[float] = None
+    # Hash of the system prompt and tools; see agent_runtime.prompt
+    prefix_hash: Optional[str] = None
+    completion_tokens: int = 0
+    tokens_estimated: bool = True
+    tokens_per_second: float = 0.0
+    error: Optional[str] = None
+    stop_reason: Optional[str] = None
+    event: str = "turn"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+MetricsRecord = Union[StartupMetrics, TurnMetrics]
+MetricsListener = Callable[[MetricsRecord], None]
+
+
+def _usage_value(usage: Any, name: str) -> Optional[int]:
+    """Read a token count from a usage object or a replayed usage dict."""
+    if isinstance(usage, dict):
+        return usage.get(name)
+    return getattr(usage, name, None)
+
+
+class TurnRecorder:
+    """Collect timings for one turn as the agent streams and runs tools."""
+
+    def __init__(self, agent: str, turn: int) -> None:
+        self.metrics = TurnMetrics(agent=agent, turn=turn, started_at=time.time())
+        self._start = time.perf_counter()
+        self._last_chunk: Optional[float] = None
+        self._gaps: List[float] = []
+        self._chars = 0
+        self._generating = 0.0
+        self._request_start = 0.0
+
+    def start_request(self) -> None:
+        """Mark the start of a model call."""
+        self.metrics.model_calls += 1
+        self._request_start = time.perf_counter()
+        self._last_chunk = None
+
+    def chunk(self, chunk: StreamingChatMessageContent) -> None:
+        """Record the arrival of a streamed chunk."""
+        now = time.perf_counter()
+        metrics = self.metrics
+        if metrics.time_to_first_chunk is None:
+            metrics.time_to_first_chunk = now - self._start
+        if self._last_chunk is not None:
+            self._gaps.append(now - self._last_chunk)
+        self._last_chunk = now
+        metrics.chunks += 1
+        self._chars += len(chunk.content or "")
+
+        usage = (chunk.metadata or {}).get("usage")
+        if usage is not None:
+            prompt = _usage_value(usage, "prompt_tokens")
+            completion = _usage_value(usage, "completion_tokens")
+            if completion is not None:
+                if metrics.tokens_estimated:
+                    metrics.completion_tokens = 0
+                    metrics.tokens_estimated = False
+                metrics.completion_tokens += completion
+            if prompt is not None:
+                metrics.prompt_tokens = (metrics.prompt_tokens or 0) + prompt
+        cached = (chunk.metadata or {}).get("cached_tokens")
+        if cached is not None:
+            metrics.cached_tokens = (metrics.cached_tokens or 0) + cached
+        # The provider's timings for this request ride on its first chunk
+        timings = (chunk.metadata or {}).get(REQUEST_TIMINGS_KEY)
+        if timings:
+            metrics.request_build += timings.get("request_build", 0.0)
+
+    def end_request(self) -> None:
+        """Mark the end of a model call."""
+        self._generating += time.perf_counter() - self._request_start
+
+    def tool_results(self, results: List[Any]) -> None:
+        """Record the execution time of each dispatched tool call."""
+        for result in results:
+            self.metrics.tools.append(
+                ToolTiming(
+                    name=result.call.name or "",
+                    duration=result.duration,
+                    error=result.error,
+                )
+            )
+
+    def add_tool_time(self, seconds: float) -> None:
+        """Record wall-clock time spent dispatching one round of tool calls."""
+        self.metrics.tool_time += seconds
+
+    def finish(
+        self, error: Optional[str] = None, stop_reason: Optional[str] = None
+    ) -> TurnMetrics:
+        """Finalize and return the turn's metrics."""
+        metrics = self.metrics
+        metrics.duration = time.perf_counter() - self._start
+        metrics.error = error
+        metrics.stop_reason = stop_reason
+        if self._gaps:
+            metrics.max_chunk_gap = max(self._gaps)
+            metrics.mean_chunk_gap = sum(self._gaps) / len(self._gaps)
+        if metrics.tokens_estimated:
+            metrics.completion_tokens = self._chars // CHARS_PER_TOKEN
+        if metrics.cached_tokens is not None and metrics.prompt_tokens:
+            metrics.cached_token_ratio = metrics.cached_tokens / metrics.prompt_tokens
+        if self._generating > 0:
+            metrics.tokens_per_second = metrics.completion_tokens / self._generating
+        return metrics
+
+
+class TraceWriter:
+    """Metrics listener that appends every record to a JSONL trace file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, record: MetricsRecord) -> None:
+        line = json.dumps(record.to_dict())
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,111 @@
+"""Opt-in planning mode: break a request into steps, then run each step."""
+
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from semantic_kernel.contents import ChatHistory, StreamingChatMessageContent
+
+PLAN_PROMPT = (
+    "Before answering, write a short plan for the request below as a numbered "
+    "list with at most {max_steps} steps, one action per line. Do not carry "
+    "out the steps yet and reply with the list only."
+)
+
+# "1. step", "2) step" or "- step"
+_STEP_PATTERN = re.compile(r"^\s*(?:\d+[.)]|[-*])\s+(.+?)\s*$")
+
+
+@dataclass
+class PlannerConfig:
+    """Planner settings from an agent's ``planner`` block."""
+
+    max_steps: int = 5
+
+    def __post_init__(self) -> None:
+        if self.max_steps < 1:
+            raise ValueError("Planner max_steps must be at least 1")
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "PlannerConfig":
+        """Create a planner config from an HCL block dictionary."""
+        data = data or {}
+        return cls(max_steps=int(data.get("max_steps", 5)))
+
+
+def parse_steps(text: str, max_steps: int) -> List[str]:
+    """Extract the plan's steps from the model's reply.
+
+    A reply that is not a list is treated as a single step.
+    """
+    steps = []
+    for line in text.splitlines():
+        match = _STEP_PATTERN.match(line)
+        if match:
+            steps.append(match.group(1))
+    if not steps and text.strip():
+        steps = [text.strip()]
+    return steps[:max_steps]
+
+
+def plan_chunk(text: str, phase: str, step: int = 0) -> StreamingChatMessageContent:
+    """A display-only chunk marking progress through a plan."""
+    return StreamingChatMessageContent(
+        role="assistant",
+        content=text,
+        choice_index=0,
+        metadata={"planner": phase, "step": step},
+    )
+
+
+class Planner:
+    """Build plans for an agent's requests.
+
+    The planner only asks the model for the plan; the agent executes each
+    step through its normal tool loop, so tool calls, limits and metrics
+    work the same as for a regular turn.
+    """
+
+    def __init__(self, provider: Any, config: PlannerConfig) -> None:
+        self.provider = provider
+        self.config = config
+        # Steps of the most recent plan
+        self.steps: List[str] = []
+
+    def plan_history(
+        self, system_prompt: str, request: str, tool_names: List[str]
+    ) -> ChatHistory:
+        """The one-off history used to ask for a plan."""
+        history = ChatHistory()
+        instructions = PLAN_PROMPT.format(max_steps=self.config.max_steps)
+        if tool_names:
+            instructions += "\nAvailable tools: " + ", ".join(sorted(tool_names))
+        history.add_system_message(f"{system_prompt}\n\n{instructions}")
+        history.add_user_message(request)
+        return history
+
+    async def plan(
+        self, system_prompt: str, request: str, tool_names: List[str]
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        """Stream the model's plan for ``request``; read it back from ``steps``."""
+        self.steps = []
+        parts = []
+        history = self.plan_history(system_prompt, request, tool_names)
+        async for chunk in self.provider.chat(history):
+            if chunk.content:
+                parts.append(chunk.content)
+            yield chunk
+        self.steps = parse_steps("".join(parts), self.config.max_steps)
+
+    @staticmethod
+    def step_message(index: int, total: int, step: str) -> str:
+        """User message that asks the agent to carry out one step."""
+        return f"Carry out step {index} of {total} of your plan: {step}"
+
+    @staticmethod
+    def final_message() -> str:
+        """User message that asks for the answer once every step has run."""
+        return (
+            "All steps of the plan are done. Using their results, give the "
+            "final answer to the original request."
+        )
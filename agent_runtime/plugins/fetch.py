@@ -0,0 +1,268 @@
+# agent_runtime/plugins/fetch.py
+"""Download the source tree of a remote plugin at a single ref.
+
+Only the files of the requested tag or commit are fetched. There are two
+ways to do that. ``TarballFetcher`` downloads GitHub's archive of the ref
+and extracts it while it streams in. ``GitFetcher`` does a depth-1 fetch of
+just that ref into an empty repository. By default the tarball is tried
+first and git is the fallback, e.g. for private repositories that need git
+credentials. Both take a URL template, so tests can point them at a local
+bare repository.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tarfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class FetchError(Exception):
+    """Raised when a plugin's source cannot be downloaded."""
+
+    pass
+
+
+@dataclass
+class FetchResult:
+    """What a fetch downloaded, for install metrics."""
+
+    method: str
+    ref: str
+    bytes_downloaded: int
+    seconds: float
+
+
+def git_refs(version: str) -> List[str]:
+    """Refs to try for a plugin version: the 'v'-prefixed tag first."""
+    return [version] if version.startswith("v") else [f"v{version}", version]
+
+
+def tree_size(directory: Path) -> int:
+    """Total size of the files under ``directory``, in bytes."""
+    return sum(
+        (Path(root) / name).stat().st_size
+        for root, _, files in os.walk(directory)
+        for name in files
+    )
+
+
+def _clear_dir(directory: Path) -> None:
+    for child in directory.iterdir():
+        if child.is_dir() and not child.is_symlink():
+            shutil.rmtree(child)
+        else:
+            child.unlink()
+
+
+class PluginFetcher(ABC):
+    """Downloads a remote plugin's files at a ref into an empty directory.
+
+    ``fetch`` implementations add what they download to
+    ``bytes_downloaded``. The count is kept per thread, since one fetcher
+    serves all of a parallel install's workers.
+    """
+
+    name = "base"
+
+    _locals_lock = threading.Lock()
+
+    @property
+    def _local(self) -> threading.local:
+        with self._locals_lock:
+            if "_thread_local" not in self.__dict__:
+                self.__dict__["_thread_local"] = threading.local()
+        return self.__dict__["_thread_local"]
+
+    @property
+    def bytes_downloaded(self) -> int:
+        """Bytes downloaded by the current thread's fetch."""
+        return getattr(self._local, "bytes_downloaded", 0)
+
+    @bytes_downloaded.setter
+    def bytes_downloaded(self, value: int) -> None:
+        self._local.bytes_downloaded = value
+
+    @abstractmethod
+    def fetch(self, source: Dict[str, str], refs: Sequence[str], dest: Path) -> str:
+        """Fetch the first of ``refs`` that exists into ``dest``.
+
+        ``source`` is ``PluginConfig._parse_github_source()``. Returns the
+        ref that was fetched and raises FetchError if none could be.
+        """
+
+    def fetch_timed(
+        self, source: Dict[str, str], refs: Sequence[str], dest: Path
+    ) -> FetchResult:
+        """``fetch`` and measure it."""
+        self.bytes_downloaded = 0
+        start = time.perf_counter()
+        ref = self.fetch(source, refs, dest)
+        return FetchResult(
+            method=self.name,
+            ref=ref,
+            bytes_downloaded=self.bytes_downloaded,
+            seconds=time.perf_counter() - start,
+        )
+
+
+class GitFetcher(PluginFetcher):
+    """Shallow git fetch of a single ref; nothing but its tree is kept."""
+
+    name = "git"
+
+    def __init__(self, url_template: str = "{clone_url}") -> None:
+        self.url_template = url_template
+
+    def fetch(self, source: Dict[str, str], refs: Sequence[str], dest: Path) -> str:
+        url = self.url_template.format(**source)
+        self._git("init", "-q", cwd=dest)
+        errors = []
+        for ref in refs:
+            try:
+                self._git(
+                    "fetch", "-q", "--depth", "1", "--no-tags", url, ref, cwd=dest
+                )
+            except subprocess.CalledProcessError as e:
+                errors.append(f"{ref}: {(e.stderr or '').strip()}")
+                continue
+            self.bytes_downloaded = tree_size(dest / ".git" / "objects")
+            self._git("checkout", "-q", "--detach", "FETCH_HEAD", cwd=dest)
+            shutil.rmtree(dest / ".git")
+            return ref
+        raise FetchError(f"Cannot fetch {url}: " + "; ".join(errors))
+
+    @staticmethod
+    def _git(*args: str, cwd: Path) -> None:
+        subprocess.run(
+            ["git", "-c", "advice.detachedHead=false", *args],
+            cwd=cwd,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+
+class TarballFetcher(PluginFetcher):
+    """Download and unpack the archive of a ref, as GitHub serves it."""
+
+    name = "tarball"
+
+    def __init__(
+        self,
+        url_template: str = "https://codeload.github.com/{org}/{repo}/tar.gz/{ref}",
+        timeout: float = 60.0,
+    ) -> None:
+        self.url_template = url_template
+        self.timeout = timeout
+
+    def fetch(self, source: Dict[str, str], refs: Sequence[str], dest: Path) -> str:
+        import requests
+
+        errors = []
+        for ref in refs:
+            url = self.url_template.format(ref=ref, **source)
+            try:
+                with requests.get(url, stream=True, timeout=self.timeout) as response:
+                    if response.status_code != 200:
+                        errors.append(f"{ref}: HTTP {response.status_code}")
+                        continue
+                    response.raw.decode_content = True
+                    self._extract(_CountingReader(response.raw, self), dest)
+                return ref
+            except (requests.RequestException, tarfile.TarError, OSError) as e:
+                _clear_dir(dest)
+                raise FetchError(f"Cannot download {url}: {e}") from e
+        raise FetchError(
+            f"No archive for {source['org']}/{source['repo']}: " + "; ".join(errors)
+        )
+
+    @staticmethod
+    def _extract(stream: IO[bytes], dest: Path) -> None:
+        """Unpack a tarball stream, dropping its top-level directory.
+
+        Only regular files and directories are extracted, and never outside
+        ``dest``.
+        """
+        with tarfile.open(fileobj=stream, mode="r|gz") as tar:
+            for member in tar:
+                parts = PurePosixPath(member.name).parts[1:]
+                if not parts:
+                    continue
+                if ".." in parts or PurePosixPath(member.name).is_absolute():
+                    raise tarfile.TarError(f"Unsafe path in archive: {member.name}")
+                target = dest.joinpath(*parts)
+                if member.isdir():
+                    target.mkdir(parents=True, exist_ok=True)
+                elif member.isfile():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    source = tar.extractfile(member)
+                    if source is None:
+                        continue
+                    with source, open(target, "wb") as f:
+                        shutil.copyfileobj(source, f)
+                    if member.mode & 0o111:
+                        target.chmod(0o755)
+                else:
+                    logger.debug("Skipping %s in plugin archive", member.name)
+
+
+class _CountingReader:
+    """File-like wrapper that counts the bytes read through it."""
+
+    def __init__(self, raw: IO[bytes], fetcher: PluginFetcher) -> None:
+        self.raw = raw
+        self.fetcher = fetcher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.fetcher.bytes_downloaded += len(data)
+        return data
+
+
+class FallbackFetcher(PluginFetcher):
+    """Try several fetchers in turn until one succeeds."""
+
+    def __init__(self, fetchers: Sequence[PluginFetcher]) -> None:
+        self.fetchers = list(fetchers)
+        self.name = self.fetchers[0].name if self.fetchers else "none"
+
+    def fetch_timed(
+        self, source: Dict[str, str], refs: Sequence[str], dest: Path
+    ) -> FetchResult:
+        errors = []
+        start = time.perf_counter()
+        for fetcher in self.fetchers:
+            try:
+                result = fetcher.fetch_timed(source, refs, dest)
+            except FetchError as e:
+                logger.debug("%s fetch failed: %s", fetcher.name, e)
+                errors.append(str(e))
+                _clear_dir(dest)
+                continue
+            result.seconds = time.perf_counter() - start
+            return result
+        raise FetchError("; ".join(errors) or "No fetchers configured")
+
+    def fetch(self, source: Dict[str, str], refs: Sequence[str], dest: Path) -> str:
+        return self.fetch_timed(source, refs, dest).ref
+
+
+# Global instance for the get_default_fetcher() function
+_DEFAULT_FETCHER: Optional[PluginFetcher] = None
+
+
+def get_default_fetcher() -> PluginFetcher:
+    """Get or create the fetcher plugin managers use unless given one."""
+    global _DEFAULT_FETCHER
+    if _DEFAULT_FETCHER is None:
+        _DEFAULT_FETCHER = FallbackFetcher([TarballFetcher(), GitFetcher()])
+    return _DEFAULT_FETCHER
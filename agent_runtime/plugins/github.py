@@ -0,0 +1,208 @@
+# agent_runtime/plugins/github.py
+"""Cached lookups of plugin tags through the GitHub API.
+
+One 'init' asks for the commit SHA of every remote plugin's tag several
+times (install, lockfile comparison, lockfile write). ``GitHubClient``
+answers repeats within a process from memory, and keeps answers on disk
+for ``ttl`` seconds across processes. After that it revalidates them with
+``If-None-Match``, and GitHub does not count a 304 reply against the rate
+limit. If GitHub cannot be reached, the last known answer is used.
+
+The HTTP call is a plain function (``HttpGet``) so tests can replace GitHub
+with a local stub.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from agent_runtime.utils import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.github.com"
+
+# How long an answer is used without asking GitHub again, in seconds
+DEFAULT_TTL = 600.0
+
+
+@dataclass
+class HttpResponse:
+    """The parts of an HTTP response the client uses."""
+
+    status: int
+    # Lower-case header names
+    headers: Dict[str, str]
+    body: Any = None
+
+
+HttpGet = Callable[[str, Dict[str, str]], HttpResponse]
+
+
+def requests_get(url: str, headers: Dict[str, str]) -> HttpResponse:
+    """Default ``HttpGet`` using requests."""
+    import requests
+
+    response = requests.get(url, headers=headers, timeout=10)
+    body = response.json() if response.status_code == 200 else None
+    return HttpResponse(
+        status=response.status_code,
+        headers={k.lower(): v for k, v in response.headers.items()},
+        body=body,
+    )
+
+
+def _ref_sha(body: Any) -> Optional[str]:
+    """The object SHA of a single-ref response, or None for anything else."""
+    if isinstance(body, dict):
+        target = body.get("object")
+        if isinstance(target, dict) and isinstance(target.get("sha"), str):
+            return target["sha"]
+    return None
+
+
+class GitHubClient:
+    """Resolves plugin tags to commit SHAs with a memo and an ETag cache."""
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL,
+        http: Optional[HttpGet] = None,
+        api_url: str = API_URL,
+        token: Optional[str] = None,
+    ) -> None:
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.http = http or requests_get
+        self.api_url = api_url.rstrip("/")
+        self.token = token
+        # Requests sent, and how many of them GitHub answered with 304
+        self.requests = 0
+        self.not_modified = 0
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # URLs answered in this process, which are not asked again
+        self._checked: set = set()
+        self._changed: set = set()
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+
+    def commit_sha(self, org: str, repo: str, tags: Sequence[str]) -> Optional[str]:
+        """SHA of the first of ``tags`` that exists in ``org/repo``."""
+        for tag in tags:
+            url = f"{self.api_url}/repos/{org}/{repo}/git/refs/tags/{tag}"
+            entry = self._lookup(url)
+            if entry is not None and entry.get("sha"):
+                return str(entry["sha"])
+        return None
+
+    def _lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries = self._load()
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+
+        # Concurrent installs asking for the same tag send one request
+        with url_lock:
+            entry = entries.get(url)
+            if url in self._checked:
+                return entry
+            if entry is not None and time.time() - entry["checked"] < self.ttl:
+                self._checked.add(url)
+                return entry
+
+            headers = {"Accept": "application/vnd.github+json"}
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+            if entry is not None and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            try:
+                self.requests += 1
+                response = self.http(url, headers)
+            except Exception as e:
+                logger.warning("Failed to get commit SHA from %s: %s", url, e)
+                return entry
+
+            if response.status == 304 and entry is not None:
+                self.not_modified += 1
+                entry = dict(entry, checked=time.time())
+            elif response.status in (200, 404):
+                sha = _ref_sha(response.body) if response.status == 200 else None
+                if response.status == 200 and sha is None:
+                    # e.g. a list of refs the tag is only a prefix of
+                    logger.warning("No single tag at %s; trying the next ref", url)
+                entry = {
+                    "sha": sha,
+                    "etag": response.headers.get("etag"),
+                    "checked": time.time(),
+                }
+            else:
+                # Rate limited or a server error: not an answer worth keeping
+                logger.warning(
+                    "GitHub answered %s for %s%s",
+                    response.status,
+                    url,
+                    "; using the cached SHA" if entry is not None else "",
+                )
+                return entry
+
+            with self._lock:
+                entries[url] = entry
+                self._checked.add(url)
+                self._changed.add(url)
+                self._save()
+            return entry
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            return dict(data) if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            logger.debug("Ignoring unreadable GitHub cache %s", self.cache_path)
+            return {}
+
+    def _save(self) -> None:
+        """Write changed entries, keeping what other processes wrote."""
+        if self.cache_path is None or self._entries is None:
+            return
+        data = self._read()
+        data.update({url: self._entries[url] for url in self._changed})
+        tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug("Unable to write GitHub cache: %s", e)
+
+
+# Global instance for the get_github_client() function
+_GITHUB_CLIENT: Optional[GitHubClient] = None
+
+
+def get_github_client() -> GitHubClient:
+    """Get or create the global GitHub client.
+
+    Its cache is shared by all projects. ``GITHUB_TOKEN``, if set,
+    authenticates requests, which raises the rate limit.
+    """
+    global _GITHUB_CLIENT
+    if _GITHUB_CLIENT is None:
+        _GITHUB_CLIENT = GitHubClient(
+            cache_path=user_cache_dir() / "github_refs.json",
+            token=os.environ.get("GITHUB_TOKEN") or None,
+        )
+    return _GITHUB_CLIENT
@@ -1,20 +1,35 @@
 # agent_runtime/plugins/manager.py
 """Plugin manager for handling SK plugin installation, loading, and lockfile checks with SHA-256."""
 
+import asyncio
 import hashlib
 import importlib
+import inspect
 import json
 import logging
 import os
 import shutil
-import subprocess
 import sys
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
-import requests
 import click
-from agent_runtime.utils import Style
+from agent_runtime.plugins.fetch import (
+    FetchError,
+    PluginFetcher,
+    get_default_fetcher,
+    git_refs,
+    tree_size,
+)
+from agent_runtime.plugins.github import GitHubClient, get_github_client
+from agent_runtime.plugins.store import PluginStore, get_plugin_store
+from agent_runtime.utils import Style, run_sync
 
 
 class PluginNotFoundError(Exception):
@@ -23,6 +38,284 @@ class PluginNotFoundError(Exception):
     pass
 
 
+@dataclass
+class InstallStats:
+    """Time and I/O spent downloading one remote plugin."""
+
+    method: str
+    seconds: float
+    bytes_downloaded: int
+    bytes_written: int
+
+    def describe(self) -> str:
+        return (
+            f"{self.seconds:.1f}s, {self.bytes_downloaded / 1024:.0f} KB "
+            f"downloaded via {self.method}"
+        )
+
+
+class ToolSchemaCache:
+    """Per-kernel cache of the OpenAI function definitions for its plugins.
+
+    Building the definitions walks every function and parameter of every
+    plugin, so it is done once per kernel and only redone when plugins are
+    added to or removed from that kernel.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Tuple[Any, Tuple[Any, ...], Dict[str, Any]]] = {}
+        self.builds = 0
+        self.hits = 0
+        self.build_seconds = 0.0
+
+    def get(self, kernel: Any) -> Dict[str, Any]:
+        """Return the OpenAI function definitions for a kernel's plugins."""
+        key = id(kernel)
+        signature = self._signature(kernel)
+        entry = self._entries.get(key)
+        if entry is not None:
+            ref, cached_signature, functions = entry
+            if ref() is kernel and cached_signature == signature:
+                self.hits += 1
+                return functions
+
+        start = time.perf_counter()
+        functions = build_openai_functions(kernel)
+        self.build_seconds += time.perf_counter() - start
+        self.builds += 1
+
+        # Drop the entry once the kernel is garbage collected
+        ref = weakref.ref(kernel, lambda _, key=key: self._entries.pop(key, None))
+        self._entries[key] = (ref, signature, functions)
+        return functions
+
+    def seed(self, kernel: Any, functions: Dict[str, Any]) -> None:
+        """Use previously built definitions (e.g. from the startup manifest)
+        for a kernel's current plugins."""
+        key = id(kernel)
+        ref = weakref.ref(kernel, lambda _, key=key: self._entries.pop(key, None))
+        self._entries[key] = (ref, self._signature(kernel), functions)
+
+    def invalidate(self, kernel: Any = None) -> None:
+        """Forget cached definitions for one kernel, or for all kernels."""
+        if kernel is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(id(kernel), None)
+
+    @staticmethod
+    def _signature(kernel: Any) -> Tuple[Any, ...]:
+        """Cheap fingerprint of which plugins are registered on a kernel."""
+        return tuple(
+            (name, id(plugin), len(plugin.functions))
+            for name, plugin in kernel.plugins.items()
+        )
+
+
+# Global instance for the get_tool_schema_cache() function
+_TOOL_SCHEMA_CACHE: Optional[ToolSchemaCache] = None
+
+
+def get_tool_schema_cache() -> ToolSchemaCache:
+    """Get or create the global tool schema cache."""
+    global _TOOL_SCHEMA_CACHE
+    if _TOOL_SCHEMA_CACHE is None:
+        _TOOL_SCHEMA_CACHE = ToolSchemaCache()
+    return _TOOL_SCHEMA_CACHE
+
+
+class FileDigestCache:
+    """Content digests of local plugin sources, reused while files are unchanged.
+
+    Each file's SHA-256 is stored with its size, mtime and inode, so a file
+    is only read again after one of those changes. A directory's digest is a
+    Merkle tree over these: every directory hashes the sorted names and
+    digests of its files and subdirectories. With a ``path`` the entries are
+    kept on disk between commands.
+    """
+
+    VERSION = 1
+
+    # Files in the digest
+    SUFFIXES = (".py", ".txt", ".md", ".json", ".yaml", ".yml")
+
+    # A file written this recently could change again within the same mtime
+    # tick, so its digest is not cached
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._files: Optional[Dict[str, List[Any]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+        self.logger = logging.getLogger(__name__)
+
+    def digest(self, directory: Path) -> str:
+        """Digest of the tracked files under ``directory``."""
+        with self._lock:
+            return self._digest(directory)
+
+    def _digest(self, directory: Path) -> str:
+        files = self._load()
+        root = str(Path(directory).resolve())
+        seen: set = set()
+        digest = self._digest_dir(root, seen) or hashlib.sha256().hexdigest()
+
+        # Forget files that were removed from the tree
+        prefix = root + os.sep
+        stale = [p for p in files if p.startswith(prefix) and p not in seen]
+        for p in stale:
+            del files[p]
+        self._dirty = self._dirty or bool(stale)
+        self.save()
+        return digest
+
+    def save(self) -> None:
+        """Write the entries to disk if any changed."""
+        if self.path is None or not self._dirty or self._files is None:
+            return
+        data = {"version": self.VERSION, "files": self._files}
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.debug("Unable to write file digest cache: %s", e)
+
+    def _load(self) -> Dict[str, List[Any]]:
+        if self._files is None:
+            self._files = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    with self.path.open("r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") == self.VERSION:
+                        self._files = data["files"]
+                except (OSError, ValueError, KeyError, AttributeError):
+                    self.logger.debug("Ignoring unreadable file digest cache")
+        return self._files
+
+    def _digest_dir(self, directory: str, seen: set) -> Optional[str]:
+        """Merkle node of a directory; None if it holds no tracked files."""
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError as e:
+            self.logger.warning("Failed to read directory %s: %s", directory, e)
+            return None
+
+        node = hashlib.sha256()
+        empty = True
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == "__pycache__":
+                    continue
+                child = self._digest_dir(entry.path, seen)
+                kind = b"d"
+            elif entry.name.endswith(self.SUFFIXES):
+                child = self._file_digest(entry, seen)
+                kind = b"f"
+            else:
+                continue
+            if child is not None:
+                node.update(kind + b" " + entry.name.encode() + b"\0")
+                node.update(child.encode() + b"\n")
+                empty = False
+        return None if empty else node.hexdigest()
+
+    def _file_digest(self, entry: "os.DirEntry[str]", seen: set) -> Optional[str]:
+        try:
+            stat = entry.stat()
+            key = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            cached = self._files.get(entry.path) if self._files is not None else None
+            if cached is not None and cached[:3] == key:
+                self.hits += 1
+                seen.add(entry.path)
+                return cast(str, cached[3])
+
+            sha256_hash = hashlib.sha256()
+            with open(entry.path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    sha256_hash.update(chunk)
+        except OSError as e:
+            self.logger.warning("Failed to read file %s: %s", entry.path, e)
+            return None
+
+        self.reads += 1
+        digest = sha256_hash.hexdigest()
+        if self._files is not None and time.time_ns() - stat.st_mtime_ns > self.RACY_NS:
+            self._files[entry.path] = key + [digest]
+            self._dirty = True
+            seen.add(entry.path)
+        return digest
+
+
+# File digest caches by cache file, shared by all plugin managers of a project
+_FILE_DIGEST_CACHES: Dict[Path, FileDigestCache] = {}
+
+
+def get_file_digest_cache(base_dir: Path) -> FileDigestCache:
+    """Get or create the file digest cache of a project directory."""
+    path = (base_dir / ".cache" / "file_digests.json").resolve()
+    cache = _FILE_DIGEST_CACHES.get(path)
+    if cache is None:
+        cache = _FILE_DIGEST_CACHES[path] = FileDigestCache(path)
+    return cache
+
+
+def build_openai_functions(kernel: Any) -> Dict[str, Any]:
+    """Convert a kernel's registered plugins to OpenAI function definitions.
+
+    Functions are listed by plugin and function name rather than load order,
+    so the tool list, which is part of every request's prompt prefix, is the
+    same on every start (see agent_runtime.prompt).
+    """
+    functions = []
+    for plugin_name in sorted(kernel.plugins):
+        plugin = kernel.plugins[plugin_name]
+        for func_name in sorted(plugin.functions):
+            func = plugin.functions[func_name]
+            # Convert each function to OpenAI format
+            function_def = {
+                "name": f"{plugin.name}_{func.name}",
+                "description": func.description,
+                "parameters": {"type": "object", "properties": {}, "required": []},
+            }
+
+            # Add parameters, using the JSON schema semantic_kernel derives
+            # from the type hints and falling back to string
+            for param in func.parameters:
+                if param.name in (
+                    "kernel",
+                    "service",
+                    "execution_settings",
+                    "arguments",
+                ):
+                    continue  # Injected by the kernel, never supplied by the model
+                schema = dict(param.schema_data or {"type": "string"})
+                schema["description"] = param.description or ""
+                function_def["parameters"]["properties"][param.name] = schema
+                if param.is_required:
+                    function_def["parameters"]["required"].append(param.name)
+
+            functions.append(function_def)
+
+    return {"functions": functions, "function_call": "auto"}
+
+
+def _remove_tree(path: Path) -> None:
+    """Remove a directory, or just the link if it is a symlink (into the
+    plugin store)."""
+    if path.is_symlink():
+        path.unlink()
+    else:
+        shutil.rmtree(path)
+
+
 class PluginConfig:
     """Configuration for a plugin."""
 
@@ -33,6 +326,7 @@ class PluginConfig:
         source: str,
         version: Optional[str] = None,
         variables: Optional[Dict[str, str]] = None,
+        max_concurrency: Optional[int] = None,
     ):
         """Initialize plugin configuration.
 
@@ -42,11 +336,13 @@ class PluginConfig:
             source: GitHub repository URL/shorthand or local path
             version: Git tag/commit (required for remote plugins)
             variables: Optional plugin-specific env variables
+            max_concurrency: Optional cap on concurrent calls to this plugin's functions
         """
         self.plugin_type = plugin_type
         self._name = name  # Store original name
         self.source = source
         self.variables = variables or {}
+        self.max_concurrency = int(max_concurrency) if max_concurrency else None
 
         # Validate based on plugin type
         if plugin_type == "local":
@@ -77,6 +373,15 @@ class PluginConfig:
             parts = self._parse_github_source()
             return f"@{parts['org']}/{self._name}"
 
+    @property
+    def kernel_name(self) -> str:
+        """Name the plugin is registered under in the kernel.
+
+        The scoped name is sanitized to prevent collisions, e.g. ``@local/echo``
+        becomes ``local_echo``.
+        """
+        return self.scoped_name.replace("/", "_").replace("@", "").replace("-", "_")
+
     def get_install_dir(
         self, plugins_dir: Path, base_dir: Optional[Path] = None
     ) -> Path:
@@ -142,14 +447,18 @@ class PluginConfig:
             "clone_url": f"https://github.com/{org}/{repo}",
         }
 
-    def get_github_commit_sha(self) -> Optional[str]:
-        """Get the commit SHA for a GitHub tag using the GitHub API."""
+    def get_github_commit_sha(
+        self, client: Optional[GitHubClient] = None
+    ) -> Optional[str]:
+        """Get the commit SHA for a GitHub tag using the GitHub API.
+
+        Lookups go through a GitHubClient (by default the shared one), which
+        caches them; see agent_runtime.plugins.github.
+        """
         if not self.is_github_source:
             return None
 
         parts = self._parse_github_source()
-        org = parts["org"]
-        repo = parts["repo"]
 
         # Try with and without v prefix
         refs_to_try = []
@@ -160,20 +469,8 @@ class PluginConfig:
             refs_to_try.append(f"v{self.version}")
             refs_to_try.append(self.version)
 
-        for ref in refs_to_try:
-            url = f"https://api.github.com/repos/{org}/{repo}/git/refs/tags/{ref}"
-            try:
-                response = requests.get(url)
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["object"]["sha"]
-            except Exception as e:
-                logging.getLogger(__name__).warning(
-                    "Failed to get commit SHA for %s/%s@%s: %s", org, repo, ref, e
-                )
-                continue
-
-        return None
+        client = client or get_github_client()
+        return client.commit_sha(parts["org"], parts["repo"], refs_to_try)
 
     @property
     def git_ref(self) -> str:
@@ -197,10 +494,31 @@ class PluginManager:
 
     PLUGINS_DIR = ".plugins"
 
-    def __init__(self, base_dir: Path, kernel: Any = None) -> None:
+    # Plugins installed at once by install_plugins
+    INSTALL_WORKERS = 8
+
+    def __init__(
+        self,
+        base_dir: Path,
+        kernel: Any = None,
+        shared_plugins: Optional[Dict[str, Any]] = None,
+        fetcher: Optional[PluginFetcher] = None,
+        store: Optional[PluginStore] = None,
+    ) -> None:
         self.base_dir = base_dir
         self.plugins_dir = base_dir / ".plugins"
         self.kernel = kernel
+        # How remote plugins are downloaded, and where they are shared
+        self.fetcher = fetcher or get_default_fetcher()
+        self.store = get_plugin_store() if store is None else store
+        # Download metrics of the remote plugins installed, by scoped name
+        self.install_stats: Dict[str, InstallStats] = {}
+        # Loaded plugins that declare ``stateless = True``, keyed by scoped
+        # name and version. When several managers are given the same dict,
+        # their kernels share one instance of each such plugin.
+        self.shared_plugins = shared_plugins
+        # Class each loaded plugin was instantiated from, by scoped name
+        self.plugin_classes: Dict[str, str] = {}
         self.logger = logging.getLogger(__name__)
         self.plugin_configs: Dict[str, PluginConfig] = {}
 
@@ -239,86 +557,177 @@ class PluginManager:
                 self.logger.debug("Set %s=%s (plugin '%s')", key, v, cfg.name)
 
     def _clone_github_plugin(self, cfg: PluginConfig) -> None:
-        """Clone a plugin from GitHub."""
+        """Download a plugin from GitHub at its version.
+
+        Only the tree of that ref is fetched, by ``self.fetcher``. It lands
+        in a staging directory and only replaces the installed version once
+        the fetch succeeded, so a failed update leaves the previous
+        installation in place.
+        """
         parts = cfg._parse_github_source()
         version_dir = cfg.get_install_dir(self.plugins_dir)
 
         # Create parent directories if they don't exist
         version_dir.parent.mkdir(parents=True, exist_ok=True)
-
-        # Remove existing version directory if it exists
-        if version_dir.exists():
-            shutil.rmtree(version_dir)
+        staging_dir = Path(
+            tempfile.mkdtemp(prefix=f".{version_dir.name}-", dir=version_dir.parent)
+        )
 
         self.logger.debug(
-            "Cloning plugin '%s' from '%s' at version '%s'",
+            "Fetching plugin '%s' from '%s' at version '%s'",
             cfg.name,
             parts["clone_url"],
             cfg.version,
         )
 
         try:
-            # First clone the repository
-            subprocess.run(
-                ["git", "clone", parts["clone_url"], str(version_dir)],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-
-            # Fetch tags
-            subprocess.run(
-                ["git", "fetch", "--tags"],
-                cwd=version_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-
-            # Try checking out the tag/version
-            ref = cfg.git_ref
-            if not ref.startswith("v"):
-                possible_ref = f"v{ref}"
-            else:
-                possible_ref = ref
-
-            try:
-                subprocess.run(
-                    ["git", "checkout", possible_ref],
-                    cwd=version_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-            except subprocess.CalledProcessError:
-                # If that fails, try the plain ref
-                if possible_ref.startswith("v"):
-                    subprocess.run(
-                        ["git", "checkout", ref],
-                        cwd=version_dir,
-                        check=True,
-                        capture_output=True,
-                        text=True,
+            # Plugins fetched at a known commit go through the shared store
+            sha = cfg.get_github_commit_sha() if self.store is not None else None
+            if self.store is not None and sha:
+                start = time.perf_counter()
+                stats = InstallStats("store", 0.0, 0, 0)
+
+                def fill(dest: Path) -> None:
+                    nonlocal stats
+                    stats = self._fetch_tree(cfg, parts, dest)
+
+                self.store.add(sha, fill)
+                staging_dir.rmdir()
+                self.store.link(sha, staging_dir)
+                self._replace_dir(staging_dir, version_dir)
+                self.store.record_link(sha, version_dir)
+                if stats.method == "store":
+                    stats.seconds = time.perf_counter() - start
+                    self.logger.debug(
+                        "Plugin '%s' linked from the plugin store at %s", cfg.name, sha
                     )
-                else:
-                    raise
-
-            # Clean up .git directory
-            git_dir = version_dir / ".git"
-            if git_dir.exists():
-                shutil.rmtree(git_dir)
+            else:
+                stats = self._fetch_tree(cfg, parts, staging_dir)
+                self._replace_dir(staging_dir, version_dir)
+            self.install_stats[cfg.scoped_name] = stats
+        except FetchError as e:
+            raise RuntimeError(f"Failed to clone plugin: {e}") from e
+        finally:
+            # Clean up a failed fetch
+            if staging_dir.is_symlink() or staging_dir.exists():
+                _remove_tree(staging_dir)
+
+    def _fetch_tree(
+        self, cfg: PluginConfig, parts: Dict[str, str], dest: Path
+    ) -> InstallStats:
+        """Fetch a plugin's files at its version into ``dest``."""
+        result = self.fetcher.fetch_timed(parts, git_refs(cfg.git_ref), dest)
+        self.logger.debug(
+            "Plugin '%s' fetched at %s via %s in %.2fs (%d bytes downloaded)",
+            cfg.name,
+            result.ref,
+            result.method,
+            result.seconds,
+            result.bytes_downloaded,
+        )
+        return InstallStats(
+            method=result.method,
+            seconds=result.seconds,
+            bytes_downloaded=result.bytes_downloaded,
+            bytes_written=tree_size(dest),
+        )
 
-            self.logger.debug("Plugin '%s' cloned successfully.", cfg.name)
-        except subprocess.CalledProcessError as e:
-            # Clean up the failed clone
-            if version_dir.exists():
-                shutil.rmtree(version_dir)
-            raise RuntimeError(f"Failed to clone plugin: {e.stderr}") from e
+    @staticmethod
+    def _replace_dir(new_dir: Path, target: Path) -> None:
+        """Move ``new_dir`` to ``target``, restoring the old ``target`` on failure."""
+        backup = None
+        if os.path.lexists(target):
+            backup = target.with_name(f".{target.name}-{os.getpid()}-old")
+            if os.path.lexists(backup):
+                _remove_tree(backup)
+            target.rename(backup)
+        try:
+            new_dir.rename(target)
+        except OSError:
+            if backup is not None:
+                backup.rename(target)
+            raise
+        if backup is not None:
+            _remove_tree(backup)
 
     def install_plugin(
         self, cfg: PluginConfig, force_reinstall: bool = False, quiet: bool = False
     ) -> None:
         """Install a single plugin (download/copy) if needed."""
+        status = self._fetch_plugin(cfg, force_reinstall)
+        if not quiet and status != "installing":
+            color = "green" if status == "up to date" else "yellow"
+            click.echo(Style.plugin_status(cfg.name, status, color))
+        self._activate_plugin(cfg, status)
+
+    def install_plugins(
+        self,
+        configs: List[PluginConfig],
+        force_reinstall: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Exception]:
+        """Install several plugins on a pool of worker threads.
+
+        A progress line is printed as each plugin that had to be fetched
+        finishes. Once all workers are done, ``sys.path`` and the plugin
+        variables are set in config order for the plugins that installed.
+        Returns the errors of those that failed, by scoped name; each of
+        them keeps its previous installation.
+        """
+        # Plugins that share an install directory are installed one after another
+        groups: Dict[str, List[PluginConfig]] = {}
+        for cfg in configs:
+            install_dir = cfg.get_install_dir(self.plugins_dir, self.base_dir)
+            groups.setdefault(str(install_dir), []).append(cfg)
+
+        def install_group(group: List[PluginConfig]) -> Dict[str, Any]:
+            results: Dict[str, Any] = {}
+            for cfg in group:
+                start = time.perf_counter()
+                try:
+                    status = self._fetch_plugin(cfg, force_reinstall)
+                    results[cfg.scoped_name] = (status, time.perf_counter() - start)
+                except Exception as e:
+                    self.logger.debug(
+                        "Failed to install plugin '%s'", cfg.scoped_name, exc_info=True
+                    )
+                    results[cfg.scoped_name] = e
+            return results
+
+        statuses: Dict[str, str] = {}
+        failures: Dict[str, Exception] = {}
+        workers = max(1, min(max_workers or self.INSTALL_WORKERS, len(groups)))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="plugin-install"
+        ) as pool:
+            futures = [pool.submit(install_group, g) for g in groups.values()]
+            for future in as_completed(futures):
+                for name, result in future.result().items():
+                    if isinstance(result, Exception):
+                        failures[name] = result
+                        click.echo(
+                            Style.plugin_status(name, f"failed ({result})", "red")
+                        )
+                        continue
+                    status, seconds = result
+                    statuses[name] = status
+                    if status != "up to date":
+                        done = "installed" if status == "installing" else "updated"
+                        stats = self.install_stats.get(name)
+                        detail = stats.describe() if stats else f"{seconds:.1f}s"
+                        click.echo(Style.plugin_status(name, f"{done} ({detail})"))
+
+        for cfg in configs:
+            if cfg.scoped_name in statuses:
+                self._activate_plugin(cfg, statuses[cfg.scoped_name])
+        return failures
+
+    def _fetch_plugin(self, cfg: PluginConfig, force_reinstall: bool = False) -> str:
+        """Check a plugin against the lockfile and download it if needed.
+
+        Returns "up to date", "updating" or "installing". Leaves ``sys.path``
+        and the environment alone, so it is safe to run in a worker thread.
+        """
         self.logger.debug(
             "Processing plugin '%s' from '%s'. (force=%s)",
             cfg.name,
@@ -328,6 +737,7 @@ class PluginManager:
 
         if cfg.is_github_source:
             version_dir = cfg.get_install_dir(self.plugins_dir)
+            status = "installing"
 
             # Only check commit SHA if not forcing reinstall
             if not force_reinstall and version_dir.exists():
@@ -350,80 +760,203 @@ class PluginManager:
                                 locked_sha == current_sha
                                 and plugin.get("version") == cfg.version
                             ):
-                                if not quiet:
-                                    click.echo(
-                                        Style.plugin_status(cfg.name, "up to date")
-                                    )
-                                self._set_plugin_vars(cfg)
-                                return
-                            else:
-                                if not quiet:
-                                    click.echo(
-                                        Style.plugin_status(
-                                            cfg.name, "updating", "yellow"
-                                        )
-                                    )
-                                break
+                                return "up to date"
+                            status = "updating"
+                            break
 
             # If we get here, we need to clone/re-clone
             self._clone_github_plugin(cfg)
-            base_path = str(version_dir.parent)
-            if base_path not in sys.path:
-                sys.path.append(base_path)
-                self.logger.debug("Added plugin directory to sys.path: %s", base_path)
-        else:
-            # For local plugins, just verify the source exists and set variables
-            src_path = cfg.get_install_dir(self.plugins_dir, self.base_dir)
-            if not src_path.exists():
-                raise FileNotFoundError(f"Local plugin source not found: {src_path}")
-
-            # Check if we need to reinstall by comparing SHA
-            if not force_reinstall:
-                current_sha = self._compute_directory_sha(src_path)
-                self.logger.debug(
-                    "Current SHA for local plugin '%s': %s", cfg.name, current_sha
-                )
+            return status
 
-                lock_data = self.read_lockfile(self.base_dir / "plugins.lock.json")
-                for plugin in lock_data.get("plugins", []):
-                    if plugin["name"] == cfg.name:
-                        locked_sha = plugin.get("sha")
-                        self.logger.debug(
-                            "Locked SHA for local plugin '%s': %s", cfg.name, locked_sha
-                        )
+        # For local plugins, just verify the source exists
+        src_path = cfg.get_install_dir(self.plugins_dir, self.base_dir)
+        if not src_path.exists():
+            raise FileNotFoundError(f"Local plugin source not found: {src_path}")
+
+        # Check if we need to reinstall by comparing SHA
+        status = "installing"
+        if not force_reinstall:
+            current_sha = self._compute_directory_sha(src_path)
+            self.logger.debug(
+                "Current SHA for local plugin '%s': %s", cfg.name, current_sha
+            )
 
-                        if locked_sha == current_sha:
-                            if not quiet:
-                                click.echo(Style.plugin_status(cfg.name, "up to date"))
-                            self._set_plugin_vars(cfg)
-                            return
-                        else:
-                            if not quiet:
-                                click.echo(
-                                    Style.plugin_status(cfg.name, "updating", "yellow")
-                                )
-
-            # Add source directory's parent to sys.path if not already there
-            parent_dir = str(src_path.parent.resolve())
-            if parent_dir not in sys.path:
-                sys.path.insert(0, parent_dir)
-                self.logger.debug("Added parent directory to sys.path: %s", parent_dir)
+            lock_data = self.read_lockfile(self.base_dir / "plugins.lock.json")
+            for plugin in lock_data.get("plugins", []):
+                if plugin["name"] == cfg.name:
+                    locked_sha = plugin.get("sha")
+                    self.logger.debug(
+                        "Locked SHA for local plugin '%s': %s", cfg.name, locked_sha
+                    )
+
+                    if locked_sha == current_sha:
+                        return "up to date"
+                    status = "updating"
+        return status
+
+    def _activate_plugin(self, cfg: PluginConfig, status: str) -> None:
+        """Make an installed plugin importable and export its variables."""
+        if status != "up to date":
+            if cfg.is_github_source:
+                base_path = str(cfg.get_install_dir(self.plugins_dir).parent)
+                if base_path not in sys.path:
+                    sys.path.append(base_path)
+                    self.logger.debug(
+                        "Added plugin directory to sys.path: %s", base_path
+                    )
+            else:
+                # Add source directory's parent to sys.path if not already there
+                src_path = cfg.get_install_dir(self.plugins_dir, self.base_dir)
+                parent_dir = str(src_path.parent.resolve())
+                if parent_dir not in sys.path:
+                    sys.path.insert(0, parent_dir)
+                    self.logger.debug(
+                        "Added parent directory to sys.path: %s", parent_dir
+                    )
 
         self._set_plugin_vars(cfg)
         self.logger.debug("Plugin '%s' processed successfully.", cfg.name)
 
-    def load_plugin(self, name: str, git_ref: Optional[str] = None) -> Any:
-        """Load a plugin from .plugins or local source."""
+    def load_plugin(
+        self,
+        name: str,
+        git_ref: Optional[str] = None,
+        class_name: Optional[str] = None,
+    ) -> Any:
+        """Load a plugin from .plugins or local source.
+
+        ``class_name`` (from the startup manifest) names the plugin class, so
+        the module does not have to be searched for it. To load several
+        plugins at once, use ``load_plugins``.
+        """
         self.logger.debug("Loading plugin '%s' (ref=%s).", name, git_ref or "local")
 
         if name not in self.plugin_configs:
             raise PluginNotFoundError(f"No configuration found for plugin: {name}")
 
         plugin_config = self.plugin_configs[name]
+        share_key = self._share_key(plugin_config, git_ref)
+        if self.shared_plugins is not None and share_key in self.shared_plugins:
+            return self._register(plugin_config, None, share_key)
 
         # Set plugin variables before loading the module
         self._set_plugin_vars(plugin_config)
+        plugin_class = self._import_plugin_class(plugin_config, git_ref, class_name)
+
+        self.logger.debug("Instantiating plugin class: %s", plugin_class.__name__)
+        instance = plugin_class()
+        if self._setup_hook(instance) is not None:
+            # Synchronous callers have no loop of their own: see _setup_hook
+            run_sync(self._run_setup(instance))
+        return self._register(plugin_config, instance, share_key)
 
+    async def load_plugins(
+        self,
+        configs: List[PluginConfig],
+        class_names: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, float]:
+        """Load several plugins concurrently; returns each one's load time.
+
+        Plugin modules are imported one at a time on the event loop, then the
+        plugin classes are instantiated in worker threads and their ``setup``
+        hooks run side by side, so the whole set takes about as long as the
+        slowest plugin. Plugins are registered with the kernel in ``configs``
+        order once all of them are ready. ``class_names`` maps scoped names
+        to plugin classes, as recorded in the startup manifest.
+
+        Async ``setup`` hooks run on the calling loop, so await this on the
+        loop the agent will chat on.
+        """
+        class_names = class_names or {}
+        load_times: Dict[str, float] = {}
+
+        async def prepare(cfg: PluginConfig) -> Tuple[PluginConfig, Any, str]:
+            start = time.perf_counter()
+            git_ref = cfg.git_ref if cfg.is_github_source else None
+            self.logger.debug(
+                "Loading plugin '%s' (ref=%s).", cfg.scoped_name, git_ref or "local"
+            )
+            share_key = self._share_key(cfg, git_ref)
+            instance = None
+            if self.shared_plugins is None or share_key not in self.shared_plugins:
+                self._set_plugin_vars(cfg)
+                plugin_class = self._import_plugin_class(
+                    cfg, git_ref, class_names.get(cfg.scoped_name)
+                )
+                self.logger.debug(
+                    "Instantiating plugin class: %s", plugin_class.__name__
+                )
+                instance = await asyncio.to_thread(plugin_class)
+                await self._run_setup(instance)
+            load_times[cfg.scoped_name] = time.perf_counter() - start
+            return cfg, instance, share_key
+
+        if self._conflicting_vars(configs):
+            # Plugins read their variables from the environment while they
+            # are created, so they cannot be created side by side
+            self.logger.debug(
+                "Plugins set different values for the same variable; "
+                "loading them one at a time"
+            )
+            prepared = [await prepare(cfg) for cfg in configs]
+        else:
+            prepared = await asyncio.gather(*(prepare(cfg) for cfg in configs))
+
+        for cfg, instance, share_key in prepared:
+            self._register(cfg, instance, share_key)
+        return load_times
+
+    @staticmethod
+    def _share_key(plugin_config: PluginConfig, git_ref: Optional[str]) -> str:
+        """Key of a stateless plugin instance in ``shared_plugins``."""
+        share_version = git_ref or plugin_config.version or "local"
+        return f"{plugin_config.scoped_name}@{share_version}"
+
+    @staticmethod
+    def _conflicting_vars(configs: List[PluginConfig]) -> bool:
+        """Whether two plugins set the same variable to different values."""
+        values: Dict[str, Any] = {}
+        for cfg in configs:
+            for key, value in cfg.variables.items():
+                if values.setdefault(key.upper(), value) != value:
+                    return True
+        return False
+
+    @staticmethod
+    def _setup_hook(instance: Any) -> Optional[Callable[[], Any]]:
+        """A plugin's optional ``setup`` hook, run once it is instantiated.
+
+        A kernel function that happens to be called ``setup`` is a tool, not
+        a hook. ``load_plugins`` awaits async hooks on the agent's own loop,
+        so they may create loop-bound state such as aiohttp sessions. The
+        synchronous ``load_plugin`` runs them on a loop that is closed
+        afterwards.
+        """
+        setup = getattr(instance, "setup", None)
+        if not callable(setup) or getattr(setup, "__kernel_function__", False):
+            return None
+        return setup
+
+    @classmethod
+    async def _run_setup(cls, instance: Any) -> None:
+        """Run a plugin's setup hook; sync hooks run in a worker thread."""
+        setup = cls._setup_hook(instance)
+        if setup is None:
+            return
+        if inspect.iscoroutinefunction(setup):
+            await setup()
+            return
+        result = await asyncio.to_thread(setup)
+        if inspect.isawaitable(result):
+            await result
+
+    def _import_plugin_class(
+        self,
+        plugin_config: PluginConfig,
+        git_ref: Optional[str] = None,
+        class_name: Optional[str] = None,
+    ) -> type:
+        """Import a plugin's module and return its plugin class."""
         if plugin_config.is_github_source:
             parts = plugin_config._parse_github_source()
             version = git_ref if git_ref else plugin_config.version
@@ -478,6 +1011,40 @@ class PluginManager:
                 )
 
         # Find any class that has kernel functions
+        plugin_class = getattr(module, class_name, None) if class_name else None
+        if plugin_class is None:
+            plugin_class = self._find_plugin_class(module)
+        return plugin_class
+
+    def _register(
+        self, plugin_config: PluginConfig, instance: Any, share_key: str
+    ) -> Any:
+        """Add a plugin instance to the kernel, or the shared one if None."""
+        if instance is None:
+            self.logger.debug("Reusing shared stateless plugin '%s'", share_key)
+            plugin = self.kernel.add_plugin(self.shared_plugins[share_key])
+            get_tool_schema_cache().invalidate(self.kernel)
+            return plugin
+
+        self.plugin_classes[plugin_config.scoped_name] = type(instance).__name__
+
+        # Register with kernel using sanitized scoped name to prevent collisions
+        sanitized_name = plugin_config.kernel_name
+        self.logger.debug(
+            "Registering plugin with kernel as: %s (from %s)",
+            sanitized_name,
+            plugin_config.scoped_name,
+        )
+        plugin = self.kernel.add_plugin(instance, plugin_name=sanitized_name)
+        get_tool_schema_cache().invalidate(self.kernel)
+        if self.shared_plugins is not None and getattr(
+            type(instance), "stateless", False
+        ):
+            self.shared_plugins[share_key] = plugin
+        return plugin
+
+    def _find_plugin_class(self, module: Any) -> type:
+        """Find the class in a plugin module that defines kernel functions."""
         plugin_class = None
         self.logger.debug("Searching for plugin classes in module: %s", module.__name__)
         for attr_name in dir(module):
@@ -541,22 +1108,7 @@ class PluginManager:
             raise PluginNotFoundError(
                 f"No plugin class with kernel functions found in module: {module.__name__}"
             )
-
-        self.logger.debug("Instantiating plugin class: %s", plugin_class.__name__)
-        instance = plugin_class()
-
-        # Register with kernel using sanitized scoped name to prevent collisions
-        sanitized_name = (
-            plugin_config.scoped_name.replace("/", "_")
-            .replace("@", "")
-            .replace("-", "_")
-        )
-        self.logger.debug(
-            "Registering plugin with kernel as: %s (from %s)",
-            sanitized_name,
-            plugin_config.scoped_name,
-        )
-        return self.kernel.add_plugin(instance, plugin_name=sanitized_name)
+        return plugin_class
 
     def compare_with_lock(
         self, plugins: List[PluginConfig], lock_data: Optional[Dict[str, Any]] = None
@@ -658,9 +1210,18 @@ class PluginManager:
         return changes
 
     def install_and_load_plugins(
-        self, configs: List[PluginConfig], force_reinstall: bool = False
+        self,
+        configs: List[PluginConfig],
+        force_reinstall: bool = False,
+        load: bool = True,
+        max_workers: Optional[int] = None,
     ) -> None:
-        """Install and load multiple plugins."""
+        """Install multiple plugins and, if ``load`` is set, load them into the kernel.
+
+        Plugins are installed in parallel (see ``install_plugins``) and the
+        lockfile is written once all of them are done. If any failed, their
+        previous lock entries are kept and a RuntimeError names them.
+        """
         self.logger.debug(
             "Installing/loading %d plugins (force=%s)...", len(configs), force_reinstall
         )
@@ -675,14 +1236,17 @@ class PluginManager:
             if not any(changes.values()):  # No changes detected
                 self.logger.debug("All plugins are up to date.")
                 # Still need to load them
-                for cfg in configs:
-                    self.load_plugin(
-                        cfg.scoped_name, cfg.version if cfg.is_github_source else None
-                    )
+                if load:
+                    for cfg in configs:
+                        self.load_plugin(
+                            cfg.scoped_name,
+                            cfg.version if cfg.is_github_source else None,
+                        )
                 click.echo(Style.header("Initializing agent configuration..."))
                 click.echo("")
                 click.echo(Style.success("All plugins are up to date"))
-                click.echo(Style.success("All plugins loaded from local cache"))
+                if load:
+                    click.echo(Style.success("All plugins loaded from local cache"))
                 click.echo(
                     Style.success(
                         "Agent configuration has been successfully initialized"
@@ -834,26 +1398,31 @@ class PluginManager:
                     click.echo(Style.plugin_status(plugin["name"], "removing", "red"))
 
         # Install plugins
-        local_configs = [c for c in configs if c.is_local_source]
-        remote_configs = [c for c in configs if c.is_github_source]
-
-        if local_configs:
-            for cfg in local_configs:
-                self.install_plugin(cfg, force_reinstall, quiet=True)
-
-        if remote_configs:
-            for cfg in remote_configs:
-                self.install_plugin(cfg, force_reinstall, quiet=True)
+        lockfile = self.base_dir / "plugins.lock.json"
+        failures = self.install_plugins(configs, force_reinstall, max_workers)
+        if failures:
+            # Failed plugins are still at their locked version, if they had one
+            locked = {
+                p.get("scoped_name", p["name"]): p
+                for p in self.read_lockfile(lockfile).get("plugins", [])
+            }
+            keep = {name: locked.get(name) for name in failures}
+            self.write_lockfile(lockfile, self.create_lock_data(keep))
+            details = "; ".join(f"{name}: {e}" for name, e in failures.items())
+            raise RuntimeError(
+                f"Failed to install {len(failures)} plugin(s): {details}"
+            )
 
         # Load them all
-        for cfg in configs:
-            self.load_plugin(
-                cfg.scoped_name, cfg.version if cfg.is_github_source else None
-            )
+        if load:
+            for cfg in configs:
+                self.load_plugin(
+                    cfg.scoped_name, cfg.version if cfg.is_github_source else None
+                )
 
         # Update lockfile
         new_data = self.create_lock_data()
-        self.write_lockfile(self.base_dir / "plugins.lock.json", new_data)
+        self.write_lockfile(lockfile, new_data)
         self.logger.debug("Lockfile updated: %s", "plugins.lock.json")
 
         # Final success message
@@ -873,12 +1442,22 @@ class PluginManager:
         )
         click.echo("commands will detect it and remind you to do so if necessary.")
 
-    def create_lock_data(self) -> Dict[str, Any]:
-        """Create lock data for all installed plugins."""
+    def create_lock_data(
+        self, keep: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """Create lock data for all installed plugins.
+
+        ``keep`` maps scoped names to existing lock entries to write
+        unchanged instead (None drops the plugin from the lockfile).
+        """
         plugins_data = []
 
         # Only include plugins that are in the current configuration
         for scoped_name, cfg in self.plugin_configs.items():
+            if keep is not None and scoped_name in keep:
+                if keep[scoped_name] is not None:
+                    plugins_data.append(keep[scoped_name])
+                continue
             plugin_data = {
                 "name": cfg.name,
                 "scoped_name": scoped_name,
@@ -904,24 +1483,12 @@ class PluginManager:
         return {"plugins": plugins_data}
 
     def _compute_directory_sha(self, directory: Path) -> str:
-        """Compute SHA256 hash of a directory's contents."""
-        sha256_hash = hashlib.sha256()
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d != "__pycache__"]
-            for file in sorted(files):
-                if file.endswith((".py", ".txt", ".md", ".json", ".yaml", ".yml")):
-                    file_path = Path(root) / file
-                    try:
-                        with file_path.open("rb") as f:
-                            rel_path = file_path.relative_to(directory)
-                            sha256_hash.update(str(rel_path).encode())
-                            for chunk in iter(lambda: f.read(4096), b""):
-                                sha256_hash.update(chunk)
-                    except (IOError, OSError) as e:
-                        self.logger.warning("Failed to read file %s: %s", file_path, e)
-                        continue
+        """Compute SHA256 hash of a directory's contents.
 
-        return sha256_hash.hexdigest()
+        Files that have not changed since they were last hashed are not read
+        again; see FileDigestCache.
+        """
+        return get_file_digest_cache(self.base_dir).digest(directory)
 
     def read_lockfile(self, path: Path) -> Dict[str, Any]:
         """Read existing lockfile if present."""
@@ -940,31 +1507,17 @@ class PluginManager:
             json.dump(data, f, indent=2)
         self.logger.debug("Lockfile updated: %s", path)
 
+    def get_concurrency_limits(self) -> Dict[str, int]:
+        """Per-plugin tool call concurrency limits, keyed by kernel plugin name."""
+        return {
+            cfg.kernel_name: cfg.max_concurrency
+            for cfg in self.plugin_configs.values()
+            if cfg.max_concurrency
+        }
+
     def get_openai_functions(self) -> Dict[str, Any]:
         """Convert registered plugins to OpenAI function definitions."""
         if not self.kernel:
             return {"functions": [], "function_call": "auto"}
 
-        functions = []
-        for plugin in self.kernel.plugins.values():
-            for func in plugin.functions.values():
-                # Convert each function to OpenAI format
-                function_def = {
-                    "name": f"{plugin.name}_{func.name}",
-                    "description": func.description,
-                    "parameters": {"type": "object", "properties": {}, "required": []},
-                }
-
-                # Add parameters
-                for param in func.parameters:
-                    function_def["parameters"]["properties"][param.name] = {
-                        "type": "string",  # Default to string for simplicity
-                        "description": param.description or "",
-                    }
-                    # Check if parameter is required based on default value
-                    if param.default_value is None and param.type_ != "bool":
-                        function_def["parameters"]["required"].append(param.name)
-
-                functions.append(function_def)
-
-        return {"functions": functions, "function_call": "auto"}
+        return get_tool_schema_cache().get(self.kernel)
@@ -0,0 +1,251 @@
+# agent_runtime/plugins/store.py
+"""User-level store of remote plugin trees, shared by all projects.
+
+Every fetched plugin is kept once, under the commit SHA it was fetched at.
+The ``.plugins/<org>/<plugin>/<version>`` directory of each project that
+uses it is a symlink to that entry, or a tree of hardlinks where symlinks
+are not available. A project that asks for a SHA the store already has
+therefore neither downloads nor copies anything.
+
+Each link is recorded in ``links/``. An entry is in use while one of its
+recorded links still points at it. ``gc`` removes entries that are not in
+use, least recently used first.
+
+The store lives in ``$AGENT_PLUGIN_STORE``, or by default in
+``~/.cache/agent-runtime/plugins``. Set ``AGENT_PLUGIN_STORE=none`` to
+install plugins into each project directly.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from agent_runtime.plugins.fetch import tree_size
+from agent_runtime.utils import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+STORE_ENV = "AGENT_PLUGIN_STORE"
+
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{7,64}$")
+
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``500MB``, ``2G`` or ``1024`` into bytes."""
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$", text, re.I)
+    if not match:
+        raise ValueError(f"Invalid size '{text}': use e.g. 500MB or 2GB")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+@dataclass
+class StoreEntry:
+    """One plugin tree in the store."""
+
+    sha: str
+    path: Path
+    size: int
+    last_used: float
+    links: List[Path]
+
+
+@dataclass
+class GCResult:
+    """What a garbage collection removed and kept."""
+
+    removed: List[StoreEntry]
+    kept: List[StoreEntry]
+
+    @property
+    def freed(self) -> int:
+        return sum(e.size for e in self.removed)
+
+
+class PluginStore:
+    """Content-addressed plugin trees keyed by commit SHA."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.links_dir = self.root / "links"
+
+    def entry_path(self, sha: str) -> Path:
+        if not _SHA_PATTERN.match(sha):
+            raise ValueError(f"Invalid commit SHA '{sha}'")
+        return self.objects_dir / sha
+
+    def get(self, sha: str) -> Optional[Path]:
+        """The entry for ``sha``, if the store has it."""
+        path = self.entry_path(sha)
+        return path if path.is_dir() else None
+
+    def add(self, sha: str, fetch: Callable[[Path], None]) -> Path:
+        """Return the entry for ``sha``, calling ``fetch(dir)`` to fill it if
+        the store does not have it yet."""
+        path = self.get(sha)
+        if path is not None:
+            return path
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{sha}-", dir=self.objects_dir))
+        try:
+            fetch(staging)
+            try:
+                staging.rename(self.entry_path(sha))
+            except OSError:
+                # Another process stored the same SHA first
+                if self.get(sha) is None:
+                    raise
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging)
+        return self.entry_path(sha)
+
+    def link(self, sha: str, target: Path) -> None:
+        """Make ``target`` (which must not exist) a view of the entry.
+
+        Call ``record_link`` once it is at its final path.
+        """
+        entry = self.entry_path(sha)
+        try:
+            os.symlink(entry, target, target_is_directory=True)
+        except OSError:
+            shutil.copytree(entry, target, copy_function=_link_or_copy)
+
+    def touch(self, sha: str) -> None:
+        """Mark an entry as just used."""
+        try:
+            os.utime(self.entry_path(sha))
+        except OSError:
+            pass
+
+    def record_link(self, sha: str, target: Path) -> None:
+        """Remember that ``target`` uses the entry, so gc keeps it."""
+        target = Path(os.path.abspath(target))
+        key = hashlib.sha256(str(target).encode()).hexdigest()
+        self.links_dir.mkdir(parents=True, exist_ok=True)
+        record = self.links_dir / key
+        tmp_path = record.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"sha": sha, "path": str(target)}))
+        os.replace(tmp_path, record)
+        self.touch(sha)
+
+    def entries(self) -> List[StoreEntry]:
+        """Every entry with its size, last use and live links."""
+        links: Dict[str, List[Path]] = {}
+        if self.links_dir.is_dir():
+            for record in self.links_dir.iterdir():
+                try:
+                    data = json.loads(record.read_text())
+                except (OSError, ValueError):
+                    continue
+                target = Path(data["path"])
+                if self._is_live(data["sha"], target):
+                    links.setdefault(data["sha"], []).append(target)
+                else:
+                    record.unlink(missing_ok=True)
+
+        entries = []
+        if self.objects_dir.is_dir():
+            for path in self.objects_dir.iterdir():
+                if path.name.startswith(".") or not path.is_dir():
+                    continue
+                entries.append(
+                    StoreEntry(
+                        sha=path.name,
+                        path=path,
+                        size=tree_size(path),
+                        last_used=path.stat().st_mtime,
+                        links=links.get(path.name, []),
+                    )
+                )
+        return entries
+
+    def _is_live(self, sha: str, target: Path) -> bool:
+        entry = self.entry_path(sha)
+        if target.is_symlink():
+            return os.path.realpath(target) == os.path.realpath(entry)
+        # A hardlinked copy still shares its files with the entry
+        sample = _first_file(entry)
+        if sample is None:
+            return False
+        try:
+            linked = (target / sample.relative_to(entry)).stat()
+            original = sample.stat()
+        except OSError:
+            return False
+        return (linked.st_dev, linked.st_ino) == (original.st_dev, original.st_ino)
+
+    def gc(
+        self,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+        dry_run: bool = False,
+    ) -> GCResult:
+        """Remove entries no project links to.
+
+        Without limits every unused entry goes. With ``max_age`` (seconds)
+        only those unused for longer; with ``max_size`` (bytes) only as many
+        as it takes, least recently used first, to bring the store under
+        that size. Entries in use are never removed.
+        """
+        entries = sorted(self.entries(), key=lambda e: e.last_used)
+        total = sum(e.size for e in entries)
+        now = time.time()
+        removed: List[StoreEntry] = []
+        kept: List[StoreEntry] = []
+        for entry in entries:
+            evict = not entry.links
+            if evict and max_age is not None and now - entry.last_used < max_age:
+                evict = False
+            if evict and max_size is not None and total <= max_size:
+                evict = False
+            if evict:
+                if not dry_run:
+                    shutil.rmtree(entry.path)
+                total -= entry.size
+                removed.append(entry)
+            else:
+                kept.append(entry)
+
+        # Staging directories left behind by interrupted fetches
+        if not dry_run and self.objects_dir.is_dir():
+            for path in self.objects_dir.glob(".*"):
+                if now - path.stat().st_mtime > 24 * 3600:
+                    shutil.rmtree(path, ignore_errors=True)
+        return GCResult(removed=removed, kept=kept)
+
+
+def _first_file(directory: Path) -> Optional[Path]:
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        if files:
+            return Path(root) / min(files)
+    return None
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def get_plugin_store() -> Optional[PluginStore]:
+    """The user's plugin store, or None if it is turned off."""
+    location = os.environ.get(STORE_ENV)
+    if location is not None and location.lower() in ("", "none", "off", "0"):
+        return None
+    if location:
+        return PluginStore(Path(location).expanduser())
+    return PluginStore(user_cache_dir() / "plugins")
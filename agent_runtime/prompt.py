@@ -0,0 +1,50 @@
+"""Canonical form of the prompt prefix an agent sends with every request.
+
+Providers that cache prompts (OpenAI does so automatically for long
+prompts) only reuse work for a byte-identical prefix: the system message
+followed by the tool definitions. Everything that goes into that prefix is
+therefore built in a fixed order here and in ``build_openai_functions``,
+independent of plugin load order, dict iteration order or the process.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_json(data: Any) -> str:
+    """Serialize ``data`` the same way every time: sorted keys, no spaces."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def prefix_hash(system_prompt: str, tools: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of the request prefix: the system prompt and the tool definitions.
+
+    Two requests with the same hash start with the same tokens, so a
+    provider's prompt cache can serve that part of the second one.
+    """
+    functions = (tools or {}).get("functions", [])
+    data = {"system": system_prompt, "tools": functions}
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
+
+
+def plugin_instructions(kernel: Any) -> str:
+    """Instructions of every plugin that provides some, ordered by plugin name."""
+    sections = []
+    for name in sorted(kernel.plugins):
+        plugin = kernel.plugins[name]
+        try:
+            # Try to get instructions using the get_instructions function
+            if hasattr(plugin, "get_instructions"):
+                instructions = plugin.get_instructions()
+                if instructions:
+                    sections.append(
+                        f"\nInstructions for {plugin.name} plugin:\n"
+                        f"{instructions.strip()}"
+                    )
+        except Exception as e:
+            logger.warning(f"Failed to get instructions from plugin {plugin.name}: {e}")
+    return "\n".join(sections)
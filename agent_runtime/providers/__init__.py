@@ -1,4 +1,12 @@
-"""Provider module for Agent Runtime."""
+"""Provider module for Agent Runtime.
+
+Provider implementations are imported on first use, so that importing this
+package (or the base types) does not pull in semantic_kernel connectors or
+aiohttp.
+"""
+
+import importlib
+from typing import Any
 
 from agent_runtime.providers.base import (
     OllamaSettings,
@@ -6,12 +14,35 @@ from agent_runtime.providers.base import (
     Provider,
     ProviderConfig,
     ProviderType,
+    ReplaySettings,
 )
-from agent_runtime.providers.ollama import OllamaProvider
-from agent_runtime.providers.openai import OpenAIProvider
-from agent_runtime.providers.registry import get_provider, get_provider_config
+
+# Public name -> module that defines it
+_LAZY_ATTRIBUTES = {
+    "CacheConfig": "agent_runtime.providers.cache",
+    "CachingProvider": "agent_runtime.providers.cache",
+    "ResponseCache": "agent_runtime.providers.cache",
+    "OllamaProvider": "agent_runtime.providers.ollama",
+    "OpenAIProvider": "agent_runtime.providers.openai",
+    "ReplayProvider": "agent_runtime.providers.replay",
+    "get_provider": "agent_runtime.providers.registry",
+    "get_provider_config": "agent_runtime.providers.registry",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "CacheConfig",
+    "CachingProvider",
+    "ResponseCache",
     "Provider",
     "ProviderConfig",
     "ProviderType",
@@ -19,6 +50,8 @@ __all__ = [
     "OpenAISettings",
     "OllamaProvider",
     "OllamaSettings",
+    "ReplayProvider",
+    "ReplaySettings",
     "get_provider",
     "get_provider_config",
 ]
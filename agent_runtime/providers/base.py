@@ -3,16 +3,21 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, AsyncIterator, Dict, Optional, Union
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
 
 from semantic_kernel.contents import ChatHistory, StreamingChatMessageContent
 
+# Metadata key of the first chunk of a response: seconds spent on each
+# preparation step of that request, e.g. {"request_build": 0.002}
+REQUEST_TIMINGS_KEY = "request_timings"
+
 
 class ProviderType(str, Enum):
     """Provider types."""
 
     OPENAI = "openai"
     OLLAMA = "ollama"
+    REPLAY = "replay"
 
 
 @dataclass
@@ -20,6 +25,8 @@ class BaseProviderSettings:
     """Base provider settings."""
 
     temperature: float = 0.7
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
 
 
 @dataclass
@@ -35,9 +42,25 @@ class OllamaSettings(BaseProviderSettings):
     """Ollama provider settings."""
 
     base_url: str = "http://localhost:11434"
+    max_connections: int = 10
+    keepalive_timeout: float = 30.0
+    health_check_timeout: float = 2.0
+
+
+@dataclass
+class ReplaySettings(BaseProviderSettings):
+    """Replay provider settings."""
 
+    fixture: Optional[str] = None
+    token_delay: float = 0.0
+    mode: str = "replay"
+    record_provider: str = "openai"
+    loop: bool = True
 
-ProviderSettings = Union[BaseProviderSettings, OpenAISettings, OllamaSettings]
+
+ProviderSettings = Union[
+    BaseProviderSettings, OpenAISettings, OllamaSettings, ReplaySettings
+]
 
 
 @dataclass
@@ -83,12 +106,27 @@ class ProviderConfig:
             ProviderType.OLLAMA: lambda: OllamaSettings(
                 temperature=temperature,
                 base_url=settings.get("base_url", "http://localhost:11434"),
+                max_connections=int(settings.get("max_connections", 10)),
+                keepalive_timeout=float(settings.get("keepalive_timeout", 30.0)),
+                health_check_timeout=float(settings.get("health_check_timeout", 2.0)),
+            ),
+            ProviderType.REPLAY: lambda: ReplaySettings(
+                temperature=temperature,
+                fixture=settings.get("fixture"),
+                token_delay=float(settings.get("token_delay", 0.0)),
+                mode=settings.get("mode", "replay"),
+                record_provider=settings.get("record_provider", "openai"),
+                loop=bool(settings.get("loop", True)),
             ),
         }
 
-        return provider_settings.get(
+        result = provider_settings.get(
             self.name, lambda: BaseProviderSettings(temperature=temperature)
         )()
+        # Rate limits apply to every provider type
+        result.requests_per_minute = settings.get("requests_per_minute")
+        result.tokens_per_minute = settings.get("tokens_per_minute")
+        return result
 
 
 class Provider(ABC):
@@ -104,3 +142,39 @@ class Provider(ABC):
     def chat(self, history: ChatHistory) -> AsyncIterator[StreamingChatMessageContent]:
         """Process a chat message and return the response."""
         raise NotImplementedError  # pragma: no cover
+
+    @property
+    def rate_limit_key(self) -> str:
+        """Key that requests to the same model share limits under."""
+        model = getattr(self, "model", None) or self.config.model
+        return f"{self.config.name.value}:{model}"
+
+    def scheduled(
+        self,
+        request: Callable[[], AsyncIterator[Any]],
+        history: Optional[ChatHistory] = None,
+    ) -> AsyncIterator[Any]:
+        """Run a streaming request through the shared request scheduler.
+
+        The scheduler applies the process-wide concurrency cap, this model's
+        rate limits and retries on rate-limit or transient errors.
+        """
+        from agent_runtime.history import estimate_tokens
+        from agent_runtime.providers.scheduler import RateLimits, get_scheduler
+
+        scheduler = get_scheduler()
+        key = self.rate_limit_key
+        if self.settings.requests_per_minute or self.settings.tokens_per_minute:
+            scheduler.ensure_limits(
+                key,
+                RateLimits(
+                    requests_per_minute=self.settings.requests_per_minute,
+                    tokens_per_minute=self.settings.tokens_per_minute,
+                ),
+            )
+        tokens = sum(estimate_tokens(m) for m in history.messages) if history else 0
+        return scheduler.stream(key, request, tokens)
+
+    async def aclose(self) -> None:
+        """Release any connections held by the provider."""
+        return None
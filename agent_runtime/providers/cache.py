@@ -0,0 +1,321 @@
+# agent_runtime/providers/cache.py
+"""Opt-in response cache that sits in front of any provider."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from semantic_kernel.contents import ChatHistory, StreamingChatMessageContent
+from semantic_kernel.kernel import Kernel
+
+from agent_runtime.plugins.manager import get_tool_schema_cache
+from agent_runtime.providers.base import REQUEST_TIMINGS_KEY
+from agent_runtime.providers.replay import chunk_from_dict, chunk_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Cached responses live under the project directory, next to .plugins
+CACHE_DIR_NAME = ".cache"
+
+
+@dataclass
+class CacheConfig:
+    """Response cache settings, from a model's ``cache`` block."""
+
+    ttl: float = 86400.0
+    max_entries: int = 256
+    max_size_mb: float = 100.0
+
+    def __post_init__(self) -> None:
+        if self.ttl <= 0:
+            raise ValueError("Cache ttl must be positive")
+        if self.max_entries < 1:
+            raise ValueError("Cache max_entries must be at least 1")
+        if self.max_size_mb < 0:
+            raise ValueError("Cache max_size_mb cannot be negative")
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "CacheConfig":
+        """Build a config from an HCL ``cache`` block."""
+        data = data or {}
+        return cls(
+            ttl=float(data.get("ttl", 86400.0)),
+            max_entries=int(data.get("max_entries", 256)),
+            max_size_mb=float(data.get("max_size_mb", 100.0)),
+        )
+
+
+def cache_key(
+    provider: str,
+    model: Optional[str],
+    settings: Any,
+    history: ChatHistory,
+    tools: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable hash of everything that determines a provider's response."""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "settings": asdict(settings) if is_dataclass(settings) else settings,
+        "messages": [message.to_dict() for message in history.messages],
+        "tools": tools or {},
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier store of recorded chunk streams.
+
+    The memory tier is an LRU of ``max_entries`` responses. The disk tier, if
+    a directory is given, holds one JSON file per response and is trimmed to
+    ``max_size_mb`` by dropping the least recently used files. Entries older
+    than ``ttl`` seconds are ignored and removed from both tiers.
+
+    ``aget`` and ``aput`` do the disk tier's IO in a worker thread, so a
+    provider serving many streams does not stall the event loop on it.
+    """
+
+    def __init__(self, config: CacheConfig, directory: Optional[Path] = None):
+        self.config = config
+        self.directory = Path(directory) if directory else None
+        self._memory: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = (
+            OrderedDict()
+        )
+        self._disk_bytes: Optional[int] = None
+        # One lock per tier, taken disk first, so memory hits never wait on IO
+        self._memory_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached chunks for ``key``, or None."""
+        now = time.time()
+        chunks = self._recall(key, now)
+        if chunks is None:
+            chunks = self._read_disk(key, now)
+        return self._count(chunks)
+
+    async def aget(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """``get``, reading the disk tier in a worker thread."""
+        now = time.time()
+        chunks = self._recall(key, now)
+        if chunks is None and self.directory is not None:
+            chunks = await asyncio.to_thread(self._read_disk, key, now)
+        return self._count(chunks)
+
+    def put(self, key: str, chunks: List[Dict[str, Any]]) -> None:
+        """Store a completed response in both tiers."""
+        created = time.time()
+        self._remember(key, created, chunks)
+        if self.directory is not None:
+            self._write_disk(key, created, chunks)
+
+    async def aput(self, key: str, chunks: List[Dict[str, Any]]) -> None:
+        """``put``, writing the disk tier in a worker thread."""
+        created = time.time()
+        self._remember(key, created, chunks)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write_disk, key, created, chunks)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._disk_lock:
+            with self._memory_lock:
+                self._memory.clear()
+            if self.directory is not None:
+                for path in self.directory.glob("*/*.json"):
+                    path.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def _count(
+        self, chunks: Optional[List[Dict[str, Any]]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        if chunks is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return chunks
+
+    def _recall(self, key: str, now: float) -> Optional[List[Dict[str, Any]]]:
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created, chunks = entry
+            if now - created < self.config.ttl:
+                self._memory.move_to_end(key)
+                return chunks
+            del self._memory[key]
+            return None
+
+    def _remember(self, key: str, created: float, chunks: List[Dict[str, Any]]) -> None:
+        with self._memory_lock:
+            self._memory[key] = (created, chunks)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.config.max_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str, now: float) -> Optional[List[Dict[str, Any]]]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+
+        created = data.get("created", 0)
+        if now - created >= self.config.ttl:
+            with self._disk_lock:
+                self._delete(path)
+            return None
+
+        # Touch the file so size eviction drops the least recently used first
+        os.utime(path)
+        chunks = data.get("chunks", [])
+        self._remember(key, created, chunks)
+        return chunks
+
+    def _write_disk(
+        self, key: str, created: float, chunks: List[Dict[str, Any]]
+    ) -> None:
+        path = self._path(key)
+        data = json.dumps({"created": created, "chunks": chunks}).encode("utf-8")
+        with self._disk_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            usage = self._disk_usage()
+            previous = path.stat().st_size if path.exists() else 0
+
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+            self._disk_bytes = usage - previous + len(data)
+            self._evict_disk()
+
+    def _disk_usage(self) -> int:
+        if self._disk_bytes is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(
+                p.stat().st_size for p in self.directory.glob("*/*.json")
+            )
+        return self._disk_bytes
+
+    def _evict_disk(self) -> None:
+        limit = int(self.config.max_size_mb * 1024 * 1024)
+        if self._disk_usage() <= limit:
+            return
+
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            self._delete(path)
+            total -= size
+        self._disk_bytes = total
+
+    def _delete(self, path: Path) -> None:
+        """Remove an entry; the caller holds the disk lock."""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._memory_lock:
+            self._memory.pop(path.stem, None)
+        if self._disk_bytes is not None:
+            self._disk_bytes = max(0, self._disk_bytes - size)
+
+
+class CachingProvider:
+    """Wrap a provider so identical requests replay a cached chunk stream.
+
+    The wrapper keeps the provider interface, so the agent and callers do not
+    change. Only streams that complete without error are cached.
+    """
+
+    def __init__(self, provider: Any, cache: ResponseCache) -> None:
+        self.provider = provider
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (model, settings, client, ...) comes from the provider
+        return getattr(self.provider, name)
+
+    def _key(self, history: ChatHistory, kernel: Optional[Kernel]) -> str:
+        tools = None
+        if getattr(kernel, "plugins", None):
+            tools = get_tool_schema_cache().get(kernel)
+        config = getattr(self.provider, "config", None)
+        provider_name = getattr(getattr(config, "name", None), "value", None)
+        return cache_key(
+            provider_name or type(self.provider).__name__,
+            getattr(self.provider, "model", None),
+            getattr(self.provider, "settings", None),
+            history,
+            tools,
+        )
+
+    async def chat(
+        self,
+        history: ChatHistory,
+        kernel: Optional[Kernel] = None,
+        functions: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        """Replay a cached response, or stream and cache a fresh one."""
+        start = time.perf_counter()
+        key = self._key(history, kernel)
+        cached = await self.cache.aget(key)
+        lookup = time.perf_counter() - start
+
+        if cached is not None:
+            logger.debug("Response cache hit %s", key[:12])
+            for index, data in enumerate(cached):
+                chunk = chunk_from_dict(data)
+                if index == 0:
+                    chunk.metadata[REQUEST_TIMINGS_KEY] = {
+                        "cache_lookup": lookup,
+                        "request_build": lookup,
+                    }
+                yield chunk
+            return
+
+        chunks = []
+        async for chunk in self.provider.chat(history, kernel):
+            chunks.append(chunk_to_dict(chunk))
+            if len(chunks) == 1:
+                # The lookup is part of preparing the provider's request
+                timings = dict(chunk.metadata.get(REQUEST_TIMINGS_KEY) or {})
+                timings["cache_lookup"] = lookup
+                timings["request_build"] = timings.get("request_build", 0.0) + lookup
+                chunk.metadata[REQUEST_TIMINGS_KEY] = timings
+            yield chunk
+        await self.cache.aput(key, chunks)
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider."""
+        if hasattr(self.provider, "aclose"):
+            await self.provider.aclose()
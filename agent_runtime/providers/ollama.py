@@ -1,12 +1,13 @@
 # agent_runtime/providers/ollama.py
 """Ollama provider implementation."""
 
+import asyncio
 import json
+import logging
+import time
 from typing import AsyncIterator, Optional, Dict, Any
 
 import aiohttp
-import requests
-from requests.exceptions import RequestException
 from semantic_kernel.contents import (
     AuthorRole,
     ChatHistory,
@@ -15,7 +16,17 @@ from semantic_kernel.contents import (
 from semantic_kernel.kernel import Kernel
 
 from agent_runtime.env import get_env_var
-from agent_runtime.providers.base import OllamaSettings, Provider, ProviderConfig
+from agent_runtime.providers.base import (
+    REQUEST_TIMINGS_KEY,
+    OllamaSettings,
+    Provider,
+    ProviderConfig,
+)
+
+logger = logging.getLogger(__name__)
+
+# How long a successful health check is trusted before the server is probed again
+HEALTH_CHECK_TTL = 30.0
 
 
 class OllamaProvider(Provider):
@@ -48,24 +59,100 @@ class OllamaProvider(Provider):
         if not isinstance(self.settings, OllamaSettings):
             raise ValueError("Invalid settings type for Ollama provider")
 
-        # Check if Ollama server is running
-        self._check_server()
+        # The HTTP session is created lazily on the running event loop and
+        # reused for every request so connections are kept alive.
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server_version: Optional[str] = None
+        self._checked_at = 0.0
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on the running loop if needed."""
+        if not isinstance(self.settings, OllamaSettings):
+            raise ValueError("Invalid settings type for Ollama provider")
 
-    def _check_server(self) -> None:
-        """Check if Ollama server is running."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            await self._close_stale_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.max_connections,
+                keepalive_timeout=self.settings.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Content-Type": "application/json"},
+            )
+            self._session_loop = loop
+            logger.debug(
+                "Created Ollama session (limit=%d, keepalive=%.1fs)",
+                self.settings.max_connections,
+                self.settings.keepalive_timeout,
+            )
+        return self._session
+
+    async def _close_stale_session(self) -> None:
+        """Close a session left behind by another event loop."""
+        session, loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            # The loop that owns its connections still runs in another thread
+            future = asyncio.run_coroutine_threadsafe(session.close(), loop)
+            await asyncio.wrap_future(future)
+        else:
+            await session.close()
+        logger.debug("Closed Ollama session from a previous event loop")
+
+    async def check_health(self, force: bool = False) -> str:
+        """Check that the Ollama server is running and return its version.
+
+        A successful result is cached for ``HEALTH_CHECK_TTL`` seconds.
+        """
         if not isinstance(self.settings, OllamaSettings):
             raise ValueError("Invalid settings type for Ollama provider")
+
+        now = time.monotonic()
+        if (
+            not force
+            and self._server_version
+            and now - self._checked_at < HEALTH_CHECK_TTL
+        ):
+            return self._server_version
+
+        url = f"{self.settings.base_url}/api/version"
+        timeout = aiohttp.ClientTimeout(total=self.settings.health_check_timeout)
         try:
-            response = requests.get(f"{self.settings.base_url}/api/version")
-            response.raise_for_status()
-            version = response.json().get("version")
-            if not version:
-                raise RuntimeError("Ollama server returned invalid version response")
-        except RequestException as e:
+            session = await self._get_session()
+            async with session.get(url, timeout=timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._server_version = None
             raise RuntimeError(
                 f"Ollama server not running at {self.settings.base_url}: {str(e)}"
             ) from e
 
+        version = data.get("version")
+        if not version:
+            raise RuntimeError("Ollama server returned invalid version response")
+
+        self._server_version = version
+        self._checked_at = now
+        return version
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     async def chat(
         self,
         history: ChatHistory,
@@ -79,6 +166,10 @@ class OllamaProvider(Provider):
         if not isinstance(self.settings, OllamaSettings):
             raise ValueError("Invalid settings type for Ollama provider")
 
+        start = time.perf_counter()
+        await self.check_health()
+        health_checked = time.perf_counter()
+
         # Convert ChatHistory to Ollama's message list
         messages = []
         for msg in history.messages:
@@ -100,30 +191,41 @@ class OllamaProvider(Provider):
             },
         }
 
-        # Send the request to Ollama
+        timings = {
+            "health_check": health_checked - start,
+            "request_build": time.perf_counter() - health_checked,
+        }
+
+        # Send the request to Ollama through the shared scheduler
+        async for chunk in self.scheduled(lambda: self._stream(payload), history):
+            if timings is not None:
+                chunk.metadata[REQUEST_TIMINGS_KEY] = timings
+                timings = None
+            yield chunk
+
+    async def _stream(
+        self, payload: Dict[str, Any]
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        """Post a chat request over the pooled session and stream the reply."""
         url = f"{self.settings.base_url}/api/chat"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            ) as response:
-                response.raise_for_status()
-                async for line in response.content:
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                        if "error" in data:
-                            raise RuntimeError(f"Ollama error: {data['error']}")
-                        if "message" in data:
-                            # Return the chunk as a normal assistant message
-                            content = data["message"]["content"]
-                            yield StreamingChatMessageContent(
-                                role=AuthorRole.ASSISTANT,
-                                content=content,
-                                choice_index=0,
-                            )
-                    except json.JSONDecodeError:
-                        # Could be partial JSON or empty line, skip
-                        continue
+        session = await self._get_session()
+        async with session.post(url, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                    if "error" in data:
+                        raise RuntimeError(f"Ollama error: {data['error']}")
+                    if "message" in data:
+                        # Return the chunk as a normal assistant message
+                        content = data["message"]["content"]
+                        yield StreamingChatMessageContent(
+                            role=AuthorRole.ASSISTANT,
+                            content=content,
+                            choice_index=0,
+                        )
+                except json.JSONDecodeError:
+                    # Could be partial JSON or empty line, skip
+                    continue
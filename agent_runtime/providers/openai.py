@@ -1,5 +1,6 @@
 # agent_runtime/providers/openai.py
 import logging
+import time
 from pathlib import Path
 from typing import AsyncIterator, Optional, Dict, Any
 
@@ -7,24 +8,33 @@ from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
 from semantic_kernel.connectors.ai.open_ai.prompt_execution_settings.open_ai_prompt_execution_settings import (
     OpenAIChatPromptExecutionSettings,
 )
-from semantic_kernel.connectors.ai.function_choice_behavior import (
-    FunctionChoiceBehavior,
-)
 from semantic_kernel.contents import ChatHistory, StreamingChatMessageContent
 from semantic_kernel.kernel import Kernel
-from semantic_kernel.planners import (
-    FunctionCallingStepwisePlanner,
-    FunctionCallingStepwisePlannerOptions,
-)
 
-from agent_runtime.providers.base import OpenAISettings, Provider, ProviderConfig
-from agent_runtime.plugins.manager import PluginManager
+from agent_runtime.providers.base import (
+    REQUEST_TIMINGS_KEY,
+    OpenAISettings,
+    Provider,
+    ProviderConfig,
+)
+from agent_runtime.plugins.manager import get_tool_schema_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _cached_tokens(chunk: StreamingChatMessageContent) -> Optional[int]:
+    """Prompt tokens OpenAI served from its prompt cache, from the usage chunk.
+
+    semantic_kernel's usage metadata drops this detail, so it is read from
+    the raw OpenAI chunk.
+    """
+    usage = getattr(chunk.inner_content, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None)
+
+
 class OpenAIProvider(Provider):
-    """OpenAI provider implementation with function-calling and stepwise planning support."""
+    """OpenAI provider implementation with function-calling support."""
 
     def __init__(self, config: ProviderConfig, base_dir: Optional[Path] = None):
         """
@@ -37,18 +47,9 @@ class OpenAIProvider(Provider):
 
         self.model = config.model or "gpt-3.5-turbo"
         self.client = OpenAIChatCompletion(ai_model_id=self.model)
-        self.service_id = "openai"  # Used for both chat and planning
+        self.service_id = "openai"
         self.base_dir = base_dir
 
-        # Initialize stepwise planner with default options
-        self.planner_options = FunctionCallingStepwisePlannerOptions(
-            max_iterations=10,
-            max_tokens=4000,
-        )
-        self.planner = FunctionCallingStepwisePlanner(
-            service_id=self.service_id, options=self.planner_options
-        )
-
     async def chat(
         self,
         history: ChatHistory,
@@ -59,6 +60,7 @@ class OpenAIProvider(Provider):
         Stream a chat response from OpenAI.
         If function definitions are available, attach them to the settings.
         """
+        request_start = time.perf_counter()
 
         # If no kernel is given, create a new one.
         if not kernel:
@@ -69,52 +71,43 @@ class OpenAIProvider(Provider):
             temperature=self.settings.temperature,
             top_p=self.settings.top_p,
             max_tokens=self.settings.max_tokens,
-            function_choice_behavior=FunctionChoiceBehavior.Auto(),
         )
 
-        # If we have a valid base_dir and a kernel with plugins,
-        # load the OpenAI function definitions from our plugin manager.
-        if self.base_dir and hasattr(kernel, "plugins"):
-            pm = PluginManager(self.base_dir, kernel)
-            openai_funcs = pm.get_openai_functions()
-            if openai_funcs:
-                # 'functions' is a list of JSON schema definitions for each function
-                settings.tools = openai_funcs.get("functions", [])
+        # If the kernel has plugins, attach their OpenAI function definitions.
+        # These are cached per kernel and only rebuilt when plugins change.
+        # Tool calls are not auto-invoked here: they stream back as
+        # FunctionCallContent items and the Agent dispatches them.
+        start = time.perf_counter()
+        if getattr(kernel, "plugins", None):
+            openai_funcs = get_tool_schema_cache().get(kernel)
+            if openai_funcs.get("functions"):
+                settings.tools = [
+                    {"type": "function", "function": function}
+                    for function in openai_funcs["functions"]
+                ]
                 # 'function_call' can be "auto" or "none" or a specific function name
                 settings.tool_choice = openai_funcs.get("function_call", "auto")
-
-        # Now request a streaming response from the OpenAI model
-        async for chunk in self.client.get_streaming_chat_message_content(
-            chat_history=history,
-            settings=settings,
-            kernel=kernel,
-        ):
-            # If the chunk includes a function call, yield that chunk with chunk.function_call
-            if hasattr(chunk, "function_call") and chunk.function_call:
-                yield chunk
-            else:
-                # Normal text chunk
-                yield chunk
-
-    async def plan_and_execute(
-        self,
-        goal: str,
-        kernel: Optional[Kernel] = None,
-    ) -> AsyncIterator[StreamingChatMessageContent]:
-        """
-        Execute tasks using regular chat functionality.
-        This is a simplified version that doesn't try to do complex planning.
-        """
-        if not kernel:
-            kernel = Kernel()
-
-        # Create a chat history with the goal
-        history = ChatHistory()
-        history.add_system_message(
-            "You are a helpful AI assistant. Please help accomplish the following goal:"
-        )
-        history.add_user_message(goal)
-
-        # Use regular chat to handle the request
-        async for chunk in self.chat(history, kernel):
+        now = time.perf_counter()
+        timings = {
+            "tool_schemas": now - start,
+            "request_build": now - request_start,
+        }
+
+        # Now request a streaming response from the OpenAI model, through the
+        # shared scheduler so rate limits and retries apply across agents
+        def request() -> AsyncIterator[StreamingChatMessageContent]:
+            return self.client.get_streaming_chat_message_content(
+                chat_history=history,
+                settings=settings,
+                kernel=kernel,
+            )
+
+        async for chunk in self.scheduled(request, history):
+            # Text chunks and tool-call deltas are both passed through as-is
+            if timings is not None:
+                chunk.metadata[REQUEST_TIMINGS_KEY] = timings
+                timings = None
+            cached_tokens = _cached_tokens(chunk)
+            if cached_tokens is not None:
+                chunk.metadata["cached_tokens"] = cached_tokens
             yield chunk
@@ -2,23 +2,31 @@
 
 from typing import Optional
 
+import importlib
+
 from agent_runtime.providers.base import Provider, ProviderConfig, ProviderType
-from agent_runtime.providers.ollama import OllamaProvider
-from agent_runtime.providers.openai import OpenAIProvider
 
+# Provider classes by type, as (module, class name) so that only the
+# provider actually used is imported
+PROVIDERS = {
+    ProviderType.OPENAI: ("agent_runtime.providers.openai", "OpenAIProvider"),
+    ProviderType.OLLAMA: ("agent_runtime.providers.ollama", "OllamaProvider"),
+    ProviderType.REPLAY: ("agent_runtime.providers.replay", "ReplayProvider"),
+}
 
-def get_provider(config: ProviderConfig) -> Provider:
-    """Get a provider instance."""
-    PROVIDERS = {
-        ProviderType.OPENAI: OpenAIProvider,
-        ProviderType.OLLAMA: OllamaProvider,
-    }
 
-    provider_class = PROVIDERS.get(config.name)
-    if not provider_class:
-        raise ValueError(f"Unsupported provider type: {config.name}")
+def get_provider_class(provider_type: ProviderType) -> type:
+    """Import and return the provider class for a provider type."""
+    location = PROVIDERS.get(provider_type)
+    if not location:
+        raise ValueError(f"Unsupported provider type: {provider_type}")
+    module_name, class_name = location
+    return getattr(importlib.import_module(module_name), class_name)
 
-    return provider_class(config)
+
+def get_provider(config: ProviderConfig) -> Provider:
+    """Get a provider instance."""
+    return get_provider_class(config.name)(config)
 
 
 def get_provider_config(config: dict, agent_id: Optional[str] = None) -> ProviderConfig:
@@ -0,0 +1,247 @@
+# agent_runtime/providers/replay.py
+"""Replay provider: serve recorded chunk streams without a model server."""
+
+import asyncio
+import json
+import logging
+import weakref
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.kernel import Kernel
+
+from agent_runtime.providers.base import (
+    Provider,
+    ProviderConfig,
+    ProviderType,
+    ReplaySettings,
+)
+
+logger = logging.getLogger(__name__)
+
+# Version of the fixture line format written by the recorder
+FIXTURE_VERSION = 1
+
+
+def chunk_to_dict(chunk: StreamingChatMessageContent) -> Dict[str, Any]:
+    """Serialize a streamed chunk to a JSON-compatible dict."""
+    data: Dict[str, Any] = {}
+    if chunk.content:
+        data["content"] = chunk.content
+    tool_calls = [
+        {
+            "id": item.id,
+            "index": item.index,
+            "name": item.name,
+            "arguments": item.arguments,
+        }
+        for item in chunk.items
+        if isinstance(item, FunctionCallContent)
+    ]
+    if tool_calls:
+        data["tool_calls"] = tool_calls
+    usage = (chunk.metadata or {}).get("usage")
+    if usage is not None:
+        data["usage"] = usage.model_dump() if hasattr(usage, "model_dump") else usage
+    cached_tokens = (chunk.metadata or {}).get("cached_tokens")
+    if cached_tokens is not None:
+        data["cached_tokens"] = cached_tokens
+    return data
+
+
+def chunk_from_dict(data: Dict[str, Any]) -> StreamingChatMessageContent:
+    """Rebuild a streamed chunk from :func:`chunk_to_dict` output."""
+    items: List[Any] = [
+        FunctionCallContent(
+            id=call.get("id"),
+            index=call.get("index"),
+            name=call.get("name"),
+            arguments=call.get("arguments"),
+        )
+        for call in data.get("tool_calls", [])
+    ]
+    metadata = {"usage": data["usage"]} if "usage" in data else {}
+    if "cached_tokens" in data:
+        metadata["cached_tokens"] = data["cached_tokens"]
+    if items:
+        # Text streamed alongside tool calls is kept as a text item
+        return StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            items=items,
+            content=data.get("content") or None,
+            choice_index=0,
+            metadata=metadata,
+        )
+    return StreamingChatMessageContent(
+        role=AuthorRole.ASSISTANT,
+        content=data.get("content", ""),
+        choice_index=0,
+        metadata=metadata,
+    )
+
+
+def load_fixture(path: Path) -> List[List[Dict[str, Any]]]:
+    """Read the recorded turns (each a list of chunk dicts) from a fixture."""
+    turns = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                turn = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid fixture line: {e}") from e
+            turns.append(turn.get("chunks", []))
+    return turns
+
+
+class ReplayProvider(Provider):
+    """Provider that replays recorded model responses from a fixture file.
+
+    A fixture is a JSONL file with one line per model call::
+
+        {"version": 1, "prompt": "...", "chunks": [{"content": "Hel"}, ...]}
+
+    Each ``chat`` call replays the next recorded turn of the conversation it
+    is called with, so a recorded tool call is followed by the response the
+    model gave once it saw the results. Every conversation (``ChatHistory``)
+    starts at the first turn and keeps its own position, so conversations
+    that share the provider, such as batch workers, replay deterministically
+    however their calls interleave. With
+    ``mode = "record"`` the provider instead forwards to a real provider
+    (``record_provider``) and appends every response to the fixture.
+    """
+
+    def __init__(self, config: ProviderConfig, base_dir: Optional[Path] = None):
+        super().__init__(config)
+        if not isinstance(self.settings, ReplaySettings):
+            raise ValueError("Invalid settings type for replay provider")
+        if not self.settings.fixture:
+            raise ValueError("Replay provider requires a 'fixture' setting")
+
+        self.model = config.model
+        fixture = Path(self.settings.fixture)
+        if not fixture.is_absolute() and base_dir:
+            fixture = Path(base_dir) / fixture
+        self.fixture_path = fixture
+        self._turns: Optional[List[List[Dict[str, Any]]]] = None
+        # Next turn of each conversation, by id() of its ChatHistory
+        self._cursors: Dict[int, int] = {}
+
+        self.recorder: Optional[Provider] = None
+        if self.settings.mode == "record":
+            self.recorder = self._create_recorder(config, base_dir)
+
+    def _create_recorder(
+        self, config: ProviderConfig, base_dir: Optional[Path]
+    ) -> Provider:
+        """Create the real provider whose responses are recorded."""
+        provider_type = ProviderType(self.settings.record_provider)
+        settings = {
+            k: v
+            for k, v in (config.settings or {}).items()
+            if k not in ("fixture", "token_delay", "mode", "record_provider", "loop")
+        }
+        inner_config = ProviderConfig(
+            name=provider_type,
+            model=config.model,
+            settings=settings,
+            agent_id=config.agent_id,
+        )
+        if provider_type == ProviderType.OLLAMA:
+            from agent_runtime.providers.ollama import OllamaProvider
+
+            return OllamaProvider(inner_config)
+        if provider_type == ProviderType.OPENAI:
+            from agent_runtime.providers.openai import OpenAIProvider
+
+            return OpenAIProvider(inner_config, base_dir=base_dir)
+        raise ValueError(f"Cannot record from provider type: {provider_type.value}")
+
+    @property
+    def turns(self) -> List[List[Dict[str, Any]]]:
+        """Recorded turns, loaded from the fixture on first use."""
+        if self._turns is None:
+            if not self.fixture_path.exists():
+                raise FileNotFoundError(
+                    f"Replay fixture not found: {self.fixture_path}"
+                )
+            self._turns = load_fixture(self.fixture_path)
+            if not self._turns:
+                raise ValueError(f"Replay fixture has no turns: {self.fixture_path}")
+            logger.debug("Loaded %d turns from %s", len(self._turns), self.fixture_path)
+        return self._turns
+
+    def rewind(self) -> None:
+        """Start replaying every conversation from the first turn again."""
+        self._cursors.clear()
+
+    async def chat(
+        self,
+        history: ChatHistory,
+        kernel: Optional[Kernel] = None,
+        functions: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        """Replay the next recorded turn, or record a real one."""
+        if self.recorder is not None:
+            async for chunk in self._record(history, kernel):
+                yield chunk
+            return
+
+        turns = self.turns
+        cursor = self._next_turn(history)
+        if cursor >= len(turns):
+            if not self.settings.loop:
+                raise RuntimeError(
+                    f"Replay fixture exhausted after {len(turns)} turns: "
+                    f"{self.fixture_path}"
+                )
+            cursor %= len(turns)
+        turn = turns[cursor]
+
+        for data in turn:
+            # Always yield to the loop so replay interleaves like a real stream
+            await asyncio.sleep(self.settings.token_delay)
+            yield chunk_from_dict(data)
+
+    def _next_turn(self, history: ChatHistory) -> int:
+        """Advance the conversation's position and return its turn index."""
+        key = id(history)
+        if key not in self._cursors:
+            self._cursors[key] = 0
+            # Forget the position once the conversation is gone, so a new
+            # history that reuses the id starts from the first turn
+            weakref.finalize(history, self._cursors.pop, key, None)
+        cursor = self._cursors[key]
+        self._cursors[key] = cursor + 1
+        return cursor
+
+    async def _record(
+        self, history: ChatHistory, kernel: Optional[Kernel]
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        chunks = []
+        async for chunk in self.recorder.chat(history, kernel):
+            chunks.append(chunk_to_dict(chunk))
+            yield chunk
+
+        last = history.messages[-1] if history.messages else None
+        line = {
+            "version": FIXTURE_VERSION,
+            "prompt": last.content if last is not None else None,
+            "chunks": chunks,
+        }
+        self.fixture_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.fixture_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        logger.debug("Recorded %d chunks to %s", len(chunks), self.fixture_path)
+
+    async def aclose(self) -> None:
+        """Close the recorded provider, if any."""
+        if self.recorder is not None:
+            await self.recorder.aclose()
@@ -0,0 +1,291 @@
+# agent_runtime/providers/scheduler.py
+"""Shared request scheduler: concurrency cap, rate limits and retries."""
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: rate limited, or a transient server error
+RETRYABLE_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class SchedulerConfig:
+    """Process-wide scheduler settings."""
+
+    max_concurrent_requests: int = 8
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def __post_init__(self) -> None:
+        if self.max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
+        if self.max_retries < 0:
+            raise ValueError("max_retries cannot be negative")
+
+
+@dataclass
+class RateLimits:
+    """Per-model limits, from a model's settings block."""
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` units per second.
+
+    ``acquire`` waits until enough units are available. ``charge`` takes units
+    without waiting and may leave the bucket in debt, which delays later
+    callers; it is used to account for tokens only known after a response.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Locks are bound to a loop; recreate for each asyncio.run()
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` units are available, then take them."""
+        # A request larger than the bucket can never fit; let it through once full
+        amount = min(amount, self.capacity)
+        async with self._get_lock():
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def charge(self, amount: float) -> None:
+        """Take ``amount`` units immediately, possibly going into debt."""
+        self._refill()
+        self.tokens -= amount
+
+
+def _status_of(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None) or getattr(
+            response, "status", None
+        )
+    return status if isinstance(status, int) else None
+
+
+def _headers_of(error: BaseException) -> Any:
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    return headers
+
+
+def _error_chain(error: BaseException):
+    """The error and everything it was raised from, outermost first."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def classify_error(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """Whether a failed request is worth retrying, and any server-given delay.
+
+    Provider SDKs wrap transport errors, so the whole exception chain is
+    checked for an HTTP status, a Retry-After header, or a connection error.
+    """
+    for err in _error_chain(error):
+        status = _status_of(err)
+        if status is not None:
+            if status not in RETRYABLE_STATUSES:
+                return False, None
+            headers = _headers_of(err)
+            retry_after = None
+            if headers is not None:
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+            return True, retry_after
+        if isinstance(
+            err, (aiohttp.ClientConnectionError, asyncio.TimeoutError, ConnectionError)
+        ):
+            return True, None
+        if type(err).__name__ in ("APIConnectionError", "APITimeoutError"):
+            return True, None
+    return False, None
+
+
+class RequestScheduler:
+    """Schedule provider requests across every agent in the process.
+
+    All streams share one concurrency cap. Each model key can also have a
+    requests-per-minute and a tokens-per-minute bucket. Requests that fail
+    with a rate limit or transient error before producing any output are
+    retried with jittered exponential backoff, honoring Retry-After. Once a
+    stream has produced chunks it is never retried, so output is not repeated.
+
+    A request only holds a concurrency slot while an attempt runs. Waiting
+    for a model's rate limits or for a retry leaves the slot to other models.
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None) -> None:
+        self.config = config or SchedulerConfig()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self.retries = 0
+
+    def set_limits(self, key: str, limits: RateLimits) -> None:
+        """Set the rate limits for a model key (e.g. ``openai:gpt-4o``)."""
+        if limits.requests_per_minute:
+            self._request_buckets[key] = TokenBucket(limits.requests_per_minute)
+        else:
+            self._request_buckets.pop(key, None)
+        if limits.tokens_per_minute:
+            self._token_buckets[key] = TokenBucket(limits.tokens_per_minute)
+        else:
+            self._token_buckets.pop(key, None)
+
+    def ensure_limits(self, key: str, limits: RateLimits) -> None:
+        """Set limits for ``key`` unless another provider already did.
+
+        Agents sharing a model share its buckets, so limits are not reset each
+        time a provider for that model sends a request.
+        """
+        if key not in self._request_buckets and key not in self._token_buckets:
+            self.set_limits(key, limits)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to a loop; recreate for each asyncio.run()
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number ``attempt`` (0-based), with full jitter."""
+        if retry_after is not None:
+            return min(retry_after, self.config.max_delay)
+        ceiling = min(self.config.max_delay, self.config.base_delay * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    async def stream(
+        self,
+        key: str,
+        request: Callable[[], AsyncIterator[Any]],
+        tokens: int = 0,
+    ) -> AsyncIterator[Any]:
+        """Run ``request()`` under the limits for ``key`` and yield its items.
+
+        ``tokens`` is the estimated prompt size charged against the model's
+        token bucket; completion tokens reported in a chunk's usage metadata
+        are charged once the stream finishes.
+        """
+        attempt = 0
+        while True:
+            await self._acquire(key, tokens)
+            produced = False
+            try:
+                async with self._get_semaphore():
+                    async for item in request():
+                        produced = True
+                        self._charge_usage(key, item)
+                        yield item
+                return
+            except Exception as e:
+                retryable, retry_after = classify_error(e)
+                if produced or not retryable or attempt >= self.config.max_retries:
+                    raise
+                delay = self.backoff(attempt, retry_after)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    "Request to %s failed (%s); retry %d/%d in %.2fs",
+                    key,
+                    e,
+                    attempt,
+                    self.config.max_retries,
+                    delay,
+                )
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, key: str, tokens: int) -> None:
+        bucket = self._request_buckets.get(key)
+        if bucket is not None:
+            await bucket.acquire(1)
+        bucket = self._token_buckets.get(key)
+        if bucket is not None and tokens:
+            await bucket.acquire(tokens)
+
+    def _charge_usage(self, key: str, item: Any) -> None:
+        bucket = self._token_buckets.get(key)
+        if bucket is None:
+            return
+        usage = (getattr(item, "metadata", None) or {}).get("usage")
+        completion = getattr(usage, "completion_tokens", None)
+        if completion is None and isinstance(usage, dict):
+            completion = usage.get("completion_tokens")
+        if completion:
+            bucket.charge(completion)
+
+
+_SCHEDULER: Optional[RequestScheduler] = None
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide request scheduler."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = RequestScheduler()
+    return _SCHEDULER
+
+
+def configure_scheduler(config: SchedulerConfig) -> RequestScheduler:
+    """Apply new process-wide settings, keeping any per-model rate limits."""
+    scheduler = get_scheduler()
+    scheduler.config = config
+    scheduler._semaphore = None
+    return scheduler
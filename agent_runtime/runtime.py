@@ -0,0 +1,118 @@
+# agent_runtime/runtime.py
+"""Host every configured agent in one process, sharing what is safe to share."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from agent_runtime.agent import Agent
+
+logger = logging.getLogger(__name__)
+
+# Provider types whose instances hold no per-conversation state and can serve
+# several agents. Replay providers keep a fixture cursor, so each agent gets
+# its own.
+SHAREABLE_PROVIDERS = frozenset({"openai", "ollama"})
+
+
+def provider_key(model_config: Any, agent_id: Optional[str] = None) -> Optional[str]:
+    """Key under which agents can share a provider, or None if they cannot.
+
+    Agents whose resolved ``model`` blocks are identical share one provider,
+    and so one client and connection pool. An agent with its own ``.env``
+    file may override the model or endpoint, so it always gets its own.
+    """
+    if not isinstance(model_config, dict):
+        return None
+    if model_config.get("provider", "openai") not in SHAREABLE_PROVIDERS:
+        return None
+    if agent_id and Path(f".agents/{agent_id}/.env").exists():
+        return None
+    return json.dumps(model_config, sort_keys=True, default=str)
+
+
+class AgentRuntime:
+    """All agents from a configuration, hosted side by side.
+
+    Agents using the same model block share one provider. Plugins whose class
+    sets ``stateless = True`` are instantiated once and registered in every
+    kernel that uses them. Each agent still has its own kernel and history.
+    The runtime owns the shared providers and closes them in ``aclose``.
+    """
+
+    def __init__(
+        self,
+        config_dir: Path,
+        config: Dict[str, Any],
+        manifest: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.config_dir = config_dir
+        self.config = config
+        # Fresh startup manifest for this configuration, if any
+        self.manifest = manifest
+        self.agents: Dict[str, Agent] = {}
+        self.providers: Dict[str, Any] = {}
+        self.shared_plugins: Dict[str, Any] = {}
+        # Providers of agents that could not share one
+        self._private_providers: Dict[str, Any] = {}
+
+    async def load_all(self) -> Dict[str, Agent]:
+        """Create every configured agent that is not loaded yet."""
+        for agent_name in self.config["agent"]:
+            await self.get(agent_name)
+        return self.agents
+
+    async def get(self, agent_name: str) -> Agent:
+        """Return an agent, creating it on first use."""
+        agent = self.agents.get(agent_name)
+        if agent is None:
+            agent = await self._create(agent_name)
+            self.agents[agent_name] = agent
+        return agent
+
+    async def _create(self, agent_name: str) -> Agent:
+        from agent_runtime.core import create_agent
+
+        agent_cfg = self.config["agent"].get(agent_name)
+        if agent_cfg is None:
+            raise ValueError(f"Agent '{agent_name}' not found in configuration.")
+
+        model_config = agent_cfg.get("model", {})
+        key = provider_key(model_config, agent_cfg.get("name"))
+        if key is None:
+            provider = Agent.build_provider(
+                model_config, agent_cfg.get("name"), self.config_dir
+            )
+            self._private_providers[agent_name] = provider
+        else:
+            provider = self.providers.get(key)
+            if provider is None:
+                provider = Agent.build_provider(
+                    model_config, agent_cfg.get("name"), self.config_dir
+                )
+                self.providers[key] = provider
+            else:
+                logger.debug("Agent '%s' shares an existing provider", agent_name)
+
+        return await create_agent(
+            self.config_dir,
+            self.config,
+            agent_name,
+            provider=provider,
+            shared_plugins=self.shared_plugins,
+            manifest=self.manifest,
+        )
+
+    async def aclose(self) -> None:
+        """Close every agent, then the providers they share."""
+        for agent in self.agents.values():
+            await agent.aclose()
+        providers = list(self.providers.values())
+        providers += list(self._private_providers.values())
+        for provider in providers:
+            if hasattr(provider, "aclose"):
+                await provider.aclose()
+        self.agents.clear()
+        self.providers.clear()
+        self._private_providers.clear()
@@ -0,0 +1,278 @@
+"""Long-running HTTP server that streams chat replies from warm agents."""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from agent_runtime.agent import Agent
+from agent_runtime.events import TextChunk
+from agent_runtime.limits import TurnLimits
+from agent_runtime.sessions import SessionLog, SessionLogError, session_path
+
+logger = logging.getLogger(__name__)
+
+# Default number of chat sessions kept in memory across all agents
+DEFAULT_MAX_SESSIONS = 256
+
+
+@dataclass
+class Session:
+    """A conversation with one agent, held in memory between requests."""
+
+    agent: Agent
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionStore:
+    """In-memory sessions keyed by agent and session id, with LRU eviction.
+
+    Each session is a clone of a warm agent, so it has its own chat history
+    while sharing the agent's provider, kernel and plugins. With a
+    ``session_dir`` every session is also saved to a log after each turn
+    (see agent_runtime.sessions), so sessions survive eviction and restarts.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        session_dir: Optional[Path] = None,
+        compress: bool = False,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.session_dir = session_dir
+        self.compress = compress
+        self._sessions: "OrderedDict[Tuple[str, str], Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._sessions
+
+    async def get(self, agent_key: str, session_id: str, agent: Agent) -> Session:
+        """Return the session, creating it from ``agent`` if it does not exist.
+
+        A saved log is read in a worker thread, so resuming a long session
+        does not hold up other requests.
+        """
+        key = (agent_key, session_id)
+        session = self._sessions.get(key)
+        if session is not None:
+            self._sessions.move_to_end(key)
+            return session
+
+        clone = agent.clone()
+        log = self._log(agent, session_id)
+        if log is not None:
+            await asyncio.to_thread(clone.resume_session, log)
+            # Another request may have opened the session in the meantime
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+
+        session = Session(agent=clone)
+        self._sessions[key] = session
+        while len(self._sessions) > self.max_sessions:
+            evicted, _ = self._sessions.popitem(last=False)
+            logger.debug("Evicted session %s/%s", *evicted)
+        return session
+
+    def find(self, agent_key: str, session_id: str) -> Optional[Session]:
+        """Return an existing session without creating or touching it."""
+        return self._sessions.get((agent_key, session_id))
+
+    def remove(
+        self, agent_key: str, session_id: str, agent: Optional[Agent] = None
+    ) -> bool:
+        """Drop a session and its saved log. Returns whether it existed."""
+        session = self._sessions.pop((agent_key, session_id), None)
+        log = session.agent.session_log if session is not None else None
+        if log is None and agent is not None:
+            log = self._log(agent, session_id)
+        deleted = log.delete() if log is not None else False
+        return session is not None or deleted
+
+    def _log(self, agent: Agent, session_id: str) -> Optional[SessionLog]:
+        if self.session_dir is None:
+            return None
+        return SessionLog(
+            session_path(self.session_dir, agent.name, session_id, self.compress)
+        )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+class AgentServer:
+    """Serve warm agents over HTTP, streaming replies as server-sent events.
+
+    Routes:
+        GET    /health                             liveness and loaded agents
+        GET    /agents                             agent names and descriptions
+        POST   /agents/{agent}/chat                ``{"message", "session_id"?,
+                                                    "timeout"?, "max_output_tokens"?}``
+        POST   /agents/{agent}/sessions/{session}/cancel  stop the running turn
+        DELETE /agents/{agent}/sessions/{session}  forget a session
+
+    A chat response is a ``text/event-stream`` of a ``session`` event, one
+    ``chunk`` event per streamed piece of text and a final ``done`` event.
+    Tool progress is interleaved as ``tool_call_started``, ``tool_output``
+    and ``tool_call_finished`` events.
+    ``timeout`` and ``max_output_tokens`` override the agent's turn limits;
+    a turn that hits one, is cancelled, or whose client disconnects keeps its
+    partial reply and reports ``stop_reason`` in the ``done`` event.
+    """
+
+    def __init__(
+        self,
+        agents: Dict[str, Agent],
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        session_dir: Optional[Path] = None,
+        compress_sessions: bool = False,
+    ) -> None:
+        self.agents = agents
+        self.sessions = SessionStore(max_sessions, session_dir, compress_sessions)
+
+    def make_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/health", self.health),
+                web.get("/agents", self.list_agents),
+                web.post("/agents/{agent}/chat", self.chat),
+                web.post(
+                    "/agents/{agent}/sessions/{session}/cancel", self.cancel_session
+                ),
+                web.delete("/agents/{agent}/sessions/{session}", self.delete_session),
+            ]
+        )
+        app.on_cleanup.append(self._close_agents)
+        return app
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "status": "ok",
+                "agents": sorted(self.agents),
+                "sessions": len(self.sessions),
+            }
+        )
+
+    async def list_agents(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "agents": [
+                    {"id": key, "name": agent.name, "description": agent.description}
+                    for key, agent in sorted(self.agents.items())
+                ]
+            }
+        )
+
+    async def chat(self, request: web.Request) -> web.StreamResponse:
+        agent_key = request.match_info["agent"]
+        agent = self._get_agent(agent_key)
+
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            raise web.HTTPBadRequest(text="Request body must be JSON")
+        message = body.get("message") if isinstance(body, dict) else None
+        if not isinstance(message, str) or not message:
+            raise web.HTTPBadRequest(text="'message' must be a non-empty string")
+        session_id = str(body.get("session_id") or uuid.uuid4().hex)
+        try:
+            limits = TurnLimits(
+                timeout=body.get("timeout", agent.turn_limits.timeout),
+                max_output_tokens=body.get(
+                    "max_output_tokens", agent.turn_limits.max_output_tokens
+                ),
+            )
+        except (TypeError, ValueError) as e:
+            raise web.HTTPBadRequest(text=f"Invalid turn limits: {e}")
+
+        try:
+            session = await self.sessions.get(agent_key, session_id, agent)
+        except SessionLogError as e:
+            logger.error("%s", e)
+            raise web.HTTPInternalServerError(text=str(e))
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+        await response.write(_sse("session", {"session_id": session_id}))
+
+        # One turn at a time per session; other sessions are unaffected
+        async with session.lock:
+            disconnected = False
+            async for event in session.agent.chat_events(message, limits):
+                if disconnected:
+                    continue
+                if isinstance(event, TextChunk):
+                    if not event.content:
+                        continue
+                    data = _sse("chunk", {"content": event.content})
+                else:
+                    data = _sse(event.type, event.to_dict())
+                try:
+                    await response.write(data)
+                except ConnectionResetError:
+                    # Stop generating, but let the turn record its partial reply
+                    disconnected = True
+                    session.agent.cancel()
+            if disconnected:
+                return response
+            done: Dict[str, Any] = {"session_id": session_id}
+            if session.agent.last_error:
+                done["error"] = session.agent.last_error
+            if session.agent.last_stop_reason:
+                done["stop_reason"] = session.agent.last_stop_reason
+            await response.write(_sse("done", done))
+
+        await response.write_eof()
+        return response
+
+    async def cancel_session(self, request: web.Request) -> web.Response:
+        agent_key = request.match_info["agent"]
+        self._get_agent(agent_key)
+        session = self.sessions.find(agent_key, request.match_info["session"])
+        if session is None:
+            raise web.HTTPNotFound(text="Session not found")
+        return web.json_response({"cancelled": session.agent.cancel()})
+
+    async def delete_session(self, request: web.Request) -> web.Response:
+        agent_key = request.match_info["agent"]
+        agent = self._get_agent(agent_key)
+        try:
+            removed = self.sessions.remove(
+                agent_key, request.match_info["session"], agent
+            )
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+        if not removed:
+            raise web.HTTPNotFound(text="Session not found")
+        return web.json_response({"deleted": True})
+
+    def _get_agent(self, agent_key: str) -> Agent:
+        agent = self.agents.get(agent_key)
+        if agent is None:
+            raise web.HTTPNotFound(text=f"Agent '{agent_key}' not found")
+        return agent
+
+    async def _close_agents(self, app: Optional[web.Application] = None) -> None:
+        for agent in self.agents.values():
+            await agent.aclose()
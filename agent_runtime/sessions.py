@@ -0,0 +1,238 @@
+# agent_runtime/sessions.py
+"""Persist chat sessions as append-only, line-delimited logs.
+
+Each session is one file under ``.sessions/<agent>/`` in the project
+directory. Every line is a JSON record: either one chat message, appended
+after the turn that produced it, or a snapshot of the whole history,
+written when the history was rewritten rather than extended (compaction, a
+new conversation). Saving a turn therefore costs one append no matter how
+long the session is, and resuming only has to parse the records after the
+last snapshot.
+
+Plain logs are memory-mapped when resuming. Compressed logs (``.jsonl.gz``)
+hold one gzip member per append, which standard gzip tools read as a single
+stream.
+"""
+
+import gzip
+import json
+import logging
+import mmap
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from semantic_kernel.contents import ChatHistory, ChatMessageContent
+
+logger = logging.getLogger(__name__)
+
+# Sessions live under the project directory, next to .plugins and .cache
+SESSIONS_DIR = ".sessions"
+
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+# Start of a snapshot line. Newlines and quotes inside message text are
+# escaped in JSON, so this can only match a record boundary.
+_SNAPSHOT_PREFIX = b'{"type":"snapshot"'
+
+# Fields of a message that only matter while it is being streamed
+_EXCLUDE = {"inner_content": True, "items": {"__all__": {"inner_content"}}}
+
+
+class SessionLogError(ValueError):
+    """Raised when a session log has a damaged record before its last line."""
+
+    pass
+
+
+def validate_session_id(session_id: str) -> str:
+    """Reject ids that are not safe to use as a file name."""
+    if not _SESSION_ID_PATTERN.match(session_id):
+        raise ValueError(
+            f"Invalid session id '{session_id}': use letters, digits, '.', '_' "
+            "or '-' (at most 128 characters)"
+        )
+    return session_id
+
+
+def session_path(
+    config_dir: Path, agent_name: str, session_id: str, compress: bool = False
+) -> Path:
+    """File a session is stored in; an existing log wins over ``compress``."""
+    directory = config_dir / SESSIONS_DIR / re.sub(r"[^A-Za-z0-9_.-]", "_", agent_name)
+    plain = directory / f"{validate_session_id(session_id)}.jsonl"
+    compressed = plain.with_name(plain.name + ".gz")
+    if compressed.exists() or (compress and not plain.exists()):
+        return compressed
+    return plain
+
+
+def message_to_dict(message: ChatMessageContent) -> Dict[str, Any]:
+    """Serialize a chat message to a JSON-compatible dict."""
+    return message.model_dump(mode="json", exclude_none=True, exclude=_EXCLUDE)
+
+
+def message_from_dict(data: Dict[str, Any]) -> ChatMessageContent:
+    """Rebuild a chat message from :func:`message_to_dict` output."""
+    return ChatMessageContent.model_validate(data)
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class SessionLog:
+    """Append-only log of one session's chat history.
+
+    Call ``sync`` after every turn: it appends the messages added since the
+    last call, or writes a snapshot if the history was rewritten.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.compressed = self.path.suffix == ".gz"
+        # Which history, and how much of it, is already on disk
+        self._history: Optional[Tuple[int, int]] = None
+        self._written = 0
+        self._last: Optional[ChatMessageContent] = None
+        # Whether the log ended in a record cut short by a crash
+        self._torn = False
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> Optional[ChatHistory]:
+        """Replay the log into a chat history; None if there is no log yet."""
+        if not self.exists or self.path.stat().st_size == 0:
+            return None
+        self._torn = False
+        if self.compressed:
+            messages = self._replay(self._decompress())
+        else:
+            # Only the part after the last snapshot is ever copied out
+            with open(self.path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    messages = self._replay(data)
+
+        history = ChatHistory()
+        history.messages = messages
+        if self._torn:
+            # Appending after a torn record would leave it in the middle of
+            # the log, so start over from a snapshot of what survived
+            logger.warning(
+                "Repairing session log %s after an incomplete write", self.path
+            )
+            self._rewrite(history)
+        self._mark_written(history)
+        logger.debug("Loaded %d messages from %s", len(messages), self.path)
+        return history
+
+    def sync(self, history: ChatHistory) -> None:
+        """Write whatever the log is missing of ``history``."""
+        messages = history.messages
+        extends = (
+            self._history == (id(history), id(messages))
+            and len(messages) >= self._written
+            and (self._written == 0 or messages[self._written - 1] is self._last)
+        )
+        if extends:
+            new = messages[self._written :]
+            if not new:
+                return
+            records = [{"type": "message", "message": message_to_dict(m)} for m in new]
+            self._append(b"".join(_encode(r) for r in records))
+        else:
+            self._append(_encode(self._snapshot(history)))
+        self._mark_written(history)
+
+    def delete(self) -> bool:
+        """Remove the log file. Returns whether it existed."""
+        self._history = None
+        try:
+            self.path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _mark_written(self, history: ChatHistory) -> None:
+        self._history = (id(history), id(history.messages))
+        self._written = len(history.messages)
+        self._last = history.messages[-1] if history.messages else None
+
+    @staticmethod
+    def _snapshot(history: ChatHistory) -> Dict[str, Any]:
+        return {
+            "type": "snapshot",
+            "messages": [message_to_dict(m) for m in history.messages],
+        }
+
+    def _rewrite(self, history: ChatHistory) -> None:
+        """Replace the log with a single snapshot of ``history``."""
+        data = _encode(self._snapshot(history))
+        if self.compressed:
+            data = gzip.compress(data)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.path)
+
+    def _append(self, data: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.compressed:
+            data = gzip.compress(data)
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    def _decompress(self) -> bytes:
+        """Decompress every complete gzip member of a compressed log."""
+        data = self.path.read_bytes()
+        chunks = []
+        while data:
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                chunk = decompressor.decompress(data)
+            except zlib.error:
+                chunk, data = b"", b""
+            if not decompressor.eof:
+                # An append cut short by a crash; everything before it is intact
+                self._torn = True
+                break
+            chunks.append(chunk)
+            data = decompressor.unused_data
+        return b"".join(chunks)
+
+    def _replay(self, data: Any) -> List[ChatMessageContent]:
+        """Parse the records from the last snapshot on."""
+        start = data.rfind(b"\n" + _SNAPSHOT_PREFIX) + 1
+
+        messages: List[ChatMessageContent] = []
+        lines = data[start:].split(b"\n")
+        for number, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                if number == len(lines) - 1:
+                    # A write cut short by a crash; everything before it is intact
+                    self._torn = True
+                    break
+                raise self._damaged(data, start, number, e) from e
+            try:
+                if record["type"] == "snapshot":
+                    messages = [message_from_dict(m) for m in record["messages"]]
+                else:
+                    messages.append(message_from_dict(record["message"]))
+            except (KeyError, TypeError, ValueError) as e:
+                raise self._damaged(data, start, number, e) from e
+        return messages
+
+    def _damaged(
+        self, data: Any, start: int, number: int, error: Exception
+    ) -> SessionLogError:
+        line = data[:start].count(b"\n") + number + 1
+        return SessionLogError(
+            f"Session log {self.path} is damaged at line {line}: {error}"
+        )
@@ -0,0 +1,86 @@
+"""Helpers for turning streamed provider output into chat history entries."""
+
+import logging
+from typing import List, Optional
+
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    ChatMessageContent,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StreamAccumulator:
+    """Buffer streamed chunks and commit them as a single assistant message.
+
+    Providers stream a reply as many small ``StreamingChatMessageContent``
+    chunks. Text deltas and tool-call deltas (partial ``FunctionCallContent``
+    items keyed by their index) are merged as they arrive so that exactly one
+    message is written to the chat history for each model response.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: Optional[StreamingChatMessageContent] = None
+        self.chunk_count = 0
+
+    def add(self, chunk: StreamingChatMessageContent) -> None:
+        """Merge a streamed chunk into the buffer."""
+        self.chunk_count += 1
+        if self._buffer is None:
+            self._buffer = chunk
+        else:
+            self._buffer = self._buffer + chunk
+
+    @property
+    def text(self) -> str:
+        """Text accumulated so far."""
+        if self._buffer is None:
+            return ""
+        return self._buffer.content or ""
+
+    @property
+    def function_calls(self) -> List[FunctionCallContent]:
+        """Tool calls accumulated so far, with their argument deltas merged."""
+        if self._buffer is None:
+            return []
+        return [
+            item for item in self._buffer.items if isinstance(item, FunctionCallContent)
+        ]
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether there is nothing worth committing."""
+        return not self.text.strip() and not self.function_calls
+
+    def to_message(self) -> Optional[ChatMessageContent]:
+        """Build the assistant message for the buffered response, if any."""
+        if self.is_empty:
+            return None
+        return ChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            content=self.text,
+            items=list(self.function_calls),
+        )
+
+    def commit(self, history: ChatHistory) -> Optional[ChatMessageContent]:
+        """Write the buffered response to ``history`` and reset the buffer."""
+        message = self.to_message()
+        if message is not None:
+            history.add_message(message)
+            logger.debug(
+                "Committed assistant message from %d chunks (%d chars, %d tool calls)",
+                self.chunk_count,
+                len(self.text),
+                len(self.function_calls),
+            )
+        self.reset()
+        return message
+
+    def reset(self) -> None:
+        """Drop the buffered response."""
+        self._buffer = None
+        self.chunk_count = 0
@@ -0,0 +1,285 @@
+"""Concurrent execution of the tool calls requested in one model turn."""
+
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from semantic_kernel.contents import (
+    ChatMessageContent,
+    FunctionCallContent,
+    FunctionResultContent,
+)
+from semantic_kernel.functions import KernelArguments, KernelFunction
+
+from agent_runtime.events import (
+    ToolCallFinished,
+    ToolCallStarted,
+    ToolEvent,
+    ToolOutputChunk,
+)
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a queue of streamed items
+_DONE = object()
+
+
+@dataclass
+class ToolCallResult:
+    """Outcome of a single tool call."""
+
+    call: FunctionCallContent
+    result: str
+    duration: float
+    error: bool = False
+
+    def to_message(self) -> ChatMessageContent:
+        """Build the tool message that answers the call in the chat history."""
+        return FunctionResultContent.from_function_call_content_and_result(
+            function_call_content=self.call, result=self.result
+        ).to_chat_message_content()
+
+
+class ToolDispatcher:
+    """Run independent tool calls from one assistant turn concurrently.
+
+    Async kernel functions are awaited together on the running loop. Sync
+    plugin methods are offloaded to a bounded thread pool so a slow
+    ``read_file`` or ``lint_code`` does not block the others. Each plugin
+    can cap how many of its calls run at once; results are always returned
+    in the order the model requested them.
+
+    Tools whose method is a generator (sync or async) stream: each item they
+    yield is reported as it is produced and the items, joined, are the result.
+    """
+
+    def __init__(
+        self,
+        kernel: Any,
+        plugin_concurrency: Optional[Dict[str, int]] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.kernel = kernel
+        self.plugin_concurrency = dict(plugin_concurrency or {})
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="agent-tool"
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def resolve(self, name: str) -> Optional[Tuple[str, KernelFunction]]:
+        """Find the plugin name and kernel function for a tool call name."""
+        for plugin in self.kernel.plugins.values():
+            for func in plugin.functions.values():
+                # Tool names are "plugin_function"; accept semantic_kernel's
+                # "plugin-function" form as well.
+                if name in (f"{plugin.name}_{func.name}", f"{plugin.name}-{func.name}"):
+                    return plugin.name, func
+        return None
+
+    async def dispatch(self, calls: List[FunctionCallContent]) -> List[ToolCallResult]:
+        """Execute tool calls concurrently and return results in call order."""
+        if len(calls) > 1:
+            logger.debug("Dispatching %d tool calls concurrently", len(calls))
+        return list(await asyncio.gather(*(self._run(call) for call in calls)))
+
+    async def stream(
+        self, calls: List[FunctionCallContent]
+    ) -> AsyncIterator[ToolEvent]:
+        """Execute tool calls concurrently, yielding progress events.
+
+        Events arrive in the order they happen; each call produces a
+        ``ToolCallStarted``, any ``ToolOutputChunk`` items and a
+        ``ToolCallFinished``. Closing the iterator early cancels the calls.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run(index: int, call: FunctionCallContent) -> None:
+            call_id, name = call.id or "", call.name or ""
+            try:
+                arguments = self._parse_arguments(call)
+            except ValueError:
+                arguments = {}  # Reported by the finished event
+            queue.put_nowait(ToolCallStarted(index, call_id, name, arguments))
+            result = await self._run(
+                call,
+                lambda text: queue.put_nowait(
+                    ToolOutputChunk(index, call_id, name, text)
+                ),
+            )
+            queue.put_nowait(
+                ToolCallFinished(
+                    index, call_id, name, result.result, result.duration, result.error
+                )
+            )
+
+        task = asyncio.ensure_future(
+            asyncio.gather(*(run(i, call) for i, call in enumerate(calls)))
+        )
+        task.add_done_callback(lambda _: queue.put_nowait(_DONE))
+        try:
+            while True:
+                event = await queue.get()
+                if event is _DONE:
+                    break
+                yield event
+            task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.wait({task})
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=False)
+
+    async def _run(
+        self,
+        call: FunctionCallContent,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> ToolCallResult:
+        start = time.perf_counter()
+        try:
+            result = await self._invoke(call, on_output)
+            error = False
+        except Exception as e:
+            logger.exception("Error executing function %s", call.name)
+            result = f"Error executing function: {str(e)}"
+            error = True
+        duration = time.perf_counter() - start
+        logger.debug("Tool %s finished in %.3fs", call.name, duration)
+        return ToolCallResult(call=call, result=result, duration=duration, error=error)
+
+    async def _invoke(
+        self,
+        call: FunctionCallContent,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        resolved = self.resolve(call.name or "")
+        if not resolved:
+            return f"Error: Function '{call.name}' not found"
+        plugin_name, func = resolved
+
+        arguments = KernelArguments(**self._parse_arguments(call))
+        async with self._limit(plugin_name):
+            if self._is_streaming(func):
+                parts = []
+                async for part in self._iterate(func, arguments):
+                    text = str(part)
+                    parts.append(text)
+                    if on_output is not None:
+                        on_output(text)
+                return "".join(parts)
+            if self._is_sync(func):
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._executor, self._invoke_in_worker, func, arguments
+                )
+            else:
+                result = await func.invoke(kernel=self.kernel, arguments=arguments)
+        return str(result)
+
+    def _invoke_in_worker(
+        self, func: KernelFunction, arguments: KernelArguments
+    ) -> Any:
+        """Invoke a kernel function on a short-lived loop in the worker thread.
+
+        The wrapped method is sync, so nothing needs the loop after the call;
+        ``asyncio.run`` closes it rather than leaving one behind per thread.
+        """
+        return asyncio.run(func.invoke(kernel=self.kernel, arguments=arguments))
+
+    async def _iterate(
+        self, func: KernelFunction, arguments: KernelArguments
+    ) -> AsyncIterator[Any]:
+        """Yield the items a generator tool produces, as it produces them."""
+        if not self._is_sync(func):
+            async for part in func.invoke_stream(
+                kernel=self.kernel, arguments=arguments
+            ):
+                yield part
+            return
+
+        # Sync generators run in a worker thread and hand items back here.
+        # If the stream is closed early, ``stop`` ends the generator at its
+        # next item instead of letting it run to the end.
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        async def produce() -> None:
+            parts = func.invoke_stream(kernel=self.kernel, arguments=arguments)
+            async with contextlib.aclosing(parts):
+                async for part in parts:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, part)
+
+        def run_in_worker() -> None:
+            try:
+                asyncio.run(produce())
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+        worker = loop.run_in_executor(self._executor, run_in_worker)
+        try:
+            while True:
+                part = await queue.get()
+                if part is _DONE:
+                    break
+                yield part
+        finally:
+            stop.set()
+        await worker  # Raises the tool's error, if any
+
+    def _limit(self, plugin_name: str) -> Any:
+        """Semaphore enforcing the plugin's concurrency limit, if it has one."""
+        limit = self.plugin_concurrency.get(plugin_name)
+        if not limit:
+            return _NoLimit()
+        if plugin_name not in self._semaphores:
+            self._semaphores[plugin_name] = asyncio.Semaphore(limit)
+        return self._semaphores[plugin_name]
+
+    @staticmethod
+    def _is_streaming(func: KernelFunction) -> bool:
+        """Whether a kernel function yields its result piece by piece."""
+        method = getattr(func, "method", None)
+        return inspect.isgeneratorfunction(method) or inspect.isasyncgenfunction(method)
+
+    @staticmethod
+    def _is_sync(func: KernelFunction) -> bool:
+        """Whether a kernel function wraps a plain (blocking) Python method."""
+        method = getattr(func, "method", None)
+        if method is None:
+            return False
+        return not (
+            inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method)
+        )
+
+    @staticmethod
+    def _parse_arguments(call: FunctionCallContent) -> Dict[str, Any]:
+        if not call.arguments:
+            return {}
+        if isinstance(call.arguments, dict):
+            return dict(call.arguments)
+        arguments = json.loads(call.arguments)
+        if not isinstance(arguments, dict):
+            raise ValueError(f"Tool arguments must be a JSON object: {call.arguments}")
+        return arguments
+
+
+class _NoLimit:
+    """Async context manager used when a plugin has no concurrency limit."""
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
@@ -1,7 +1,35 @@
 """Common utilities for Agent Runtime."""
 
+import asyncio
+import concurrent.futures
+import os
+from pathlib import Path
+from typing import Any, Coroutine, TypeVar
+
 import click
 
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    Inside a running event loop the coroutine gets its own loop in a helper
+    thread, since the caller's loop cannot be re-entered.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def user_cache_dir() -> Path:
+    """Per-user cache directory shared by all projects."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "agent-runtime"
+
 
 class Style:
     """Consistent styling for CLI output."""
@@ -0,0 +1,314 @@
+"""Tests for the agent chat loop."""
+
+import json
+from typing import AsyncIterator, List
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.history import SUMMARY_METADATA_KEY, HistoryConfig, HistoryManager
+from agent_runtime.planner import PlannerConfig, parse_steps
+from agent_runtime.streaming import StreamAccumulator
+
+REPLY_WORDS = 100
+
+
+def _payload_bytes(history: ChatHistory) -> int:
+    """Size of the request body a provider would send for ``history``."""
+    return len(json.dumps([m.to_dict() for m in history.messages]).encode())
+
+
+class StubProvider:
+    """Provider that streams a fixed reply one word at a time."""
+
+    def __init__(self, words: int = REPLY_WORDS) -> None:
+        self.words = words
+        self.payload_sizes: List[int] = []
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        self.payload_sizes.append(_payload_bytes(history))
+        for i in range(self.words):
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, content=f"word{i} ", choice_index=0
+            )
+
+
+@pytest.fixture
+def agent() -> Agent:
+    """Create an agent backed by the stub provider."""
+    agent = Agent(
+        name="bench",
+        description="benchmark agent",
+        system_prompt="You are a test agent.",
+        provider=StubProvider(),
+        skip_init=True,
+    )
+    agent.kernel = Kernel()
+    return agent
+
+
+async def _run_turns(agent: Agent, turns: int) -> None:
+    for turn in range(turns):
+        async for _ in agent.chat(f"message {turn}"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_streamed_reply_is_one_message(agent: Agent) -> None:
+    await _run_turns(agent, 1)
+
+    messages = agent.history.messages
+    assert [m.role for m in messages] == [
+        AuthorRole.SYSTEM,
+        AuthorRole.USER,
+        AuthorRole.ASSISTANT,
+    ]
+    assert messages[-1].content == "".join(f"word{i} " for i in range(REPLY_WORDS))
+
+
+@pytest.mark.asyncio
+async def test_history_and_payload_growth_over_50_turns(agent: Agent) -> None:
+    """Regression benchmark: history and request size grow linearly per turn."""
+    turns = 50
+    await _run_turns(agent, turns)
+
+    # One system message plus exactly one user and one assistant message per turn
+    assert len(agent.history.messages) == 1 + 2 * turns
+
+    sizes = agent.provider.payload_sizes
+    assert len(sizes) == turns
+    growth = {later - earlier for earlier, later in zip(sizes, sizes[1:])}
+    reply_bytes = len("".join(f"word{i} " for i in range(REPLY_WORDS)))
+    # Each turn adds one user + one assistant entry, so per-turn growth is the
+    # reply plus a small, constant amount of message framing.
+    assert max(growth) - min(growth) <= 2
+    assert max(growth) < reply_bytes + 100
+
+
+def test_accumulator_merges_tool_call_deltas() -> None:
+    accumulator = StreamAccumulator()
+    accumulator.add(
+        StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            choice_index=0,
+            items=[
+                FunctionCallContent(
+                    id="call_1", index=0, name="echo-greet", arguments='{"na'
+                )
+            ],
+        )
+    )
+    accumulator.add(
+        StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            choice_index=0,
+            items=[FunctionCallContent(index=0, arguments='me": "Ada"}')],
+        )
+    )
+
+    history = ChatHistory()
+    message = accumulator.commit(history)
+
+    assert message is not None
+    assert len(history.messages) == 1
+    (call,) = message.items
+    assert call.id == "call_1"
+    assert json.loads(call.arguments) == {"name": "Ada"}
+    assert accumulator.is_empty
+
+
+def test_accumulator_skips_empty_response() -> None:
+    accumulator = StreamAccumulator()
+    accumulator.add(
+        StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT, content="  ", choice_index=0
+        )
+    )
+    history = ChatHistory()
+    assert accumulator.commit(history) is None
+    assert history.messages == []
+
+
+def _history_with_turns(turns: int, words: int = 50) -> ChatHistory:
+    history = ChatHistory()
+    history.add_system_message("You are a test agent.")
+    for turn in range(turns):
+        history.add_user_message(f"question {turn}")
+        history.add_assistant_message(" ".join(f"answer{turn}" for _ in range(words)))
+    return history
+
+
+@pytest.mark.asyncio
+async def test_history_window_keeps_system_prompt_and_recent_turns() -> None:
+    history = _history_with_turns(20)
+    manager = HistoryManager(HistoryConfig(max_tokens=1000, keep_turns=3))
+
+    assert await manager.compact(history)
+
+    messages = history.messages
+    assert messages[0].content == "You are a test agent."
+    assert [m.content for m in messages if m.role == AuthorRole.USER] == [
+        "question 17",
+        "question 18",
+        "question 19",
+    ]
+    assert manager.count_tokens(history) <= 1000
+
+
+@pytest.mark.asyncio
+async def test_history_window_shrinks_below_keep_turns_when_over_budget() -> None:
+    history = _history_with_turns(10, words=100)
+    manager = HistoryManager(HistoryConfig(max_tokens=400, keep_turns=8))
+
+    assert await manager.compact(history)
+    assert manager.count_tokens(history) <= 400
+    # The latest turn is always kept
+    assert history.messages[-2].content == "question 9"
+
+
+@pytest.mark.asyncio
+async def test_history_summarize_rolls_summary_forward() -> None:
+    seen = []
+
+    async def summarizer(previous, messages):
+        seen.append((previous, len(messages)))
+        return f"summary #{len(seen)}"
+
+    manager = HistoryManager(
+        HistoryConfig(max_tokens=500, keep_turns=2, strategy="summarize"),
+        summarizer=summarizer,
+    )
+    history = _history_with_turns(10)
+    assert await manager.compact(history)
+    assert history.messages[1].content == "summary #1"
+    assert history.messages[1].metadata[SUMMARY_METADATA_KEY]
+
+    # Later compactions fold the previous summary into the new one
+    for turn in range(10, 14):
+        history.add_user_message(f"question {turn}")
+        history.add_assistant_message(" ".join(f"answer{turn}" for _ in range(50)))
+    assert await manager.compact(history)
+    assert seen[-1][0] == "summary #1"
+    assert history.messages[1].content == "summary #2"
+    assert sum(1 for m in history.messages if m.role == AuthorRole.SYSTEM) == 2
+
+
+@pytest.mark.asyncio
+async def test_history_unbounded_by_default() -> None:
+    history = _history_with_turns(50)
+    assert not await HistoryManager(HistoryConfig()).compact(history)
+    assert len(history.messages) == 101
+
+
+def test_agent_from_config_reads_history_block() -> None:
+    config = {
+        "name": "coder",
+        "system_prompt": "You write code.",
+        "model": {"provider": "ollama", "name": "llama3"},
+        "history": [{"max_tokens": 2000, "keep_turns": 4, "strategy": "summarize"}],
+    }
+    agent = Agent.from_config(config, skip_init=True)
+
+    assert agent.history_manager.config == HistoryConfig(
+        max_tokens=2000, keep_turns=4, strategy="summarize"
+    )
+
+
+class ScriptedProvider:
+    """Provider that streams a scripted reply per request, in order."""
+
+    def __init__(self, replies: List[List[StreamingChatMessageContent]]) -> None:
+        self.replies = list(replies)
+        self.requests: List[ChatHistory] = []
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        self.requests.append(history)
+        for chunk in self.replies.pop(0):
+            yield chunk
+
+
+def _text(content: str) -> List[StreamingChatMessageContent]:
+    return [
+        StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT, content=content, choice_index=0
+        )
+    ]
+
+
+class LookupPlugin:
+    @kernel_function(description="Look something up", name="lookup")
+    def lookup(self, key: str) -> str:
+        return f"value of {key}"
+
+
+@pytest.mark.asyncio
+async def test_planner_streams_plan_steps_and_answer() -> None:
+    tool_call = StreamingChatMessageContent(
+        role=AuthorRole.ASSISTANT,
+        items=[
+            FunctionCallContent(
+                id="call_1", index=0, name="kv-lookup", arguments='{"key": "a"}'
+            )
+        ],
+        choice_index=0,
+    )
+    provider = ScriptedProvider(
+        [
+            _text("1. Look up a\n2. Report it"),
+            [tool_call],
+            _text("a is 1."),
+            _text("Reported."),
+            _text("The value of a is 1."),
+        ]
+    )
+    agent = Agent(
+        name="planner",
+        description="planning agent",
+        system_prompt="You are a test agent.",
+        provider=provider,
+        skip_init=True,
+        planner_config=PlannerConfig(max_steps=3),
+    )
+    agent.kernel = Kernel()
+    agent.kernel.add_plugin(LookupPlugin(), plugin_name="kv")
+
+    chunks = [chunk async for chunk in agent.chat("What is a?")]
+
+    assert agent.last_error is None
+    phases = [c.metadata["planner"] for c in chunks if "planner" in c.metadata]
+    assert phases == ["plan", "step", "step", "final"]
+    assert "".join(c.content or "" for c in chunks).endswith("The value of a is 1.")
+    # The plan is requested without tools, in a one-off history
+    assert "kv_lookup" in str(provider.requests[0].messages[0].content)
+    assert provider.requests[0] is not agent.history
+    assert agent.planner.steps == ["Look up a", "Report it"]
+    assert agent.last_turn_metrics.model_calls == 5
+    assert [t.name for t in agent.last_turn_metrics.tools] == ["kv-lookup"]
+
+
+def test_planner_is_opt_in_and_lazy() -> None:
+    config = {
+        "name": "coder",
+        "system_prompt": "You write code.",
+        "model": {"provider": "ollama", "name": "llama3"},
+    }
+    agent = Agent.from_config(config, skip_init=True)
+    assert agent.planner is None
+
+    agent = Agent.from_config({**config, "planner": [{"max_steps": 2}]}, skip_init=True)
+    assert agent._planner is None
+    assert agent.planner.config == PlannerConfig(max_steps=2)
+    assert parse_steps("1) one\n- two\n3. three", 2) == ["one", "two"]
+    assert parse_steps("Just answer.", 2) == ["Just answer."]
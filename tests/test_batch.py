@@ -0,0 +1,156 @@
+"""Tests for headless batch runs."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    StreamingChatMessageContent,
+)
+
+from agent_runtime.agent import Agent
+from agent_runtime.batch import BatchRunner, record_turns
+from agent_runtime.limits import TurnLimits
+
+
+class EchoProvider:
+    """Provider that replies with the last user message, slowly."""
+
+    def __init__(self, delay: float = 0.05, fail_on: str = "") -> None:
+        self.delay = delay
+        self.fail_on = fail_on
+        self.active = 0
+        self.max_active = 0
+        self.prompts: List[str] = []
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        prompt = history.messages[-1].content
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and prompt == self.fail_on:
+                raise RuntimeError("provider unavailable")
+            turn = sum(1 for m in history.messages if m.role == AuthorRole.USER)
+            for word in (f"turn{turn}:", prompt):
+                yield StreamingChatMessageContent(
+                    role=AuthorRole.ASSISTANT, content=word, choice_index=0
+                )
+        finally:
+            self.active -= 1
+
+
+def _agent(provider: EchoProvider) -> Agent:
+    agent = Agent(
+        name="batch",
+        description="batch agent",
+        system_prompt="You are a test agent.",
+        provider=provider,
+        skip_init=True,
+    )
+    agent.kernel = Kernel()
+    return agent
+
+
+def _write_jsonl(path: Path, records: List[dict]) -> Path:
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return path
+
+
+def _read_jsonl(path: Path) -> List[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_record_turns_accepts_prompts_and_conversations() -> None:
+    assert record_turns({"prompt": "hi"}) == ["hi"]
+    assert record_turns(
+        {
+            "messages": [
+                {"role": "user", "content": "a"},
+                {"role": "assistant", "content": "ignored"},
+                "b",
+            ]
+        }
+    ) == ["a", "b"]
+    with pytest.raises(ValueError):
+        record_turns({"messages": []})
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_records_concurrently(tmp_path: Path) -> None:
+    records = [{"id": f"r{i}", "prompt": f"p{i}"} for i in range(8)]
+    records.append({"id": "conv", "messages": ["first", "second"]})
+    input_path = _write_jsonl(tmp_path / "in.jsonl", records)
+    output_path = tmp_path / "out.jsonl"
+    provider = EchoProvider()
+
+    summary = await BatchRunner(_agent(provider), concurrency=4).run(
+        input_path, output_path
+    )
+
+    assert (summary.total, summary.completed, summary.failed) == (9, 9, 0)
+    assert provider.max_active == 4
+    results = {r["id"]: r for r in _read_jsonl(output_path)}
+    assert results["r3"]["response"] == "turn1:p3"
+    # Conversations keep their own history, separate from other records
+    assert results["conv"]["responses"] == ["turn1:first", "turn2:second"]
+
+
+@pytest.mark.asyncio
+async def test_batch_resume_skips_completed_records(tmp_path: Path) -> None:
+    records = [{"id": f"r{i}", "prompt": f"p{i}"} for i in range(4)]
+    input_path = _write_jsonl(tmp_path / "in.jsonl", records)
+    output_path = tmp_path / "out.jsonl"
+
+    provider = EchoProvider(fail_on="p2")
+    summary = await BatchRunner(_agent(provider), concurrency=2).run(
+        input_path, output_path
+    )
+    assert (summary.completed, summary.failed) == (3, 1)
+
+    # Simulate a crash mid-write: r3's line is cut short
+    lines = output_path.read_text().splitlines()
+    kept = [line for line in lines if '"r3"' not in line]
+    output_path.write_text("\n".join(kept) + "\n" + '{"id": "r3", "resp')
+
+    provider = EchoProvider()
+    summary = await BatchRunner(_agent(provider), concurrency=2).run(
+        input_path, output_path, resume=True
+    )
+
+    assert (summary.skipped, summary.completed, summary.failed) == (2, 2, 0)
+    assert sorted(provider.prompts) == ["p2", "p3"]
+    results = _read_jsonl(output_path)
+    assert sorted(r["id"] for r in results) == ["r0", "r1", "r2", "r3"]
+    assert all(r["error"] is None for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_records_stopped_turns_as_errors(tmp_path: Path) -> None:
+    records = [{"id": f"r{i}", "prompt": f"p{i}"} for i in range(2)]
+    input_path = _write_jsonl(tmp_path / "in.jsonl", records)
+    output_path = tmp_path / "out.jsonl"
+
+    agent = _agent(EchoProvider(delay=0.3))
+    agent.turn_limits = TurnLimits(timeout=0.1)
+    summary = await BatchRunner(agent, concurrency=2).run(input_path, output_path)
+
+    assert (summary.completed, summary.failed) == (0, 2)
+    result = _read_jsonl(output_path)[0]
+    assert result["stop_reason"] == "timeout"
+    assert result["error"] == "Turn stopped: timeout"
+
+    # Resume retries the stopped records
+    summary = await BatchRunner(_agent(EchoProvider()), concurrency=2).run(
+        input_path, output_path, resume=True
+    )
+    assert (summary.skipped, summary.completed) == (0, 2)
+    assert all(r["stop_reason"] is None for r in _read_jsonl(output_path))
@@ -0,0 +1,100 @@
+"""Tests for CLI startup cost.
+
+Each test runs in a fresh interpreter, so that modules imported by other
+tests do not hide an eager import.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent / "project"
+
+HEAVY_MODULES = ("semantic_kernel", "aiohttp", "openai")
+
+# Runs the CLI in-process, then reports which heavy modules were imported
+CLI_SCRIPT = """
+import json, sys
+HEAVY = sys.argv.pop(1).split(",")
+from agent_runtime.cli.cli import cli
+try:
+    cli.main(args=sys.argv[1:], prog_name="agentruntime", standalone_mode=False)
+finally:
+    loaded = sorted(set(m.split(".")[0] for m in sys.modules) & set(HEAVY))
+    print("LOADED=" + json.dumps(loaded))
+"""
+
+
+def _run_cli(*args: str) -> list:
+    result = subprocess.run(
+        [sys.executable, "-c", CLI_SCRIPT, ",".join(HEAVY_MODULES), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    line = [out for out in result.stdout.splitlines() if out.startswith("LOADED=")][-1]
+    return json.loads(line[len("LOADED=") :])
+
+
+def test_cli_import_is_lightweight(record_property) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import agent_runtime.cli.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative)
+
+    heavy = [m for m in imported if m.split(".")[0] in HEAVY_MODULES]
+    assert not heavy, f"CLI import pulled in {heavy}"
+    # Kept in the JUnit report (--junitxml) to follow the trend across runs
+    record_property("cli_import_seconds", imported["agent_runtime.cli.cli"] / 1e6)
+
+
+def test_validate_does_not_load_runtime_dependencies() -> None:
+    assert _run_cli("validate", "--dir", str(PROJECT_DIR)) == []
+
+
+def test_init_does_not_load_server_dependencies(tmp_path: Path) -> None:
+    shutil.copytree(
+        PROJECT_DIR / "local_plugins" / "echo", tmp_path / "local_plugins" / "echo"
+    )
+    (tmp_path / "config.hcl").write_text(
+        """
+runtime {
+  required_version = "0.0.1"
+}
+
+model "gpt4o" {
+  provider = "openai"
+  name     = "gpt-4o"
+}
+
+plugin "local" "echo" {
+  source = "./local_plugins/echo"
+}
+
+agent "echo" {
+  name          = "echo"
+  description   = "Echo agent"
+  system_prompt = "Echo the input."
+  model         = model.gpt4o
+  plugins       = [plugin.local.echo]
+}
+"""
+    )
+
+    # Compiling the startup manifest imports the plugins, and with them
+    # semantic_kernel, but nothing used to serve agents
+    assert "aiohttp" not in _run_cli("init", "--dir", str(tmp_path))
+    assert (tmp_path / ".cache" / "startup_manifest.json").exists()
+    lockfile = json.loads((tmp_path / "plugins.lock.json").read_text())
+    assert "@local/echo" in json.dumps(lockfile)
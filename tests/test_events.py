@@ -0,0 +1,179 @@
+"""Tests for typed chat events and streaming tool output."""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.events import (
+    TextChunk,
+    ToolCallFinished,
+    ToolCallStarted,
+    ToolOutputChunk,
+)
+from agent_runtime.tools import ToolDispatcher
+
+LINE_DELAY = 0.02
+
+
+class ProgressPlugin:
+    @kernel_function(description="Run a command", name="run")
+    def run(self, command: str) -> Iterator[str]:
+        for i in range(3):
+            time.sleep(LINE_DELAY)
+            yield f"{command} line {i}\n"
+
+    @kernel_function(description="Watch a file", name="watch")
+    async def watch(self, path: str) -> AsyncIterator[str]:
+        for i in range(2):
+            await asyncio.sleep(LINE_DELAY)
+            yield f"{path} changed {i}\n"
+
+    @kernel_function(description="Count letters", name="count")
+    def count(self, text: str) -> str:
+        return str(len(text))
+
+
+class ToolCallingProvider:
+    """Asks for every progress tool at once, then answers in text."""
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        if history.messages[-1].role == AuthorRole.USER:
+            calls = [
+                ("progress-run", {"command": "make"}),
+                ("progress-watch", {"path": "a.txt"}),
+                ("progress-count", {"text": "abc"}),
+            ]
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT,
+                items=[
+                    FunctionCallContent(
+                        id=f"call_{i}", index=i, name=name, arguments=json.dumps(args)
+                    )
+                    for i, (name, args) in enumerate(calls)
+                ],
+                choice_index=0,
+            )
+            return
+        yield StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT, content="All done.", choice_index=0
+        )
+
+
+@pytest.fixture
+def agent() -> Agent:
+    agent = Agent(
+        name="events",
+        description="events agent",
+        system_prompt="You are a test agent.",
+        provider=ToolCallingProvider(),
+        skip_init=True,
+    )
+    agent.kernel = Kernel()
+    agent.kernel.add_plugin(ProgressPlugin(), plugin_name="progress")
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_chat_events_report_tool_progress(agent: Agent) -> None:
+    events = []
+    arrived: List[float] = []
+    async for event in agent.chat_events("build it"):
+        events.append(event)
+        arrived.append(time.perf_counter())
+
+    started = [e for e in events if isinstance(e, ToolCallStarted)]
+    assert [(e.name, e.arguments) for e in started] == [
+        ("progress-run", {"command": "make"}),
+        ("progress-watch", {"path": "a.txt"}),
+        ("progress-count", {"text": "abc"}),
+    ]
+
+    output = [e for e in events if isinstance(e, ToolOutputChunk)]
+    assert [e.content for e in output if e.index == 0] == [
+        f"make line {i}\n" for i in range(3)
+    ]
+    assert [e.content for e in output if e.index == 1] == [
+        f"a.txt changed {i}\n" for i in range(2)
+    ]
+    # Output is delivered while the tool runs, not all at the end
+    first_output = events.index(output[0])
+    finished_run = next(
+        i
+        for i, e in enumerate(events)
+        if isinstance(e, ToolCallFinished) and e.index == 0
+    )
+    assert arrived[finished_run] - arrived[first_output] >= LINE_DELAY
+
+    finished = {e.index: e for e in events if isinstance(e, ToolCallFinished)}
+    assert finished[0].result == "".join(f"make line {i}\n" for i in range(3))
+    assert finished[2].result == "3"
+    assert all(e.duration > 0 and not e.error for e in finished.values())
+    assert isinstance(events[-1], TextChunk) and events[-1].content == "All done."
+
+    # Tool results land in history in call order, joined for streaming tools
+    tool_results = [
+        m.items[0].result for m in agent.history.messages if m.role == AuthorRole.TOOL
+    ]
+    assert tool_results == [finished[i].result for i in range(3)]
+    assert finished[1].to_dict()["type"] == "tool_call_finished"
+
+
+@pytest.mark.asyncio
+async def test_chat_yields_text_only(agent: Agent) -> None:
+    chunks = [chunk async for chunk in agent.chat("build it")]
+    assert all(isinstance(c, StreamingChatMessageContent) for c in chunks)
+    assert "".join(c.content or "" for c in chunks) == "All done."
+
+
+class EndlessPlugin:
+    def __init__(self) -> None:
+        self.produced = 0
+        self.closed = False
+
+    @kernel_function(description="Tail a log", name="tail")
+    def tail(self) -> Iterator[str]:
+        try:
+            while True:
+                time.sleep(LINE_DELAY)
+                self.produced += 1
+                yield f"line {self.produced}\n"
+        finally:
+            self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_stops_a_sync_generator_tool() -> None:
+    plugin = EndlessPlugin()
+    kernel = Kernel()
+    kernel.add_plugin(plugin, plugin_name="endless")
+    call = FunctionCallContent(id="call_0", index=0, name="endless-tail")
+
+    outputs = 0
+    events = ToolDispatcher(kernel).stream([call])
+    async for event in events:
+        if isinstance(event, ToolOutputChunk):
+            outputs += 1
+            if outputs == 2:
+                break
+    await events.aclose()
+
+    # The generator ends at its next item rather than running on
+    await asyncio.sleep(LINE_DELAY * 5)
+    assert plugin.closed
+    produced = plugin.produced
+    await asyncio.sleep(LINE_DELAY * 5)
+    assert plugin.produced == produced <= 4
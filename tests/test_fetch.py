@@ -0,0 +1,148 @@
+"""Tests for downloading remote plugins, against a local bare repository."""
+
+import http.server
+import io
+import os
+import subprocess
+import tarfile
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from agent_runtime.plugins.fetch import (
+    FallbackFetcher,
+    FetchError,
+    GitFetcher,
+    TarballFetcher,
+    git_refs,
+)
+
+SOURCE = {"org": "example", "repo": "agentruntime-plugin-tool", "clone_url": ""}
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture(scope="module")
+def bare_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Bare repository with some history and tags 'v1.0.0' and '2.0'."""
+    root = tmp_path_factory.mktemp("remote")
+    work = root / "work"
+    work.mkdir()
+    _git("init", "-q", cwd=work)
+    for i in range(5):
+        (work / "history.txt").write_text(os.urandom(20_000).hex())
+        _git("add", ".", cwd=work)
+        _git("commit", "-q", "-m", f"commit {i}", cwd=work)
+    (work / "history.txt").unlink()
+    (work / "__init__.py").write_text("VERSION = 1\n")
+    (work / "tools").mkdir()
+    (work / "tools" / "run.sh").write_text("#!/bin/sh\n")
+    (work / "tools" / "run.sh").chmod(0o755)
+    _git("add", "-A", cwd=work)
+    _git("commit", "-q", "-m", "release", cwd=work)
+    _git("tag", "v1.0.0", cwd=work)
+    (work / "__init__.py").write_text("VERSION = 2\n")
+    _git("commit", "-q", "-am", "two", cwd=work)
+    _git("tag", "2.0", cwd=work)
+
+    bare = root / "tool.git"
+    _git("clone", "-q", "--bare", str(work), str(bare), cwd=root)
+    return bare
+
+
+def test_git_fetch_gets_only_the_ref(bare_repo: Path, tmp_path: Path) -> None:
+    fetcher = GitFetcher(url_template=str(bare_repo))
+    dest = tmp_path / "v1"
+    dest.mkdir()
+    result = fetcher.fetch_timed(SOURCE, git_refs("1.0.0"), dest)
+    assert (result.method, result.ref) == ("git", "v1.0.0")
+    assert sorted(p.name for p in dest.iterdir()) == ["__init__.py", "tools"]
+    assert (dest / "__init__.py").read_text() == "VERSION = 1\n"
+    # The earlier commits with the large file were never downloaded
+    assert 0 < result.bytes_downloaded < 10_000
+
+    dest = tmp_path / "v2"
+    dest.mkdir()
+    assert fetcher.fetch(SOURCE, git_refs("2.0"), dest) == "2.0"
+    assert (dest / "__init__.py").read_text() == "VERSION = 2\n"
+
+    with pytest.raises(FetchError, match="9.9"):
+        fetcher.fetch(SOURCE, git_refs("9.9"), tmp_path / "v2")
+
+
+@pytest.fixture
+def archive_server(bare_repo: Path) -> Iterator[str]:
+    """HTTP server that serves 'git archive' tarballs like GitHub does."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            ref = self.path.rsplit("/", 1)[-1]
+            if ref == "evil":
+                data = _evil_tarball()
+            else:
+                result = subprocess.run(
+                    ["git", "archive", "--format=tar.gz", f"--prefix=tool-{ref}/", ref],
+                    cwd=bare_repo,
+                    capture_output=True,
+                )
+                if result.returncode:
+                    self.send_error(404)
+                    return
+                data = result.stdout
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/{{org}}/{{repo}}/tar.gz/{{ref}}"
+    server.shutdown()
+    server.server_close()
+
+
+def _evil_tarball() -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        info = tarfile.TarInfo("top/../../escape.txt")
+        info.size = 1
+        tar.addfile(info, io.BytesIO(b"x"))
+    return buffer.getvalue()
+
+
+def test_tarball_fetch(archive_server: str, tmp_path: Path) -> None:
+    fetcher = TarballFetcher(url_template=archive_server)
+    result = fetcher.fetch_timed(SOURCE, git_refs("1.0.0"), tmp_path)
+    assert (result.method, result.ref) == ("tarball", "v1.0.0")
+    assert (tmp_path / "__init__.py").read_text() == "VERSION = 1\n"
+    assert (tmp_path / "tools" / "run.sh").stat().st_mode & 0o111
+    assert result.bytes_downloaded > 0
+
+    unsafe = tmp_path / "unsafe"
+    unsafe.mkdir()
+    with pytest.raises(FetchError, match="Unsafe"):
+        fetcher.fetch(SOURCE, ["evil"], unsafe)
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_fallback_to_git(bare_repo: Path, tmp_path: Path) -> None:
+    # No archive available, e.g. a private repository
+    missing = TarballFetcher(url_template="http://127.0.0.1:9/{org}/{repo}/{ref}")
+    fetcher = FallbackFetcher([missing, GitFetcher(url_template=str(bare_repo))])
+    result = fetcher.fetch_timed(SOURCE, git_refs("2.0"), tmp_path)
+    assert result.method == "git"
+    assert (tmp_path / "__init__.py").read_text() == "VERSION = 2\n"
@@ -0,0 +1,151 @@
+"""Tests for cached GitHub tag lookups, against a local stub of the API."""
+
+import http.server
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from agent_runtime.plugins.github import GitHubClient, HttpResponse
+from agent_runtime.plugins.manager import PluginConfig
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+TAGS = {"/repos/org/agentruntime-plugin-echo/git/refs/tags/1.0.0": SHA}
+
+
+class StubGitHub:
+    """``HttpGet`` that answers tag lookups from TAGS, with ETags."""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, str]] = []
+        self.fail = False
+
+    def __call__(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        self.calls.append(headers)
+        if self.fail:
+            raise ConnectionError("offline")
+        sha = TAGS.get(url.replace("https://api.github.com", ""))
+        if sha is None:
+            return HttpResponse(status=404, headers={})
+        etag = f'"{sha[:8]}"'
+        if headers.get("If-None-Match") == etag:
+            return HttpResponse(status=304, headers={"etag": etag})
+        return HttpResponse(
+            status=200, headers={"etag": etag}, body={"object": {"sha": SHA}}
+        )
+
+
+def _plugin() -> PluginConfig:
+    return PluginConfig(
+        plugin_type="remote", name="echo", source="org/echo", version="1.0.0"
+    )
+
+
+def test_lookups_are_memoized(tmp_path: Path) -> None:
+    stub = StubGitHub()
+    client = GitHubClient(cache_path=tmp_path / "github.json", http=stub)
+    # 'v1.0.0' is tried first and does not exist
+    assert _plugin().get_github_commit_sha(client) == SHA
+    assert len(stub.calls) == 2
+    for _ in range(3):
+        assert _plugin().get_github_commit_sha(client) == SHA
+    assert len(stub.calls) == 2
+
+    # Another process within the TTL does not ask at all
+    client = GitHubClient(cache_path=tmp_path / "github.json", http=stub)
+    assert _plugin().get_github_commit_sha(client) == SHA
+    assert len(stub.calls) == 2
+
+
+def test_expired_entries_are_revalidated(tmp_path: Path) -> None:
+    stub = StubGitHub()
+    GitHubClient(cache_path=tmp_path / "github.json", http=stub).commit_sha(
+        "org", "agentruntime-plugin-echo", ["1.0.0"]
+    )
+
+    client = GitHubClient(cache_path=tmp_path / "github.json", ttl=0, http=stub)
+    assert client.commit_sha("org", "agentruntime-plugin-echo", ["1.0.0"]) == SHA
+    assert stub.calls[-1]["If-None-Match"] == f'"{SHA[:8]}"'
+    assert (client.requests, client.not_modified) == (1, 1)
+
+    # Without GitHub the last known answer is used
+    stub.fail = True
+    client = GitHubClient(cache_path=tmp_path / "github.json", ttl=0, http=stub)
+    assert client.commit_sha("org", "agentruntime-plugin-echo", ["1.0.0"]) == SHA
+    assert client.commit_sha("org", "other", ["1.0.0"]) is None
+
+
+def test_concurrent_lookups_send_one_request() -> None:
+    stub = StubGitHub()
+    client = GitHubClient(http=stub)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(
+                lambda _: client.commit_sha(
+                    "org", "agentruntime-plugin-echo", ["1.0.0"]
+                ),
+                range(16),
+            )
+        )
+    assert results == [SHA] * 16
+    assert len(stub.calls) == 1
+
+
+@pytest.fixture
+def api_server() -> Iterator[str]:
+    """Local HTTP server standing in for api.github.com."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            sha = TAGS.get(self.path)
+            if sha is None:
+                self.send_error(404)
+                return
+            etag = f'"{sha[:8]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = json.dumps({"object": {"sha": sha}}).encode()
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_default_http_against_local_api(api_server: str, tmp_path: Path) -> None:
+    cache = tmp_path / "github.json"
+    client = GitHubClient(cache_path=cache, api_url=api_server)
+    assert _plugin().get_github_commit_sha(client) == SHA
+
+    client = GitHubClient(cache_path=cache, ttl=0, api_url=api_server)
+    assert _plugin().get_github_commit_sha(client) == SHA
+    # The missing 'v1.0.0' tag is asked again; '1.0.0' is revalidated
+    assert (client.requests, client.not_modified) == (2, 1)
+
+
+def test_prefix_matches_are_a_miss(tmp_path: Path) -> None:
+    # GitHub lists every tag starting with the name when none matches exactly
+    def http(url: str, headers: Dict[str, str]) -> HttpResponse:
+        if url.endswith("/v1.0"):
+            body = [{"ref": "refs/tags/v1.0.1", "object": {"sha": "f" * 40}}]
+            return HttpResponse(status=200, headers={}, body=body)
+        return HttpResponse(status=200, headers={}, body={"object": {"sha": SHA}})
+
+    client = GitHubClient(http=http)
+    assert client.commit_sha("org", "repo", ["v1.0", "1.0"]) == SHA
+    assert client.commit_sha("org", "repo", ["v1.0"]) is None
@@ -0,0 +1,155 @@
+"""Tests for turn deadlines, output limits and cancellation."""
+
+import asyncio
+import time
+from typing import AsyncIterator, List
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.limits import TurnLimits, truncation_marker
+
+
+class EndlessProvider:
+    """Provider that streams words until it is closed."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.closed = 0
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        try:
+            for i in range(10_000):
+                await asyncio.sleep(self.delay)
+                yield StreamingChatMessageContent(
+                    role=AuthorRole.ASSISTANT, content=f"w{i} ", choice_index=0
+                )
+        finally:
+            self.closed += 1
+
+
+class ToolThenTextProvider:
+    """Provider that calls the hang tool, then answers in text."""
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        if history.messages[-1].role == AuthorRole.USER:
+            call = FunctionCallContent(
+                id="call_1", index=0, name="slow_hang", arguments="{}"
+            )
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, items=[call], choice_index=0
+            )
+            return
+        yield StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT, content="done", choice_index=0
+        )
+
+
+class HangingPlugin:
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    @kernel_function(description="Never finishes", name="hang")
+    async def hang(self) -> str:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "finished"
+
+
+def _agent(provider, limits: TurnLimits = None) -> Agent:
+    agent = Agent(
+        name="limited",
+        description="limited agent",
+        system_prompt="You are a test agent.",
+        provider=provider,
+        skip_init=True,
+        turn_limits=limits,
+    )
+    agent.kernel = Kernel()
+    return agent
+
+
+async def _chat(agent: Agent, message: str) -> List[StreamingChatMessageContent]:
+    return [chunk async for chunk in agent.chat(message)]
+
+
+@pytest.mark.asyncio
+async def test_max_output_tokens_keeps_partial_reply() -> None:
+    provider = EndlessProvider()
+    agent = _agent(provider, TurnLimits(max_output_tokens=5))
+
+    chunks = await _chat(agent, "talk forever")
+
+    assert agent.last_stop_reason == "max_output_tokens"
+    assert agent.last_error is None
+    assert provider.closed == 1
+    assert chunks[-1].metadata["truncated"] == "max_output_tokens"
+    reply = agent.history.messages[-1]
+    assert reply.role == AuthorRole.ASSISTANT
+    assert reply.content == "w0 w1 w2 w3 w4\n\n" + truncation_marker(
+        "max_output_tokens"
+    )
+    assert agent.last_turn_metrics.stop_reason == "max_output_tokens"
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_hanging_tool_call() -> None:
+    plugin = HangingPlugin()
+    agent = _agent(ToolThenTextProvider(), TurnLimits(timeout=0.1))
+    agent.kernel.add_plugin(plugin, plugin_name="slow")
+
+    start = time.perf_counter()
+    await _chat(agent, "use the tool")
+
+    assert time.perf_counter() - start < 2
+    assert agent.last_stop_reason == "timeout"
+    assert plugin.cancelled
+    # The tool call is answered, so the history stays valid for the next turn
+    roles = [m.role for m in agent.history.messages]
+    assert roles[-3:] == [AuthorRole.ASSISTANT, AuthorRole.TOOL, AuthorRole.ASSISTANT]
+    assert "timeout" in str(agent.history.messages[-2].items[0].result)
+
+    # Limits can be overridden for a single turn
+    start = time.perf_counter()
+    chunks = [c async for c in agent.chat("again", TurnLimits(timeout=0.3))]
+    assert time.perf_counter() - start >= 0.3
+    assert agent.last_stop_reason == "timeout"
+    assert chunks[-1].metadata["truncated"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_streaming_turn() -> None:
+    provider = EndlessProvider(delay=0.005)
+    agent = _agent(provider)
+    assert not agent.cancel()
+
+    received = []
+
+    async def consume() -> None:
+        async for chunk in agent.chat("stream"):
+            received.append(chunk)
+
+    task = asyncio.create_task(consume())
+    while len(received) < 3:
+        await asyncio.sleep(0.005)
+    assert agent.cancel()
+    await asyncio.wait_for(task, timeout=2)
+
+    assert agent.last_stop_reason == "cancelled"
+    assert provider.closed == 1
+    assert agent.history.messages[-1].content.endswith(truncation_marker("cancelled"))
@@ -0,0 +1,123 @@
+"""Tests for the startup manifest written by 'init' and used by 'run'."""
+
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from agent_runtime.core import build_agent, init_plugins
+from agent_runtime.manifest import load_manifest, manifest_path
+from agent_runtime.plugins.manager import get_tool_schema_cache
+
+PLUGIN_SOURCE = """
+from semantic_kernel.functions import kernel_function
+
+
+class Helper:
+    pass
+
+
+class ManifestTool:
+    @kernel_function(description="Add two numbers", name="add")
+    def add(self, a: int, b: int) -> str:
+        return str(a + b)
+"""
+
+CONFIG = """
+runtime {
+  required_version = "0.0.1"
+}
+
+model "llama" {
+  provider = "ollama"
+  name     = "llama3"
+}
+
+plugin "local" "tool" {
+  source = "./local_plugins/manifest_tool"
+}
+
+agent "adder" {
+  name          = "adder"
+  description   = "Adds numbers"
+  system_prompt = "You add numbers."
+  model         = model.llama
+  plugins       = [plugin.local.tool]
+}
+"""
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    plugin_dir = tmp_path / "local_plugins" / "manifest_tool"
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "__init__.py").write_text(PLUGIN_SOURCE)
+    (tmp_path / "config.hcl").write_text(CONFIG)
+    init_plugins(tmp_path)
+    return tmp_path
+
+
+def test_init_writes_manifest(config_dir: Path) -> None:
+    path = manifest_path(config_dir)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    manifest = json.loads(path.read_text())
+    assert manifest["plugins"]["@local/tool"]["class"] == "ManifestTool"
+    tools = manifest["agents"]["adder"]["tools"]["functions"]
+    assert [t["name"] for t in tools] == ["local_tool_add"]
+    assert tools[0]["parameters"]["required"] == ["a", "b"]
+    assert manifest["config"]["agent"]["adder"]["name"] == "adder"
+
+
+@pytest.mark.asyncio
+async def test_run_starts_warm_from_manifest(config_dir: Path) -> None:
+    cache = get_tool_schema_cache()
+    agent = await build_agent(config_dir, "adder")
+    assert agent.startup_metrics.warm_start
+    assert "local_tool" in agent.kernel.plugins
+
+    # Tool schemas come from the manifest instead of being rebuilt
+    builds = cache.builds
+    tools = cache.get(agent.kernel)
+    assert cache.builds == builds
+    assert [t["name"] for t in tools["functions"]] == ["local_tool_add"]
+
+
+@pytest.mark.asyncio
+async def test_changes_make_manifest_stale(
+    config_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert load_manifest(config_dir) is not None
+
+    # Variables change the resolved configuration
+    monkeypatch.setenv("AGENT_VAR_SIGNATURE", "changed")
+    assert load_manifest(config_dir) is None
+    assert load_manifest(config_dir, cli_vars=("signature=x",)) is None
+    monkeypatch.delenv("AGENT_VAR_SIGNATURE")
+    assert load_manifest(config_dir) is not None
+
+    # So do edits to plugin sources
+    source = config_dir / "local_plugins" / "manifest_tool" / "__init__.py"
+    mtime = source.stat().st_mtime_ns + 1_000_000_000
+    os.utime(source, ns=(mtime, mtime))
+    assert load_manifest(config_dir) is None
+
+    # And to the configuration, after which 'run' takes the slow path
+    init_plugins(config_dir)
+    assert load_manifest(config_dir) is not None
+    config = config_dir / "config.hcl"
+    config.write_text(config.read_text().replace("You add", "You sum"))
+    assert load_manifest(config_dir) is None
+    agent = await build_agent(config_dir, "adder")
+    assert not agent.startup_metrics.warm_start
+    assert agent.system_prompt == "You sum numbers."
+
+
+@pytest.mark.asyncio
+async def test_unreadable_manifest_is_ignored(config_dir: Path) -> None:
+    manifest_path(config_dir).write_text("{not json")
+    assert load_manifest(config_dir) is None
+    agent = await build_agent(config_dir, "adder")
+    assert not agent.startup_metrics.warm_start
@@ -0,0 +1,146 @@
+"""Tests for per-turn latency metrics."""
+
+import json
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import AuthorRole, StreamingChatMessageContent
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.core import attach_trace
+from agent_runtime.metrics import MetricsRecord, TurnMetrics, TurnRecorder
+from agent_runtime.providers.base import (
+    REQUEST_TIMINGS_KEY,
+    ProviderConfig,
+    ProviderType,
+)
+from agent_runtime.providers.replay import ReplayProvider
+
+TOKEN_DELAY = 0.01
+TOOL_DELAY = 0.05
+
+
+class SlowPlugin:
+    @kernel_function(description="Look something up", name="lookup")
+    def lookup(self, key: str) -> str:
+        time.sleep(TOOL_DELAY)
+        return f"value of {key}"
+
+
+def _write_fixture(path: Path) -> Path:
+    turns = [
+        [
+            {
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "index": 0,
+                        "name": "slow_lookup",
+                        "arguments": '{"key": "a"}',
+                    }
+                ]
+            }
+        ],
+        [{"content": "The "}, {"content": "value "}, {"content": "is a."}]
+        + [{"usage": {"prompt_tokens": 120, "completion_tokens": 4}}],
+    ]
+    path.write_text("".join(json.dumps({"chunks": t}) + "\n" for t in turns))
+    return path
+
+
+@pytest.fixture
+def agent(tmp_path: Path) -> Agent:
+    fixture = _write_fixture(tmp_path / "turns.jsonl")
+    provider = ReplayProvider(
+        ProviderConfig(
+            name=ProviderType.REPLAY,
+            settings={"fixture": str(fixture), "token_delay": TOKEN_DELAY},
+        )
+    )
+    kernel = Kernel()
+    kernel.add_plugin(SlowPlugin(), plugin_name="slow")
+    agent = Agent(
+        name="metrics",
+        description="metrics agent",
+        system_prompt="You are a test agent.",
+        provider=provider,
+        skip_init=True,
+    )
+    agent.kernel = kernel
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_turn_metrics_cover_streaming_and_tools(agent: Agent) -> None:
+    records: List[MetricsRecord] = []
+    agent.add_metrics_listener(records.append)
+
+    async for _ in agent.chat("what is a?"):
+        pass
+
+    assert len(records) == 1
+    metrics = records[0]
+    assert isinstance(metrics, TurnMetrics)
+    assert metrics is agent.last_turn_metrics
+    assert metrics.turn == 1 and metrics.error is None
+    assert metrics.model_calls == 2
+    assert metrics.chunks == 5
+    assert metrics.time_to_first_chunk >= TOKEN_DELAY
+    assert metrics.max_chunk_gap >= TOKEN_DELAY
+    assert [t.name for t in metrics.tools] == ["slow_lookup"]
+    assert metrics.tools[0].duration >= TOOL_DELAY
+    assert metrics.tool_time >= TOOL_DELAY
+    # Provider-reported usage wins over the character estimate
+    assert not metrics.tokens_estimated
+    assert (metrics.prompt_tokens, metrics.completion_tokens) == (120, 4)
+    assert metrics.tokens_per_second > 0
+    assert metrics.duration >= metrics.tool_time
+
+
+@pytest.mark.asyncio
+async def test_trace_file_records_startup_and_turns(
+    agent: Agent, tmp_path: Path
+) -> None:
+    agent.startup_metrics.config_load = 0.25
+    agent.startup_metrics.plugin_load = {"@local/slow": 0.5}
+    trace_path = tmp_path / "trace.jsonl"
+    trace = attach_trace(agent, trace_path)
+
+    for message in ("one", "two"):
+        async for _ in agent.chat(message):
+            pass
+    trace.close()
+
+    records = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    assert [r["event"] for r in records] == ["startup", "turn", "turn"]
+    assert records[0]["plugin_load"] == {"@local/slow": 0.5}
+    assert [r["turn"] for r in records[1:]] == [1, 2]
+    # The fixture loops, so the second turn replays the tool call again
+    assert records[2]["tools"][0]["name"] == "slow_lookup"
+
+
+def test_turn_recorder_reads_request_timings_from_each_stream() -> None:
+    recorder = TurnRecorder("timed", 1)
+    for build in (0.25, 0.5):
+        recorder.start_request()
+        first = StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            content="hi",
+            choice_index=0,
+            metadata={REQUEST_TIMINGS_KEY: {"request_build": build}},
+        )
+        recorder.chunk(first)
+        recorder.chunk(
+            StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, content="!", choice_index=0
+            )
+        )
+        recorder.end_request()
+
+    metrics = recorder.finish()
+    assert metrics.model_calls == 2
+    assert metrics.request_build == 0.75
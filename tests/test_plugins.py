@@ -1,17 +1,23 @@
 """Tests for the plugin manager."""
 
+import json
 import os
+import time
 from pathlib import Path
 from typing import Any, Dict
 from unittest.mock import MagicMock, patch
 
 import pytest
 import semantic_kernel as sk
+from semantic_kernel.functions import kernel_function
 
+from agent_runtime.plugins.fetch import FetchError, PluginFetcher
 from agent_runtime.plugins.manager import (
+    FileDigestCache,
     PluginConfig,
     PluginManager,
     PluginNotFoundError,
+    ToolSchemaCache,
 )
 
 
@@ -272,3 +278,285 @@ def test_load_nonexistent_plugin(plugin_manager: PluginManager) -> None:
     """Test loading a nonexistent plugin."""
     with pytest.raises(PluginNotFoundError, match="No configuration found for plugin"):
         plugin_manager.load_plugin("nonexistent-plugin")
+
+
+class GreeterPlugin:
+    """Small plugin used to exercise tool schema generation."""
+
+    @kernel_function(description="Greet someone by name", name="greet")
+    def greet(self, name: str) -> str:
+        return f"Hello, {name}!"
+
+
+def test_tool_schema_cache_builds_once_per_kernel() -> None:
+    """Tool schemas are reused until the kernel's plugins change."""
+    cache = ToolSchemaCache()
+    kernel = sk.Kernel()
+    kernel.add_plugin(GreeterPlugin(), plugin_name="local_greeter")
+
+    first = cache.get(kernel)
+    for _ in range(5):
+        assert cache.get(kernel) is first
+    assert cache.builds == 1
+    assert cache.hits == 5
+    assert [f["name"] for f in first["functions"]] == ["local_greeter_greet"]
+
+    # Adding a plugin invalidates the cached schemas
+    kernel.add_plugin(GreeterPlugin(), plugin_name="local_other")
+    second = cache.get(kernel)
+    assert cache.builds == 2
+    assert len(second["functions"]) == 2
+
+    # Each kernel has its own entry
+    cache.get(sk.Kernel())
+    assert cache.builds == 3
+
+
+SLOW_PLUGIN_SOURCE = """
+import asyncio
+import os
+import time
+
+from semantic_kernel.functions import kernel_function
+
+
+class {name}:
+    def __init__(self):
+        start = time.perf_counter()
+        time.sleep(0.3)
+        self.label = os.environ.get("AGENT_VAR_LABEL")
+        self.ready = False
+        self.created = (start, time.perf_counter())
+
+    async def setup(self):
+        start = time.perf_counter()
+        await asyncio.sleep(0.2)
+        self.ready = True
+        self.set_up = (start, time.perf_counter())
+
+    @kernel_function(description="Say hello", name="hello")
+    def hello(self) -> str:
+        return "hello"
+"""
+
+
+def _write_slow_plugins(base_dir: Path, names: list) -> list:
+    configs = []
+    for name in names:
+        plugin_dir = base_dir / "local_plugins" / name.lower()
+        plugin_dir.mkdir(parents=True)
+        (plugin_dir / "__init__.py").write_text(SLOW_PLUGIN_SOURCE.format(name=name))
+        configs.append(
+            PluginConfig(
+                plugin_type="local",
+                name=name.lower(),
+                source=f"./local_plugins/{name.lower()}",
+                variables={"label": name},
+            )
+        )
+    return configs
+
+
+@pytest.mark.asyncio
+async def test_load_plugins_concurrently(tmp_path: Path) -> None:
+    """Plugins are created and set up side by side, then registered in order."""
+    configs = _write_slow_plugins(tmp_path, ["SlowToolC", "SlowToolA", "SlowToolB"])
+    for cfg in configs:
+        cfg.variables = {}
+    pm = PluginManager(tmp_path, sk.Kernel())
+
+    load_times = await pm.load_plugins(configs)
+
+    assert set(load_times) == {cfg.scoped_name for cfg in configs}
+    assert all(t >= 0.5 for t in load_times.values())
+    assert list(pm.kernel.plugins) == [cfg.kernel_name for cfg in configs]
+    assert pm.plugin_classes["@local/slowtoola"] == "SlowToolA"
+    instances = [
+        plugin.functions["hello"].method.__self__
+        for plugin in pm.kernel.plugins.values()
+    ]
+    assert all(instance.ready for instance in instances)
+    # Every constructor, and every setup hook, was running at the same time
+    for step in ("created", "set_up"):
+        spans = [getattr(instance, step) for instance in instances]
+        assert max(start for start, _ in spans) < min(end for _, end in spans)
+
+
+@pytest.mark.asyncio
+async def test_load_plugins_with_conflicting_variables_one_at_a_time(
+    tmp_path: Path,
+) -> None:
+    """Each plugin still sees its own value of a variable they share."""
+    configs = _write_slow_plugins(tmp_path, ["LabelToolA", "LabelToolB"])
+    pm = PluginManager(tmp_path, sk.Kernel())
+
+    await pm.load_plugins(configs)
+
+    for cfg, name in zip(configs, ["LabelToolA", "LabelToolB"]):
+        instance = pm.kernel.plugins[cfg.kernel_name].functions["hello"].method
+        assert instance.__self__.label == name
+
+
+def test_load_plugin_runs_async_setup(tmp_path: Path) -> None:
+    """The synchronous loader also runs async setup hooks."""
+    (cfg,) = _write_slow_plugins(tmp_path, ["SetupTool"])
+    pm = PluginManager(tmp_path, sk.Kernel())
+    pm.plugin_configs[cfg.scoped_name] = cfg
+
+    plugin = pm.load_plugin(cfg.scoped_name)
+    assert plugin.functions["hello"].method.__self__.ready
+
+
+def _age(directory: Path) -> None:
+    """Date every file back so its digest may be cached."""
+    old = time.time_ns() - 60_000_000_000
+    for path in directory.rglob("*"):
+        os.utime(path, ns=(old, old))
+
+
+def test_directory_digest_only_rereads_changed_files(tmp_path: Path) -> None:
+    plugin_dir = tmp_path / "vendored"
+    (plugin_dir / "pkg" / "__pycache__").mkdir(parents=True)
+    for i in range(20):
+        (plugin_dir / "pkg" / f"mod{i}.py").write_text(f"VALUE = {i}\n")
+    (plugin_dir / "README.md").write_text("docs")
+    (plugin_dir / "pkg" / "__pycache__" / "mod0.pyc").write_bytes(b"ignored")
+    (plugin_dir / "data.bin").write_bytes(b"ignored")
+    _age(plugin_dir)
+
+    cache_path = tmp_path / ".cache" / "file_digests.json"
+    cache = FileDigestCache(cache_path)
+    digest = cache.digest(plugin_dir)
+    assert cache.reads == 21
+
+    # A new process reuses the digests saved by the last one
+    cache = FileDigestCache(cache_path)
+    assert cache.digest(plugin_dir) == digest
+    assert (cache.reads, cache.hits) == (0, 21)
+
+    # Untracked files do not count
+    (plugin_dir / "data.bin").write_bytes(b"changed")
+    assert cache.digest(plugin_dir) == digest
+
+    (plugin_dir / "pkg" / "mod3.py").write_text("VALUE = 33\n")
+    changed = cache.digest(plugin_dir)
+    assert changed != digest
+    assert cache.reads == 1
+    # Recently written files are hashed again until they are old enough
+    assert cache.digest(plugin_dir) == changed
+    assert cache.reads == 2
+
+    (plugin_dir / "pkg" / "mod3.py").write_text("VALUE = 3\n")
+    _age(plugin_dir)
+    assert cache.digest(plugin_dir) == digest
+
+
+def test_directory_digest_depends_on_names_and_layout(tmp_path: Path) -> None:
+    first = tmp_path / "first"
+    (first / "a").mkdir(parents=True)
+    (first / "a" / "x.py").write_text("x")
+    second = tmp_path / "second"
+    second.mkdir()
+    (second / "a.x.py").write_text("x")
+    third = tmp_path / "third"
+    (third / "b").mkdir(parents=True)
+    (third / "b" / "x.py").write_text("x")
+
+    cache = FileDigestCache()
+    digests = {cache.digest(d) for d in (first, second, third)}
+    assert len(digests) == 3
+
+    # Removing a file makes its cache entry go away
+    cache = FileDigestCache()
+    _age(first)
+    cache.digest(first)
+    (first / "a" / "x.py").unlink()
+    cache.digest(first)
+    assert cache._files == {}
+
+
+def _remote_configs(count: int) -> list:
+    return [
+        PluginConfig(
+            plugin_type="remote",
+            name=f"tool{i}",
+            source=f"github.com/example/tool{i}",
+            version="1.0.0",
+        )
+        for i in range(count)
+    ]
+
+
+@patch(
+    "agent_runtime.plugins.manager.PluginConfig.get_github_commit_sha",
+    return_value="abc123",
+)
+def test_install_plugins_in_parallel_and_keep_lock_of_failures(
+    mock_sha: MagicMock, tmp_path: Path
+) -> None:
+    pm = PluginManager(tmp_path)
+    configs = _remote_configs(6)
+    lockfile = tmp_path / "plugins.lock.json"
+    old_entry = {"name": "tool5", "scoped_name": configs[5].scoped_name, "x": 1}
+    lockfile.write_text(json.dumps({"plugins": [old_entry]}))
+
+    def fake_clone(cfg: PluginConfig) -> None:
+        time.sleep(0.3)
+        if cfg.name == "tool5":
+            raise RuntimeError("Failed to clone plugin: no such ref")
+        version_dir = cfg.get_install_dir(pm.plugins_dir)
+        version_dir.mkdir(parents=True)
+        (version_dir / "__init__.py").touch()
+
+    with patch.object(pm, "_clone_github_plugin", side_effect=fake_clone):
+        start = time.perf_counter()
+        with pytest.raises(RuntimeError, match="tool5"):
+            pm.install_and_load_plugins(configs, load=False, max_workers=6)
+        assert time.perf_counter() - start < 1.2
+
+    # The other plugins were installed and locked; the failed one kept its entry
+    lock = json.loads(lockfile.read_text())["plugins"]
+    assert [p["name"] for p in lock] == [f"tool{i}" for i in range(6)]
+    assert lock[5] == old_entry
+    assert all(p["commit_sha"] == "abc123" for p in lock[:5])
+    assert (configs[0].get_install_dir(pm.plugins_dir) / "__init__.py").exists()
+
+
+class _FakeFetcher(PluginFetcher):
+    name = "fake"
+
+    def __init__(self, refs: Dict[str, str]) -> None:
+        self.refs = refs
+
+    def fetch(self, source: Dict[str, str], refs: Any, dest: Path) -> str:
+        for ref in refs:
+            if ref in self.refs:
+                (dest / "__init__.py").write_text(self.refs[ref])
+                self.bytes_downloaded = 100
+                return ref
+        raise FetchError(f"no ref {list(refs)}")
+
+
+def test_failed_update_keeps_previous_install(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("AGENT_PLUGIN_STORE", "none")
+    pm = PluginManager(tmp_path, fetcher=_FakeFetcher({"1.0.0": "NEW = True\n"}))
+    cfg = _remote_configs(1)[0]
+    version_dir = cfg.get_install_dir(pm.plugins_dir)
+    version_dir.mkdir(parents=True)
+    (version_dir / "__init__.py").write_text("OLD = True\n")
+
+    pm.fetcher.refs = {}
+    with pytest.raises(RuntimeError, match="no ref"):
+        pm._clone_github_plugin(cfg)
+    assert (version_dir / "__init__.py").read_text() == "OLD = True\n"
+    assert sorted(p.name for p in version_dir.parent.iterdir()) == ["1.0.0"]
+
+    # The plain version is tried after the 'v'-prefixed tag
+    pm.fetcher.refs = {"1.0.0": "NEW = True\n"}
+    pm._clone_github_plugin(cfg)
+    assert (version_dir / "__init__.py").read_text() == "NEW = True\n"
+    assert sorted(p.name for p in version_dir.parent.iterdir()) == ["1.0.0"]
+    stats = pm.install_stats[cfg.scoped_name]
+    assert (stats.method, stats.bytes_downloaded) == ("fake", 100)
@@ -0,0 +1,123 @@
+"""Tests for a stable prompt prefix and prompt cache metrics."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.plugins.manager import build_openai_functions
+from agent_runtime.prompt import canonical_json, prefix_hash
+from agent_runtime.providers.base import ProviderConfig, ProviderType
+from agent_runtime.providers.replay import ReplayProvider
+
+SYSTEM_PROMPT = "You are a test agent."
+
+# Builds the same tools as _kernel() in a fresh interpreter
+HASH_SCRIPT = """
+import sys
+from tests.test_prompt import SYSTEM_PROMPT, _kernel
+from agent_runtime.plugins.manager import build_openai_functions
+from agent_runtime.prompt import prefix_hash
+order = sys.argv[1].split(",")
+print(prefix_hash(SYSTEM_PROMPT, build_openai_functions(_kernel(order))))
+"""
+
+
+class WeatherPlugin:
+    @kernel_function(description="Forecast for a city", name="forecast")
+    def forecast(self, city: str, days: int = 3) -> str:
+        return f"{city}: sunny for {days} days"
+
+    @kernel_function(description="Current temperature", name="current")
+    def current(self, city: str) -> str:
+        return f"{city}: 20C"
+
+
+class NotesPlugin:
+    @kernel_function(description="Save a note", name="save")
+    def save(self, text: str) -> str:
+        return "saved"
+
+
+PLUGINS = {"weather": WeatherPlugin, "notes": NotesPlugin}
+
+
+def _kernel(order: list) -> Kernel:
+    kernel = Kernel()
+    for name in order:
+        kernel.add_plugin(PLUGINS[name](), plugin_name=name)
+    return kernel
+
+
+def test_tool_list_does_not_depend_on_plugin_order() -> None:
+    first = build_openai_functions(_kernel(["weather", "notes"]))
+    second = build_openai_functions(_kernel(["notes", "weather"]))
+    assert canonical_json(first) == canonical_json(second)
+    assert [f["name"] for f in first["functions"]] == [
+        "notes_save",
+        "weather_current",
+        "weather_forecast",
+    ]
+
+
+def test_prefix_hash_is_stable_across_processes() -> None:
+    expected = prefix_hash(
+        SYSTEM_PROMPT, build_openai_functions(_kernel(["weather", "notes"]))
+    )
+    root = Path(__file__).parent.parent
+    # Different hash seed and plugin load order
+    env = dict(os.environ, PYTHONHASHSEED="1", PYTHONPATH=str(root))
+    result = subprocess.run(
+        [sys.executable, "-c", HASH_SCRIPT, "notes,weather"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=root,
+        env=env,
+    )
+    assert result.stdout.strip() == expected
+
+    # Anything that changes the prefix changes the hash
+    tools = build_openai_functions(_kernel(["weather"]))
+    assert prefix_hash(SYSTEM_PROMPT, tools) != expected
+    assert prefix_hash(SYSTEM_PROMPT + " ", tools) != prefix_hash(SYSTEM_PROMPT, tools)
+
+
+@pytest.mark.asyncio
+async def test_turn_metrics_report_cached_tokens(tmp_path: Path) -> None:
+    fixture = tmp_path / "turns.jsonl"
+    usage = {"prompt_tokens": 2000, "completion_tokens": 3}
+    turns = [
+        [{"content": "First."}, {"usage": usage}],
+        [{"content": "Second."}, {"usage": usage, "cached_tokens": 1536}],
+    ]
+    fixture.write_text("".join(json.dumps({"chunks": t}) + "\n" for t in turns))
+    agent = Agent(
+        name="cached",
+        description="cached agent",
+        system_prompt=SYSTEM_PROMPT,
+        provider=ReplayProvider(
+            ProviderConfig(name=ProviderType.REPLAY, settings={"fixture": str(fixture)})
+        ),
+        skip_init=True,
+    )
+    agent.kernel = _kernel(["weather", "notes"])
+
+    async for _ in agent.chat("one"):
+        pass
+    first = agent.last_turn_metrics
+    async for _ in agent.chat("two"):
+        pass
+    second = agent.last_turn_metrics
+
+    assert first.cached_tokens is None and first.cached_token_ratio is None
+    assert second.cached_tokens == 1536
+    assert second.cached_token_ratio == pytest.approx(0.768)
+    # Both turns sent the same prefix
+    assert first.prefix_hash == second.prefix_hash == agent.prefix_hash()
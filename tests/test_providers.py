@@ -0,0 +1,408 @@
+"""Tests for the model providers."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import semantic_kernel as sk
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.plugins.manager import get_tool_schema_cache
+from agent_runtime.providers.base import (
+    REQUEST_TIMINGS_KEY,
+    ProviderConfig,
+    ProviderType,
+)
+from agent_runtime.providers.cache import CacheConfig, CachingProvider, ResponseCache
+from agent_runtime.providers.ollama import OllamaProvider
+from agent_runtime.providers.openai import OpenAIProvider
+from agent_runtime.providers.registry import get_provider
+from agent_runtime.providers.replay import (
+    ReplayProvider,
+    chunk_from_dict,
+    chunk_to_dict,
+)
+
+
+class GreeterPlugin:
+    """Small plugin with one kernel function."""
+
+    @kernel_function(description="Greet someone by name", name="greet")
+    def greet(self, name: str) -> str:
+        return f"Hello, {name}!"
+
+
+@pytest.fixture
+def openai_provider() -> OpenAIProvider:
+    """Create an OpenAI provider whose client streams a canned reply."""
+    with patch("agent_runtime.providers.openai.OpenAIChatCompletion"):
+        provider = OpenAIProvider(
+            ProviderConfig(name=ProviderType.OPENAI, model="gpt-4o", settings={})
+        )
+
+    async def fake_stream(chat_history, settings, kernel):
+        yield StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT, content="hi", choice_index=0
+        )
+
+    provider.client.get_streaming_chat_message_content = fake_stream
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_openai_tool_schemas_are_not_rebuilt_per_turn(
+    openai_provider: OpenAIProvider,
+) -> None:
+    kernel = sk.Kernel()
+    kernel.add_plugin(GreeterPlugin(), plugin_name="local_greeter")
+    cache = get_tool_schema_cache()
+    builds_before = cache.builds
+
+    history = ChatHistory()
+    for turn in range(10):
+        history.add_user_message(f"turn {turn}")
+        chunks = [chunk async for chunk in openai_provider.chat(history, kernel)]
+        assert "tool_schemas" in chunks[0].metadata[REQUEST_TIMINGS_KEY]
+
+    assert cache.builds - builds_before == 1
+
+
+@pytest_asyncio.fixture
+async def ollama_server():
+    """Run a local stand-in for the Ollama HTTP API."""
+    stats = {"version_calls": 0, "connections": set()}
+
+    async def version(request: web.Request) -> web.Response:
+        stats["version_calls"] += 1
+        return web.json_response({"version": "0.5.0"})
+
+    async def chat(request: web.Request) -> web.StreamResponse:
+        stats["connections"].add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for word in ["Hello", " from", f" {body['model']}"]:
+            line = json.dumps({"message": {"role": "assistant", "content": word}})
+            await response.write(line.encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/api/version", version)
+    app.router.add_post("/api/chat", chat)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, stats
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_ollama_reuses_pooled_session(ollama_server) -> None:
+    server, stats = ollama_server
+    provider = OllamaProvider(
+        ProviderConfig(
+            name=ProviderType.OLLAMA,
+            model="llama3",
+            settings={"base_url": str(server.make_url("")).rstrip("/")},
+        )
+    )
+    try:
+        history = ChatHistory()
+        history.add_user_message("hi")
+        for _ in range(5):
+            chunks = [chunk.content async for chunk in provider.chat(history)]
+            assert "".join(chunks) == "Hello from llama3"
+    finally:
+        await provider.aclose()
+
+    # One keep-alive connection served every turn, and the health check was cached
+    assert len(stats["connections"]) == 1
+    assert stats["version_calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ollama_closes_session_from_previous_loop(ollama_server) -> None:
+    server, stats = ollama_server
+    provider = OllamaProvider(
+        ProviderConfig(
+            name=ProviderType.OLLAMA,
+            settings={"base_url": str(server.make_url("")).rstrip("/")},
+        )
+    )
+    # A CLI call runs on its own short-lived loop
+    await asyncio.to_thread(asyncio.run, provider.check_health())
+    stale = provider._session
+    try:
+        assert await provider.check_health(force=True) == "0.5.0"
+        assert stale.closed
+        assert provider._session is not stale
+    finally:
+        await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_ollama_health_check_reports_unreachable_server() -> None:
+    provider = OllamaProvider(
+        ProviderConfig(
+            name=ProviderType.OLLAMA,
+            settings={"base_url": "http://127.0.0.1:9", "health_check_timeout": 0.5},
+        )
+    )
+    try:
+        with pytest.raises(RuntimeError, match="Ollama server not running"):
+            await provider.check_health()
+    finally:
+        await provider.aclose()
+
+
+class ScriptedProvider:
+    """Stand-in for a real provider: one tool call, then a final answer."""
+
+    async def chat(self, history, kernel=None):
+        if history.messages[-1].role == AuthorRole.USER:
+            call = FunctionCallContent(
+                id="call_1", index=0, name="greeter_greet", arguments='{"name": "Ada"}'
+            )
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, items=[call], choice_index=0
+            )
+            return
+        for word in ("The ", "tool ", "said: ", history.messages[-1].items[0].result):
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, content=word, choice_index=0
+            )
+
+    async def aclose(self):
+        return None
+
+
+def _replay_agent(provider: ReplayProvider) -> Agent:
+    kernel = sk.Kernel()
+    kernel.add_plugin(GreeterPlugin(), plugin_name="greeter")
+    agent = Agent(
+        name="replay",
+        description="replay agent",
+        system_prompt="You are a test agent.",
+        provider=provider,
+        skip_init=True,
+    )
+    agent.kernel = kernel
+    return agent
+
+
+async def _reply(agent: Agent, message: str) -> str:
+    return "".join([c.content async for c in agent.chat(message) if c.content])
+
+
+@pytest.mark.asyncio
+async def test_replay_provider_round_trips_recorded_session(tmp_path: Path) -> None:
+    settings = {"fixture": "fixtures/session.jsonl"}
+    config = ProviderConfig(name=ProviderType.REPLAY, model="gpt-4o", settings=settings)
+
+    recording = ReplayProvider(config, base_dir=tmp_path)
+    recording.recorder = ScriptedProvider()
+    recorded = await _reply(_replay_agent(recording), "greet Ada")
+    assert recorded == "The tool said: Hello, Ada!"
+
+    fixture = tmp_path / "fixtures" / "session.jsonl"
+    lines = [json.loads(line) for line in fixture.read_text().splitlines()]
+    assert [len(line["chunks"]) for line in lines] == [1, 4]
+    assert lines[0]["chunks"][0]["tool_calls"][0]["name"] == "greeter_greet"
+
+    replay = get_provider(config)
+    assert isinstance(replay, ReplayProvider)
+    replay.fixture_path = fixture
+    agent = _replay_agent(replay)
+    assert await _reply(agent, "greet Ada") == recorded
+    # The recorded tool call was dispatched again against the live kernel
+    assert agent.history.messages[3].role == AuthorRole.TOOL
+
+
+@pytest.mark.asyncio
+async def test_replay_provider_applies_token_delay(tmp_path: Path) -> None:
+    fixture = tmp_path / "turns.jsonl"
+    chunks = [{"content": f"t{i} "} for i in range(5)]
+    fixture.write_text(json.dumps({"version": 1, "chunks": chunks}) + "\n")
+    provider = ReplayProvider(
+        ProviderConfig(
+            name=ProviderType.REPLAY,
+            settings={"fixture": str(fixture), "token_delay": 0.02, "loop": False},
+        )
+    )
+    history = ChatHistory()
+    history.add_user_message("hi")
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    text = "".join([c.content async for c in provider.chat(history)])
+    assert text == "t0 t1 t2 t3 t4 "
+    assert loop.time() - start >= 0.1
+
+    with pytest.raises(RuntimeError, match="exhausted"):
+        async for _ in provider.chat(history):
+            pass
+
+
+def test_replay_chunk_keeps_text_next_to_tool_calls() -> None:
+    data = {
+        "content": "Let me check.",
+        "tool_calls": [
+            {"id": "call_1", "index": 0, "name": "greeter_greet", "arguments": "{}"}
+        ],
+    }
+    chunk = chunk_from_dict(data)
+    assert chunk.content == "Let me check."
+    assert [item.name for item in chunk.items if hasattr(item, "arguments")] == [
+        "greeter_greet"
+    ]
+    assert chunk_to_dict(chunk) == data
+
+
+@pytest.mark.asyncio
+async def test_replay_provider_keeps_a_position_per_conversation(
+    tmp_path: Path,
+) -> None:
+    fixture = tmp_path / "turns.jsonl"
+    fixture.write_text(
+        "".join(
+            json.dumps({"version": 1, "chunks": [{"content": f"turn {i}"}]}) + "\n"
+            for i in range(2)
+        )
+    )
+    provider = ReplayProvider(
+        ProviderConfig(name=ProviderType.REPLAY, settings={"fixture": str(fixture)})
+    )
+    first, second = ChatHistory(), ChatHistory()
+
+    # Interleaved conversations each start at the first recorded turn
+    assert await _text(provider, first) == "turn 0"
+    assert await _text(provider, second) == "turn 0"
+    assert await _text(provider, second) == "turn 1"
+    assert await _text(provider, first) == "turn 1"
+    assert await _text(provider, first) == "turn 0"
+
+
+class CountingProvider:
+    """Provider that numbers its responses so cache hits are visible."""
+
+    model = "counting"
+    settings = {"temperature": 0.0}
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def chat(self, history, kernel=None):
+        self.calls += 1
+        for word in ("reply ", str(self.calls)):
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, content=word, choice_index=0
+            )
+
+
+def _history(message: str) -> ChatHistory:
+    history = ChatHistory()
+    history.add_system_message("You are a test agent.")
+    history.add_user_message(message)
+    return history
+
+
+async def _text(provider, history: ChatHistory) -> str:
+    return "".join([c.content async for c in provider.chat(history)])
+
+
+@pytest.mark.asyncio
+async def test_caching_provider_replays_identical_requests(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(CacheConfig(), tmp_path))
+
+    assert await _text(provider, _history("hi")) == "reply 1"
+    assert await _text(provider, _history("hi")) == "reply 1"
+    assert await _text(provider, _history("bye")) == "reply 2"
+    assert inner.calls == 2
+    assert (provider.cache.hits, provider.cache.misses) == (1, 2)
+    assert provider.model == "counting"
+
+    # A fresh process finds the response in the disk tier
+    cold = CachingProvider(CountingProvider(), ResponseCache(CacheConfig(), tmp_path))
+    assert await _text(cold, _history("hi")) == "reply 1"
+    assert cold.provider.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_caching_provider_does_disk_io_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ResponseCache(CacheConfig(max_entries=1), tmp_path)
+    threads = []
+    for name in ("_read_disk", "_write_disk"):
+        method = getattr(cache, name)
+
+        def traced(*args, method=method):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        monkeypatch.setattr(cache, name, traced)
+    provider = CachingProvider(CountingProvider(), cache)
+
+    assert await _text(provider, _history("hi")) == "reply 1"
+    # Pushed out of the memory tier, so the hit is read from disk
+    assert await _text(provider, _history("bye")) == "reply 2"
+    assert await _text(provider, _history("hi")) == "reply 1"
+    assert len(threads) == 5
+    assert threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_response_cache_ttl_and_size_eviction(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ResponseCache(CacheConfig(ttl=60), tmp_path)
+    cache.put("a" * 64, [{"content": "old"}])
+
+    clock = time.time() + 61
+    monkeypatch.setattr("agent_runtime.providers.cache.time.time", lambda: clock)
+    assert cache.get("a" * 64) is None
+    assert not list(tmp_path.glob("*/*.json"))
+    monkeypatch.undo()
+
+    # Room for roughly two entries: the least recently used one goes first
+    cache = ResponseCache(CacheConfig(max_size_mb=2500 / (1024 * 1024)), tmp_path)
+    big = [{"content": "x" * 1000}]
+    cache.put("b" * 64, big)
+    cache.put("c" * 64, big)
+    os.utime(tmp_path / "bb" / f"{'b' * 64}.json", (0, 0))
+    cache.put("d" * 64, big)
+    remaining = sorted(p.stem[0] for p in tmp_path.glob("*/*.json"))
+    assert remaining == ["c", "d"]
+
+
+def test_agent_model_cache_block_wraps_provider(tmp_path: Path) -> None:
+    config = {
+        "name": "cached",
+        "system_prompt": "You are a test agent.",
+        "model": {
+            "provider": "replay",
+            "name": "gpt-4o",
+            "settings": [{"fixture": "turns.jsonl"}],
+            "cache": [{"ttl": 60, "max_entries": 8}],
+        },
+    }
+    agent = Agent.from_config(config, base_dir=tmp_path, skip_init=True)
+    assert isinstance(agent.provider, CachingProvider)
+    assert agent.provider.cache.config.max_entries == 8
+    assert agent.provider.cache.directory == tmp_path / ".cache" / "responses"
@@ -0,0 +1,134 @@
+"""Tests for hosting several agents in one runtime."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from agent_runtime.core import build_runtime
+
+PLUGIN_SOURCE = """
+import asyncio
+
+from semantic_kernel.functions import kernel_function
+
+
+class {name}:
+    stateless = {stateless}
+
+    def __init__(self):
+        self.calls = 0
+        self.loop = None
+
+    async def setup(self):
+        self.loop = asyncio.get_running_loop()
+
+    @kernel_function(description="Count calls", name="count")
+    def count(self) -> str:
+        self.calls += 1
+        return str(self.calls)
+"""
+
+CONFIG = """
+runtime {
+  required_version = "0.0.1"
+}
+
+model "llama" {
+  provider = "ollama"
+  name     = "llama3"
+}
+
+model "mistral" {
+  provider = "ollama"
+  name     = "mistral"
+}
+
+plugin "local" "shared" {
+  source = "./local_plugins/runtime_shared_tool"
+}
+
+plugin "local" "private" {
+  source = "./local_plugins/runtime_private_tool"
+}
+
+agent "first" {
+  name          = "first"
+  description   = "First agent"
+  system_prompt = "You are first."
+  model         = model.llama
+  plugins       = [plugin.local.shared, plugin.local.private]
+}
+
+agent "second" {
+  name          = "second"
+  description   = "Second agent"
+  system_prompt = "You are second."
+  model         = model.llama
+  plugins       = [plugin.local.shared, plugin.local.private]
+}
+
+agent "third" {
+  name          = "third"
+  description   = "Third agent"
+  system_prompt = "You are third."
+  model         = model.mistral
+  plugins       = [plugin.local.shared]
+}
+"""
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    for module, name, stateless in (
+        ("runtime_shared_tool", "SharedTool", True),
+        ("runtime_private_tool", "PrivateTool", False),
+    ):
+        plugin_dir = tmp_path / "local_plugins" / module
+        plugin_dir.mkdir(parents=True)
+        (plugin_dir / "__init__.py").write_text(
+            PLUGIN_SOURCE.format(name=name, stateless=stateless)
+        )
+    (tmp_path / "config.hcl").write_text(CONFIG)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_agents_share_providers_and_stateless_plugins(config_dir: Path) -> None:
+    runtime = await build_runtime(config_dir)
+    first, second, third = (runtime.agents[n] for n in ("first", "second", "third"))
+
+    # One provider per distinct model block
+    assert len(runtime.providers) == 2
+    assert first.provider is second.provider
+    assert third.provider is not first.provider
+
+    # Stateless plugins are shared, others are per agent
+    shared = first.kernel.plugins["local_shared"]
+    assert second.kernel.plugins["local_shared"] is shared
+    assert third.kernel.plugins["local_shared"] is shared
+    assert (
+        first.kernel.plugins["local_private"]
+        is not second.kernel.plugins["local_private"]
+    )
+
+    # Setup hooks ran on the loop the agents serve on
+    private = first.kernel.plugins["local_private"].functions["count"].method
+    assert private.__self__.loop is asyncio.get_running_loop()
+
+    # Histories stay separate
+    first.history.add_user_message("only for first")
+    assert len(second.history.messages) == 1
+
+    # Agents leave the shared providers for the runtime to close, once each
+    closed = []
+    for provider in runtime.providers.values():
+        provider.aclose = lambda provider=provider: _record(closed, provider)
+    await first.aclose()
+    assert closed == []
+    await runtime.aclose()
+    assert len(closed) == 2 and not runtime.agents
+
+
+async def _record(closed: list, provider: object) -> None:
+    closed.append(provider)
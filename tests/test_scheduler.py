@@ -0,0 +1,171 @@
+"""Tests for the shared provider request scheduler."""
+
+import asyncio
+import email.utils
+import time
+from typing import AsyncIterator, List
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict
+from yarl import URL
+
+from agent_runtime.providers.scheduler import (
+    RequestScheduler,
+    SchedulerConfig,
+    TokenBucket,
+    classify_error,
+    parse_retry_after,
+)
+
+
+def _http_error(status: int, retry_after: str = None) -> aiohttp.ClientResponseError:
+    headers = CIMultiDict({"Retry-After": retry_after} if retry_after else {})
+    url = URL("http://model.test/v1/chat")
+    request_info = aiohttp.RequestInfo(url, "POST", CIMultiDict(), url)
+    return aiohttp.ClientResponseError(
+        request_info=request_info, history=(), status=status, headers=headers
+    )
+
+
+class FlakyRequest:
+    """Request factory that fails a few times before streaming."""
+
+    def __init__(self, failures: List[Exception], items=("a", "b")) -> None:
+        self.failures = list(failures)
+        self.items = items
+        self.attempts = 0
+
+    async def __call__(self) -> AsyncIterator[str]:
+        self.attempts += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        for item in self.items:
+            yield item
+
+
+def _scheduler(**kwargs) -> RequestScheduler:
+    return RequestScheduler(SchedulerConfig(base_delay=0.01, **kwargs))
+
+
+async def _collect(scheduler: RequestScheduler, request) -> List[str]:
+    return [item async for item in scheduler.stream("test:model", request)]
+
+
+@pytest.mark.asyncio
+async def test_retries_rate_limits_honoring_retry_after() -> None:
+    scheduler = _scheduler()
+    request = FlakyRequest([_http_error(429, "0.05"), _http_error(503)])
+
+    start = time.perf_counter()
+    assert await _collect(scheduler, request) == ["a", "b"]
+    assert request.attempts == 3
+    assert scheduler.retries == 2
+    assert time.perf_counter() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors_or_exhausted_budget() -> None:
+    request = FlakyRequest([_http_error(400)])
+    with pytest.raises(aiohttp.ClientResponseError):
+        await _collect(_scheduler(), request)
+    assert request.attempts == 1
+
+    request = FlakyRequest([_http_error(500)] * 3)
+    with pytest.raises(aiohttp.ClientResponseError):
+        await _collect(_scheduler(max_retries=2), request)
+    assert request.attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_after_output_was_streamed() -> None:
+    attempts = 0
+
+    async def request() -> AsyncIterator[str]:
+        nonlocal attempts
+        attempts += 1
+        yield "partial"
+        raise _http_error(503)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await _collect(_scheduler(), request)
+    assert attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_cap() -> None:
+    scheduler = _scheduler(max_concurrent_requests=2)
+    active = 0
+    peak = 0
+
+    async def request() -> AsyncIterator[str]:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        yield "done"
+
+    await asyncio.gather(*(_collect(scheduler, request) for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill() -> None:
+    bucket = TokenBucket(per_minute=600)  # 10 per second
+    await bucket.acquire(600)
+
+    start = time.perf_counter()
+    await bucket.acquire(1)
+    assert time.perf_counter() - start >= 0.08
+
+    # Tokens charged after the fact put the bucket into debt
+    bucket.charge(5)
+    assert bucket.tokens < 0
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_hold_a_concurrency_slot() -> None:
+    scheduler = _scheduler(max_concurrent_requests=1)
+    throttled = FlakyRequest([_http_error(429, "0.3")], items=("late",))
+    finished: List[str] = []
+
+    async def run(key: str, request) -> None:
+        async for item in scheduler.stream(key, request):
+            finished.append(item)
+
+    # The other model's request runs while the throttled one waits to retry
+    await asyncio.gather(
+        run("slow:model", throttled),
+        run("other:model", FlakyRequest([], items=("early",))),
+    )
+    assert finished == ["early", "late"]
+
+
+def test_token_bucket_works_across_event_loops() -> None:
+    bucket = TokenBucket(per_minute=600)
+
+    async def contend() -> None:
+        bucket.tokens = 0
+        await asyncio.gather(bucket.acquire(0.1), bucket.acquire(0.1))
+
+    # Each CLI call runs on its own asyncio.run() loop
+    asyncio.run(contend())
+    asyncio.run(contend())
+
+
+def test_error_classification_follows_wrapped_errors() -> None:
+    try:
+        try:
+            raise _http_error(429, "2")
+        except aiohttp.ClientResponseError as inner:
+            raise RuntimeError("service failed") from inner
+    except RuntimeError as outer:
+        assert classify_error(outer) == (True, 2.0)
+
+    assert classify_error(aiohttp.ClientConnectionError()) == (True, None)
+    assert classify_error(ValueError("bad input")) == (False, None)
+
+    future = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= parse_retry_after(future) <= 30
+    assert parse_retry_after("nonsense") is None
@@ -170,7 +170,7 @@ def test_model_provider_options(validator, context):
     validator.validate_type(config, "model", context)
     assert context.has_errors
     assert any(
-        "Model provider must be either 'openai' or 'ollama'" in str(err)
+        "Model provider must be one of 'openai', 'ollama' or 'replay'" in str(err)
         for err in context.errors
     )
 
@@ -232,6 +232,76 @@ def test_agent_plugins_list_validation(validator, context):
     assert any("Expected type list" in str(err) for err in context.errors)
 
 
+def test_agent_history_block_validation(validator, context):
+    """Test validation of the agent history block."""
+    agent = {
+        "name": "Test Agent",
+        "description": "Test description",
+        "system_prompt": "Test prompt",
+        "model": "${model.gpt4}",
+        "history": [{"max_tokens": 8000, "keep_turns": 4, "strategy": "summarize"}],
+    }
+    validator.validate_type([{"test_agent": agent}], "agent", context)
+    assert not context.has_errors
+
+    context = ValidationContext()
+    agent["history"] = [{"strategy": "forget"}]
+    validator.validate_type([{"test_agent": agent}], "agent", context)
+    assert any(
+        "History strategy must be either 'window' or 'summarize'" in str(err)
+        for err in context.errors
+    )
+
+    context = ValidationContext()
+    agent["history"] = [{"max_tokens": 0}]
+    validator.validate_type([{"test_agent": agent}], "agent", context)
+    assert any(
+        "History max_tokens must be at least 1" in str(err) for err in context.errors
+    )
+
+
+def test_model_cache_block_validation(validator, context):
+    """Test validation of the model response cache block."""
+    model = {"provider": "openai", "name": "gpt-4", "cache": [{"ttl": 3600}]}
+    validator.validate_type([{"gpt4": model}], "model", context)
+    assert not context.has_errors
+
+    context = ValidationContext()
+    model["cache"] = [{"max_entries": 0}]
+    validator.validate_type([{"gpt4": model}], "model", context)
+    assert any(
+        "Cache max_entries must be at least 1" in str(err) for err in context.errors
+    )
+
+
+def test_replay_model_settings_validation(validator, context):
+    """Test validation of the replay provider settings."""
+    settings = {"fixture": "turns.jsonl", "loop": False, "mode": "replay"}
+    model = {"provider": "replay", "name": "gpt-4", "settings": [settings]}
+    validator.validate_type([{"replay": model}], "model", context)
+    assert not context.has_errors
+
+    context = ValidationContext()
+    settings["loop"] = "sometimes"
+    validator.validate_type([{"replay": model}], "model", context)
+    assert context.has_errors
+
+
+def test_ollama_model_settings_validation(validator, context):
+    """Test validation of the Ollama connection settings."""
+    settings = {"max_connections": 4, "health_check_timeout": 1.5}
+    model = {"provider": "ollama", "name": "llama3", "settings": [settings]}
+    validator.validate_type([{"local": model}], "model", context)
+    assert not context.has_errors
+
+    context = ValidationContext()
+    settings["health_check_timeout"] = -1
+    validator.validate_type([{"local": model}], "model", context)
+    assert any(
+        "Health check timeout cannot be negative" in str(err) for err in context.errors
+    )
+
+
 # Reference Validation Tests
 def test_invalid_reference_format(validator, context):
     """Test that invalid reference formats are caught."""
@@ -0,0 +1,220 @@
+"""Tests for the HTTP agent server, using the local echo plugin."""
+
+import json
+from pathlib import Path
+from typing import AsyncIterator, List, Tuple
+
+import pytest
+import pytest_asyncio
+from aiohttp.test_utils import TestClient, TestServer
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+
+from agent_runtime.agent import Agent
+from agent_runtime.plugins.manager import PluginConfig, PluginManager
+from agent_runtime.server import AgentServer
+
+PROJECT_DIR = Path(__file__).parent.parent / "project"
+
+
+class EchoToolProvider:
+    """Provider that asks the echo plugin to repeat each user message."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        self.requests += 1
+        last = history.messages[-1]
+        if last.role == AuthorRole.USER:
+            call = FunctionCallContent(
+                id=f"call_{self.requests}",
+                index=0,
+                name="local_echo_echo",
+                arguments=json.dumps({"input": last.content}),
+            )
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, items=[call], choice_index=0
+            )
+            return
+        for word in str(last.items[0].result).split(" "):
+            yield StreamingChatMessageContent(
+                role=AuthorRole.ASSISTANT, content=word + " ", choice_index=0
+            )
+
+
+def _echo_agent() -> Agent:
+    kernel = Kernel()
+    pm = PluginManager(PROJECT_DIR, kernel)
+    config = PluginConfig(
+        plugin_type="local", name="echo", source="./local_plugins/echo"
+    )
+    pm.plugin_configs[config.scoped_name] = config
+    pm.load_plugin(config.scoped_name)
+
+    agent = Agent(
+        name="echo",
+        description="echo agent",
+        system_prompt="Always return the exact function result.",
+        provider=EchoToolProvider(),
+        skip_init=True,
+    )
+    agent.kernel = kernel
+    return agent
+
+
+@pytest.fixture
+def server() -> AgentServer:
+    return AgentServer({"echo": _echo_agent()}, max_sessions=2)
+
+
+@pytest_asyncio.fixture
+async def client(server: AgentServer) -> AsyncIterator[TestClient]:
+    client = TestClient(TestServer(server.make_app()))
+    await client.start_server()
+    yield client
+    await client.close()
+
+
+async def _chat(
+    client: TestClient, message: str, session_id: str = None
+) -> Tuple[str, str]:
+    body = {"message": message}
+    if session_id:
+        body["session_id"] = session_id
+    response = await client.post("/agents/echo/chat", json=body)
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "text/event-stream"
+
+    events: List[Tuple[str, dict]] = []
+    for block in (await response.text()).strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: ") :], json.loads(data_line[6:])))
+
+    assert events[0][0] == "session" and events[-1][0] == "done"
+    assert "error" not in events[-1][1]
+    text = "".join(data["content"] for name, data in events if name == "chunk")
+    return events[0][1]["session_id"], text.strip()
+
+
+@pytest.mark.asyncio
+async def test_chat_streams_reply_through_echo_plugin(client: TestClient) -> None:
+    session_id, text = await _chat(client, "hello")
+    assert session_id
+    assert text == "hello (from local plugin)"
+
+
+@pytest.mark.asyncio
+async def test_sessions_keep_history_and_are_evicted_lru(
+    client: TestClient, server: AgentServer
+) -> None:
+    await _chat(client, "one", "a")
+    await _chat(client, "two", "a")
+    session = await server.sessions.get("echo", "a", server.agents["echo"])
+    user_messages = [
+        m.content for m in session.agent.history.messages if m.role == AuthorRole.USER
+    ]
+    assert user_messages == ["one", "two"]
+    # The warm agent itself never accumulates conversation state
+    assert len(server.agents["echo"].history.messages) == 1
+
+    await _chat(client, "x", "b")
+    await _chat(client, "y", "c")
+    assert ("echo", "a") not in server.sessions
+    assert len(server.sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_agent_and_bad_requests(client: TestClient) -> None:
+    response = await client.post("/agents/missing/chat", json={"message": "hi"})
+    assert response.status == 404
+
+    response = await client.post("/agents/echo/chat", json={"message": ""})
+    assert response.status == 400
+
+    response = await client.delete("/agents/echo/sessions/nope")
+    assert response.status == 404
+
+    response = await client.get("/health")
+    assert (await response.json())["agents"] == ["echo"]
+
+
+@pytest.mark.asyncio
+async def test_turn_limits_and_cancel_endpoint(client: TestClient) -> None:
+    response = await client.post(
+        "/agents/echo/chat",
+        json={"message": "a long echo", "session_id": "s", "max_output_tokens": 1},
+    )
+    body = await response.text()
+    done = json.loads(body.strip().split("\n\n")[-1].split("\n")[1][6:])
+    assert done["stop_reason"] == "max_output_tokens"
+    assert "[truncated: max_output_tokens]" in body
+
+    response = await client.post(
+        "/agents/echo/chat", json={"message": "hi", "timeout": -1}
+    )
+    assert response.status == 400
+
+    # Nothing is running in the session, and unknown sessions are 404
+    response = await client.post("/agents/echo/sessions/s/cancel")
+    assert (await response.json()) == {"cancelled": False}
+    response = await client.post("/agents/echo/sessions/nope/cancel")
+    assert response.status == 404
+
+
+@pytest.mark.asyncio
+async def test_chat_streams_tool_events(client: TestClient) -> None:
+    response = await client.post("/agents/echo/chat", json={"message": "hi"})
+    names = [
+        block.split("\n")[0][len("event: ") :]
+        for block in (await response.text()).strip().split("\n\n")
+    ]
+    assert names.index("tool_call_started") < names.index("tool_call_finished")
+    assert names.index("tool_call_finished") < names.index("chunk")
+
+
+@pytest.mark.asyncio
+async def test_persisted_sessions_survive_eviction(tmp_path: Path) -> None:
+    server = AgentServer({"echo": _echo_agent()}, max_sessions=1, session_dir=tmp_path)
+    client = TestClient(TestServer(server.make_app()))
+    await client.start_server()
+    try:
+        await _chat(client, "one", "a")
+        await _chat(client, "x", "b")
+        assert ("echo", "a") not in server.sessions
+
+        # Evicted from memory, but resumed from its log
+        await _chat(client, "two", "a")
+        session = server.sessions.find("echo", "a")
+        user_messages = [
+            m.content
+            for m in session.agent.history.messages
+            if m.role == AuthorRole.USER
+        ]
+        assert user_messages == ["one", "two"]
+
+        response = await client.delete("/agents/echo/sessions/a")
+        assert response.status == 200
+        assert not (tmp_path / ".sessions" / "echo" / "a.jsonl").exists()
+        response = await client.post(
+            "/agents/echo/chat", json={"message": "hi", "session_id": "../a"}
+        )
+        assert response.status == 400
+
+        # A damaged log is reported, not silently replaced
+        log_path = tmp_path / ".sessions" / "echo" / "c.jsonl"
+        log_path.write_text('{"type":"snap\n{"type":"message"}\n')
+        response = await client.post(
+            "/agents/echo/chat", json={"message": "hi", "session_id": "c"}
+        )
+        assert response.status == 500
+        assert "damaged at line 1" in await response.text()
+    finally:
+        await client.close()
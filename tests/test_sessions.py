@@ -0,0 +1,177 @@
+"""Tests for persisted chat sessions."""
+
+import gzip
+import json
+import time
+from pathlib import Path
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    ChatMessageContent,
+    FunctionCallContent,
+    FunctionResultContent,
+)
+
+from agent_runtime.agent import Agent
+from agent_runtime.providers.base import ProviderConfig, ProviderType
+from agent_runtime.providers.replay import ReplayProvider
+from agent_runtime.sessions import SessionLog, SessionLogError, session_path
+
+
+def _history(count: int) -> ChatHistory:
+    history = ChatHistory()
+    history.add_system_message("You are a test agent.")
+    for i in range(count):
+        history.add_user_message(f"question {i}")
+        history.add_assistant_message(f"answer {i}")
+    return history
+
+
+def _records(path: Path) -> list:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_turns_are_appended_and_rewrites_snapshot(tmp_path: Path) -> None:
+    log = SessionLog(tmp_path / "s.jsonl")
+    history = _history(1)
+    log.sync(history)
+    assert [r["type"] for r in _records(log.path)] == ["snapshot"]
+
+    history.add_user_message("question 1")
+    history.add_message(
+        ChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            items=[FunctionCallContent(id="c1", name="calc-add", arguments="{}")],
+        )
+    )
+    history.add_message(
+        ChatMessageContent(
+            role=AuthorRole.TOOL,
+            items=[FunctionResultContent(id="c1", name="calc-add", result="3")],
+        )
+    )
+    log.sync(history)
+    log.sync(history)  # Nothing new, nothing written
+    assert [r["type"] for r in _records(log.path)] == ["snapshot"] + ["message"] * 3
+
+    # Compaction replaces the messages, which needs a snapshot
+    history.messages = history.messages[:1] + history.messages[-2:]
+    log.sync(history)
+    assert _records(log.path)[-1]["type"] == "snapshot"
+
+    loaded = SessionLog(log.path).load()
+    assert [m.role for m in loaded.messages] == [
+        AuthorRole.SYSTEM,
+        AuthorRole.ASSISTANT,
+        AuthorRole.TOOL,
+    ]
+    assert loaded.messages[2].items[0].result == "3"
+
+
+def test_compressed_log_and_torn_tail(tmp_path: Path) -> None:
+    path = session_path(tmp_path, "my agent", "s1", compress=True)
+    assert path == tmp_path / ".sessions" / "my_agent" / "s1.jsonl.gz"
+    log = SessionLog(path)
+    history = _history(1)
+    log.sync(history)
+    history.add_user_message("question 1")
+    log.sync(history)
+    # An existing compressed log is found without asking for compression
+    assert session_path(tmp_path, "my agent", "s1") == path
+
+    # A crash in the middle of the next append
+    data = gzip.compress(b'{"type":"message","message":{"role":"user"')
+    with open(path, "ab") as f:
+        f.write(data[: len(data) // 2])
+
+    log = SessionLog(path)
+    assert [m.content for m in log.load().messages][-1] == "question 1"
+    # The log was repaired, so it can be appended to again
+    assert [r["type"] for r in _records(path)] == ["snapshot"]
+
+    with pytest.raises(ValueError):
+        session_path(tmp_path, "my agent", "../escape")
+
+
+def test_torn_plain_log_is_repaired(tmp_path: Path) -> None:
+    log = SessionLog(tmp_path / "s.jsonl")
+    history = _history(2)
+    log.sync(history)
+    with open(log.path, "ab") as f:
+        f.write(b'{"type":"message","mess')
+
+    log = SessionLog(log.path)
+    history = log.load()
+    assert len(history.messages) == 5
+    history.add_user_message("after the crash")
+    log.sync(history)
+    assert [r["type"] for r in _records(log.path)] == ["snapshot", "message"]
+
+
+def test_damaged_record_before_the_tail_is_reported(tmp_path: Path) -> None:
+    log = SessionLog(tmp_path / "s.jsonl")
+    log.sync(_history(1))
+    with open(log.path, "ab") as f:
+        f.write(b'{"type":"message","mess\n')
+        f.write(b'{"type":"message","message":{"role":"user","content":"hi"}}\n')
+
+    with pytest.raises(SessionLogError, match="damaged at line 2"):
+        SessionLog(log.path).load()
+
+
+def test_long_session_resumes_from_last_snapshot(tmp_path: Path) -> None:
+    log = SessionLog(tmp_path / "s.jsonl")
+    history = _history(2500)
+    log.sync(history)
+    for i in range(250):
+        history.add_user_message(f"more {i}")
+        log.sync(history)
+
+    start = time.perf_counter()
+    loaded = SessionLog(log.path).load()
+    elapsed = time.perf_counter() - start
+    assert len(loaded.messages) == 5251
+    assert loaded.messages[-1].content == "more 249"
+    assert elapsed < 2.0
+
+
+@pytest.mark.asyncio
+async def test_agent_resumes_session(tmp_path: Path) -> None:
+    fixture = tmp_path / "turns.jsonl"
+    turns = [[{"content": "First."}], [{"content": "Second."}]]
+    fixture.write_text("".join(json.dumps({"chunks": t}) + "\n" for t in turns))
+
+    def make_agent(system_prompt: str) -> Agent:
+        agent = Agent(
+            name="resumer",
+            description="resuming agent",
+            system_prompt=system_prompt,
+            provider=ReplayProvider(
+                ProviderConfig(
+                    name=ProviderType.REPLAY, settings={"fixture": str(fixture)}
+                )
+            ),
+            skip_init=True,
+        )
+        agent.kernel = Kernel()
+        return agent
+
+    path = session_path(tmp_path, "resumer", "chat")
+    agent = make_agent("Old prompt.")
+    assert agent.resume_session(SessionLog(path)) == 0
+    async for _ in agent.chat("one"):
+        pass
+
+    agent = make_agent("New prompt.")
+    assert agent.resume_session(SessionLog(path)) == 3
+    assert agent.history.messages[0].content == "New prompt."
+    assert agent.history.messages[2].content == "First."
+
+    agent.start_new_session()
+    assert SessionLog(path).load().messages[0].content == "New prompt."
+    assert len(SessionLog(path).load().messages) == 1
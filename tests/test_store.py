@@ -0,0 +1,152 @@
+"""Tests for the plugin store shared by all projects."""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from agent_runtime.cli.cli import cli
+from agent_runtime.plugins.fetch import PluginFetcher
+from agent_runtime.plugins.manager import PluginConfig, PluginManager
+from agent_runtime.plugins.store import PluginStore, parse_size
+
+SHA = "a" * 40
+
+
+class CountingFetcher(PluginFetcher):
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.fetches = 0
+
+    def fetch(self, source: Dict[str, str], refs: Any, dest: Path) -> str:
+        self.fetches += 1
+        (dest / "__init__.py").write_text("ECHO = True\n")
+        return refs[0]
+
+
+def _config() -> PluginConfig:
+    return PluginConfig(
+        plugin_type="remote",
+        name="echo",
+        source="github.com/onwardplatforms/agentruntime-plugin-echo",
+        version="0.0.1",
+    )
+
+
+@patch(
+    "agent_runtime.plugins.manager.PluginConfig.get_github_commit_sha",
+    return_value=SHA,
+)
+def test_projects_share_one_copy(mock_sha: Any, tmp_path: Path) -> None:
+    store = PluginStore(tmp_path / "store")
+    fetcher = CountingFetcher()
+    managers = [
+        PluginManager(tmp_path / name, fetcher=fetcher, store=store)
+        for name in ("one", "two")
+    ]
+    for pm in managers:
+        pm._clone_github_plugin(_config())
+
+    assert fetcher.fetches == 1
+    assert managers[0].install_stats["@onwardplatforms/echo"].method == "fake"
+    assert managers[1].install_stats["@onwardplatforms/echo"].method == "store"
+    for pm in managers:
+        version_dir = _config().get_install_dir(pm.plugins_dir)
+        assert version_dir.resolve() == store.entry_path(SHA).resolve()
+        assert (version_dir / "__init__.py").read_text() == "ECHO = True\n"
+
+    # Reinstalling replaces the link, not the shared files
+    managers[0]._clone_github_plugin(_config())
+    assert (store.entry_path(SHA) / "__init__.py").exists()
+
+    # Entries stay while any project links to them
+    (managers[0].plugins_dir / "onwardplatforms" / "echo" / "0.0.1").unlink()
+    assert store.gc().removed == []
+    (managers[1].plugins_dir / "onwardplatforms" / "echo" / "0.0.1").unlink()
+    assert [e.sha for e in store.gc().removed] == [SHA]
+    assert store.get(SHA) is None
+
+
+def _add_unused(store: PluginStore, sha: str, size: int, age_days: float) -> None:
+    def fill(dest: Path) -> None:
+        (dest / "data.py").write_bytes(b"x" * size)
+
+    store.add(sha, fill)
+    used = time.time() - age_days * 86400
+    os.utime(store.entry_path(sha), (used, used))
+
+
+def test_gc_by_size_and_age(tmp_path: Path) -> None:
+    store = PluginStore(tmp_path)
+    _add_unused(store, "1" * 40, 1000, age_days=30)
+    _add_unused(store, "2" * 40, 1000, age_days=10)
+    _add_unused(store, "3" * 40, 1000, age_days=1)
+
+    # Least recently used first, until the store fits
+    result = store.gc(max_size=2000, dry_run=True)
+    assert [e.sha[0] for e in result.removed] == ["1"]
+    assert store.get("1" * 40) is not None
+
+    result = store.gc(max_age=7 * 86400)
+    assert [e.sha[0] for e in result.removed] == ["1", "2"]
+    assert [e.sha[0] for e in result.kept] == ["3"]
+
+
+def test_gc_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AGENT_PLUGIN_STORE", str(tmp_path))
+    _add_unused(PluginStore(tmp_path), "1" * 40, 2 << 20, age_days=3)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["gc", "--max-size", "1MB", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "Would remove 1 plugin(s), 2.0 MB" in result.output
+
+    result = runner.invoke(cli, ["gc", "--max-size", "lots"])
+    assert result.exit_code == 2
+    assert "Invalid size" in result.output
+
+    result = runner.invoke(cli, ["gc"])
+    assert result.exit_code == 0
+    assert PluginStore(tmp_path).entries() == []
+
+
+def test_parse_size() -> None:
+    assert parse_size("1024") == 1024
+    assert parse_size("500MB") == 500 << 20
+    assert parse_size("1.5g") == 3 << 29
+    with pytest.raises(ValueError):
+        parse_size("-1MB")
+
+
+def test_hardlinked_copy_is_live_only_while_it_shares_files(tmp_path: Path) -> None:
+    store = PluginStore(tmp_path / "store")
+    _add_unused(store, SHA, 10, age_days=1)
+    target = tmp_path / "project" / "echo"
+    target.parent.mkdir()
+    with patch("agent_runtime.plugins.store.os.symlink", side_effect=OSError):
+        store.link(SHA, target)
+    store.record_link(SHA, target)
+    assert not target.is_symlink()
+    assert store.gc().removed == []
+
+    # A different install at the same path does not pin the entry
+    (target / "data.py").unlink()
+    (target / "data.py").write_bytes(b"y" * 10)
+    assert [e.sha for e in store.gc().removed] == [SHA]
+
+
+def test_failed_sha_lookup_leaves_no_staging_dir(tmp_path: Path) -> None:
+    pm = PluginManager(
+        tmp_path, fetcher=CountingFetcher(), store=PluginStore(tmp_path / "store")
+    )
+    with patch.object(
+        PluginConfig, "get_github_commit_sha", side_effect=RuntimeError("boom")
+    ):
+        with pytest.raises(RuntimeError, match="boom"):
+            pm._clone_github_plugin(_config())
+    assert list((pm.plugins_dir / "onwardplatforms" / "echo").iterdir()) == []
@@ -0,0 +1,215 @@
+"""Tests for concurrent tool dispatch."""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+from semantic_kernel import Kernel
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    FunctionCallContent,
+    FunctionResultContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.functions import kernel_function
+
+from agent_runtime.agent import Agent
+from agent_runtime.tools import ToolDispatcher
+
+DELAY = 0.2
+
+
+class SlowPlugin:
+    """Plugin whose sync functions block like file or lint tools do."""
+
+    @kernel_function(description="Read a file")
+    def read_file(self, path: str) -> str:
+        time.sleep(DELAY)
+        return f"contents of {path}"
+
+    @kernel_function(description="Lint code")
+    def lint_code(self, path: str) -> str:
+        time.sleep(DELAY / 2)
+        return f"no issues in {path}"
+
+    @kernel_function(description="Fetch a URL")
+    async def fetch(self, url: str) -> str:
+        await asyncio.sleep(DELAY)
+        return f"fetched {url}"
+
+    @kernel_function(description="Always fails")
+    def broken(self) -> str:
+        raise ValueError("boom")
+
+
+class LoopRecordingPlugin:
+    """Plugin whose sync functions note the event loop they are invoked on."""
+
+    def __init__(self) -> None:
+        self.loops: List[asyncio.AbstractEventLoop] = []
+
+    @kernel_function(description="Read a file")
+    def read_file(self, path: str) -> str:
+        self.loops.append(asyncio.get_running_loop())
+        return f"contents of {path}"
+
+    @kernel_function(description="Tail a log")
+    def tail_log(self, path: str) -> Iterator[str]:
+        self.loops.append(asyncio.get_running_loop())
+        yield f"tail of {path}"
+
+
+@pytest.fixture
+def kernel() -> Kernel:
+    kernel = Kernel()
+    kernel.add_plugin(SlowPlugin(), plugin_name="local_slow")
+    return kernel
+
+
+def _call(index: int, name: str, **arguments: str) -> FunctionCallContent:
+    return FunctionCallContent(
+        id=f"call_{index}", index=index, name=name, arguments=json.dumps(arguments)
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_run_concurrently_in_call_order(kernel: Kernel) -> None:
+    dispatcher = ToolDispatcher(kernel)
+    calls = [
+        _call(0, "local_slow_read_file", path="a.py"),
+        _call(1, "local_slow_lint_code", path="a.py"),
+        _call(2, "local_slow_read_file", path="b.py"),
+    ]
+
+    start = time.perf_counter()
+    results = await dispatcher.dispatch(calls)
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+
+    assert elapsed < DELAY * 2.5 * 0.8  # well under the serial sum
+    assert [r.call.id for r in results] == ["call_0", "call_1", "call_2"]
+    assert [r.result for r in results] == [
+        "contents of a.py",
+        "no issues in a.py",
+        "contents of b.py",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_tools_are_awaited_together(kernel: Kernel) -> None:
+    dispatcher = ToolDispatcher(kernel)
+    calls = [_call(i, "local_slow_fetch", url=f"u{i}") for i in range(4)]
+
+    start = time.perf_counter()
+    results = await dispatcher.dispatch(calls)
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+
+    assert elapsed < DELAY * 2
+    assert [r.result for r in results] == [f"fetched u{i}" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_plugin_concurrency_limit_serializes_calls(kernel: Kernel) -> None:
+    dispatcher = ToolDispatcher(kernel, plugin_concurrency={"local_slow": 1})
+    calls = [_call(i, "local_slow_read_file", path=f"{i}.py") for i in range(3)]
+
+    start = time.perf_counter()
+    results = await dispatcher.dispatch(calls)
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+
+    assert elapsed >= DELAY * 3
+    assert [r.result for r in results] == [f"contents of {i}.py" for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_leave_no_event_loops_open() -> None:
+    plugin = LoopRecordingPlugin()
+    kernel = Kernel()
+    kernel.add_plugin(plugin, plugin_name="local_loops")
+    dispatcher = ToolDispatcher(kernel)
+    calls = [
+        _call(0, "local_loops_read_file", path="a.py"),
+        _call(1, "local_loops_tail_log", path="app.log"),
+    ]
+
+    results = await dispatcher.dispatch(calls)
+    dispatcher.close()
+
+    assert [r.result for r in results] == ["contents of a.py", "tail of app.log"]
+    assert len(plugin.loops) == 2
+    assert all(loop.is_closed() for loop in plugin.loops)
+
+
+@pytest.mark.asyncio
+async def test_tool_errors_become_results(kernel: Kernel) -> None:
+    dispatcher = ToolDispatcher(kernel)
+    results = await dispatcher.dispatch(
+        [_call(0, "local_slow_broken"), _call(1, "missing_tool")]
+    )
+    dispatcher.close()
+
+    assert results[0].error
+    assert results[0].result == "Error executing function: boom"
+    assert results[1].result == "Error: Function 'missing_tool' not found"
+
+
+class ToolCallingProvider:
+    """Provider that requests two tools, then answers once it sees the results."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    async def chat(
+        self, history: ChatHistory, kernel: Kernel = None
+    ) -> AsyncIterator[StreamingChatMessageContent]:
+        self.requests += 1
+        if history.messages[-1].role != AuthorRole.TOOL:
+            for call in (
+                _call(0, "local_slow_read_file", path="a.py"),
+                _call(1, "local_slow_lint_code", path="a.py"),
+            ):
+                yield StreamingChatMessageContent(
+                    role=AuthorRole.ASSISTANT, items=[call], choice_index=0
+                )
+            return
+        yield StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT, content="All done.", choice_index=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_agent_answers_tool_calls_in_order(kernel: Kernel) -> None:
+    provider = ToolCallingProvider()
+    agent = Agent(
+        name="tools",
+        description="tool agent",
+        system_prompt="You are a test agent.",
+        provider=provider,
+        skip_init=True,
+    )
+    agent.kernel = kernel
+
+    text = [chunk.content async for chunk in agent.chat("check a.py") if chunk.content]
+    await agent.aclose()
+
+    assert "".join(text) == "All done."
+    assert provider.requests == 2
+    roles = [m.role for m in agent.history.messages]
+    assert roles == [
+        AuthorRole.SYSTEM,
+        AuthorRole.USER,
+        AuthorRole.ASSISTANT,
+        AuthorRole.TOOL,
+        AuthorRole.TOOL,
+        AuthorRole.ASSISTANT,
+    ]
+    tool_results: List[FunctionResultContent] = [
+        m.items[0] for m in agent.history.messages if m.role == AuthorRole.TOOL
+    ]
+    assert [r.id for r in tool_results] == ["call_0", "call_1"]
+    assert [r.result for r in tool_results] == ["contents of a.py", "no issues in a.py"]